@@ -5,13 +5,107 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, QLineEdit, 
                            QPushButton, QVBoxLayout, QHBoxLayout, QGridLayout,
                            QGroupBox, QTabWidget, QTextEdit, QComboBox, QFrame,
-                           QScrollArea, QSizePolicy)  # 添加滚动条支持
+                           QScrollArea, QSizePolicy, QCheckBox, QFileDialog)  # 添加滚动条支持
 from PyQt5.QtGui import QDoubleValidator, QFont
-from PyQt5.QtCore import Qt
-from scipy.integrate import quad
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
+import threading
+import IR_engine
+from IR_cache import ResultCache
+from IR_atmosphere import default_atmosphere
+from IR_trace import TRACER, traced, format_stages
+from IR_plot import RadiationPlot, RangePlot
+from IR_params import ScenarioParams
 from matplotlib import rcParams
 rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'WenQuanYi Zen Hei']  # 设置中文字体列表
 
+# 各方向使用的投影面积参数
+DIRECTIONS = (('horizontal', 's2'), ('vertical', 's3'))
+
+# 界面任务 -> (所需方向, 是否需要作用距离包线)
+TASKS = {
+    'plot_horizontal': (('horizontal',), False),
+    'plot_vertical': (('vertical',), False),
+    'calc_horizontal': (('horizontal',), False),
+    'calc_vertical': (('vertical',), False),
+    'range': (('horizontal', 'vertical'), True),
+}
+
+# 无法取得屏幕刷新率时（无屏幕或返回 0）使用的刷新率 (Hz)
+DEFAULT_REFRESH_RATE = 60.0
+
+
+def frame_interval():
+    """主屏幕一帧的时长 (ms)，至少为 1"""
+    screen = QApplication.primaryScreen()
+    rate = screen.refreshRate() if screen is not None else 0
+    if not rate > 0:
+        rate = DEFAULT_REFRESH_RATE
+    return max(1, int(1000 / rate))
+
+
+def compute_all(params, cancel_event=None, cache=None, sampling=1.0,
+                directions=('horizontal', 'vertical'), envelope=True):
+    """计算指定方向的辐射模式和作用距离包线，取消时返回 None
+
+    cache 为 ResultCache 时复用其中已有的结果，每个方向每组参数只计算一次。
+    sampling 为角度采样设置，见 IR_engine.radiation_calculations。
+    envelope 为 False 时只计算辐射模式。每个方向的辐射计算和包线计算之前
+    检查 cancel_event。
+    """
+    if cache is None:
+        cache = ResultCache()
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    results = {'params': params, 'sampling': sampling}
+    for direction, s_key in DIRECTIONS:
+        if direction not in directions:
+            continue
+        if cancelled():
+            return None
+        results[direction] = {'radiation': cache.radiation(params, params[s_key], direction, sampling)}
+        if not envelope:
+            continue
+        if cancelled():
+            return None
+        _, range_values, converged, _ = cache.envelope(params, params[s_key], direction, sampling)
+        results[direction].update(range_values=range_values, converged=converged)
+    return results
+
+
+class CalculationWorker(QThread):
+    """后台计算线程，结果通过信号发回界面线程"""
+    result_ready = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, job_id, params, sampling, tasks, cache, parent=None):
+        super().__init__(parent)
+        self.job_id = job_id
+        self.params = params
+        self.sampling = sampling
+        self.tasks = frozenset(tasks)
+        self.cache = cache
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消，计算在下一个阶段检查点退出"""
+        self.cancel_event.set()
+
+    def run(self):
+        directions = {d for task in self.tasks for d in TASKS[task][0]}
+        envelope = any(TASKS[task][1] for task in self.tasks)
+        try:
+            results = compute_all(self.params, self.cancel_event, self.cache, self.sampling,
+                                  directions, envelope)
+        except Exception as e:
+            self.failed.emit(self.job_id, str(e))
+            return
+        if results is not None and not self.cancel_event.is_set():
+            results['tasks'] = self.tasks
+            self.result_ready.emit(self.job_id, results)
+
+
 class AircraftRadiationApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -133,6 +227,21 @@ class AircraftRadiationApp(QMainWindow):
         
         # 添加其他选项卡（预留）
         self.add_placeholder_tabs()
+        
+        # 按参数快照缓存计算结果，绘图、结果显示和作用距离包线共用
+        # 设置 IR_ATMOSPHERE_DIR 时作用距离使用透过率表
+        self.result_cache = ResultCache(maxsize=32, atmosphere=default_atmosphere())
+        
+        # 后台计算状态：连续点击在 calc_timer 到期前合并为一次计算，
+        # pending_request 为 (参数, 角度采样, 任务集合)，任务见 TASKS
+        self.calc_job_id = 0
+        self.calc_worker = None
+        self.pending_request = None
+        self.trace_mark = TRACER.mark()
+        self.calc_timer = QTimer(self)
+        self.calc_timer.setSingleShot(True)
+        self.calc_timer.setInterval(50)
+        self.calc_timer.timeout.connect(self.start_calculation)
     
     def add_placeholder_tabs(self):
         """添加占位选项卡"""
@@ -218,9 +327,28 @@ class AircraftRadiationApp(QMainWindow):
         self.canvas_vertical_range.setMinimumHeight(300)
         fig_layout.addWidget(self.canvas_vertical_range)
         
-        # 连接鼠标移动事件
-        self.canvas_horizontal_range.mpl_connect('motion_notify_event', lambda event: self.on_mouse_move(event, 'horizontal'))
-        self.canvas_vertical_range.mpl_connect('motion_notify_event', lambda event: self.on_mouse_move(event, 'vertical'))
+        # 坐标轴与图元只创建一次，之后的计算只更新数据
+        self.horizontal_range_plot = RangePlot(self.fig_horizontal_range, self.canvas_horizontal_range,
+                                               "水平方向作用距离包线", 'c-')
+        self.vertical_range_plot = RangePlot(self.fig_vertical_range, self.canvas_vertical_range,
+                                             "垂直方向作用距离包线", 'm-')
+        
+        self.range_plots = {
+            'horizontal': self.horizontal_range_plot,
+            'vertical': self.vertical_range_plot,
+        }
+        self.range_data = None
+        
+        # 连接鼠标移动事件，显示更新按屏幕刷新率合并
+        self.hover_position = None
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(frame_interval())
+        self.hover_timer.timeout.connect(self.update_hover)
+        for direction, canvas in (('horizontal', self.canvas_horizontal_range),
+                                  ('vertical', self.canvas_vertical_range)):
+            canvas.mpl_connect('motion_notify_event', lambda event, d=direction: self.on_mouse_move(event, d))
+            canvas.mpl_connect('axes_leave_event', lambda event, d=direction: self.on_mouse_leave(event, d))
         
         self.current_angle_label = QLabel("鼠标悬停查看角度详情")
         self.current_angle_label.setStyleSheet("color: #DCDCDC; font-size: 10px;")
@@ -258,6 +386,17 @@ class AircraftRadiationApp(QMainWindow):
         btn_export.setStyleSheet("background-color: #388E3C;")
         button_layout.addWidget(btn_export)
         
+        # 性能计时开关与导出
+        self.chk_trace = QCheckBox("性能计时")
+        self.chk_trace.setChecked(TRACER.enabled)
+        self.chk_trace.toggled.connect(self.set_tracing)
+        button_layout.addWidget(self.chk_trace)
+        
+        btn_export_trace = QPushButton("导出计时")
+        btn_export_trace.setFixedHeight(40)
+        btn_export_trace.clicked.connect(self.export_trace)
+        button_layout.addWidget(btn_export_trace)
+        
         # 关闭按钮
         btn_close = QPushButton("关闭")
         btn_close.setFixedHeight(40)
@@ -268,13 +407,105 @@ class AircraftRadiationApp(QMainWindow):
         button_layout.addStretch()
         layout.addLayout(button_layout)
     
+    def set_tracing(self, enabled):
+        """运行时开关阶段计时"""
+        TRACER.enabled = enabled
+        self.statusBar().showMessage("性能计时已开启" if enabled else "性能计时已关闭")
+    
+    def export_trace(self):
+        """将计时记录导出为 Chrome Trace 文件"""
+        path, _ = QFileDialog.getSaveFileName(self, "导出计时", "IR_trace.json", "JSON (*.json)")
+        if path:
+            TRACER.export(path)
+            self.statusBar().showMessage(f"计时记录已导出到 {path}")
+    
     def calculate_all(self):
-        """执行所有计算"""
-        self.plot_horizontal()
-        self.plot_vertical()
-        self.calc_horizontal()
-        self.calc_vertical()
-        self.calc_range()
+        """执行所有计算（后台线程）"""
+        self.request_calculation(*TASKS)
+    
+    def request_calculation(self, *tasks):
+        """读取参数并在后台执行 tasks（见 TASKS）
+
+        尚未开始的请求与本次合并：参数取最新值，任务取并集。
+        """
+        self.trace_mark = TRACER.mark()
+        params = self.read_parameters()
+        if params is None:
+            return
+        if self.pending_request is not None:
+            tasks = self.pending_request[2] | set(tasks)
+        self.pending_request = (params, self.get_sampling(), set(tasks))
+        self.calc_timer.start()
+    
+    def start_calculation(self):
+        """启动后台计算；若有旧任务在运行则先取消，待其结束后再启动"""
+        if self.calc_worker is not None and self.calc_worker.isRunning():
+            # 被取消任务的界面更新并入新的请求
+            if self.pending_request is not None and not self.calc_worker.cancel_event.is_set():
+                self.pending_request[2].update(self.calc_worker.tasks)
+            self.calc_worker.cancel()
+            return
+        
+        request, self.pending_request = self.pending_request, None
+        if request is None:
+            return
+        params, sampling, tasks = request
+        
+        self.calc_job_id += 1
+        worker = CalculationWorker(self.calc_job_id, params, sampling, tasks, self.result_cache, self)
+        worker.result_ready.connect(self.on_calculation_ready)
+        worker.failed.connect(self.on_calculation_failed)
+        worker.finished.connect(self.on_worker_finished)
+        self.calc_worker = worker
+        self.statusBar().showMessage("计算中...")
+        worker.start()
+    
+    def on_worker_finished(self):
+        """后台线程结束，若期间有新的请求则立即开始"""
+        worker = self.sender()
+        if worker is self.calc_worker:
+            self.calc_worker = None
+        worker.deleteLater()
+        if self.pending_request is not None and not self.calc_timer.isActive():
+            self.start_calculation()
+    
+    def on_calculation_failed(self, job_id, message):
+        """后台计算出错"""
+        if job_id == self.calc_job_id:
+            self.statusBar().showMessage(f"计算错误: {message}")
+    
+    def on_calculation_ready(self, job_id, results):
+        """在界面线程中显示后台计算结果，过期结果直接丢弃"""
+        if job_id != self.calc_job_id:
+            return
+        if self.pending_request is not None:
+            # 已有更新的请求，本次的界面更新随之一起完成
+            self.pending_request[2].update(results['tasks'])
+            return
+        params = results['params']
+        tasks = results['tasks']
+        if 'plot_horizontal' in tasks:
+            self.draw_horizontal(results['horizontal']['radiation'])
+        if 'plot_vertical' in tasks:
+            self.draw_vertical(results['vertical']['radiation'])
+        if 'calc_horizontal' in tasks:
+            self.show_horizontal(params, results['horizontal']['radiation'])
+        if 'calc_vertical' in tasks:
+            self.show_vertical(params, results['vertical']['radiation'])
+        self.statusBar().showMessage("计算完成")
+        if 'range' in tasks:
+            self.draw_range(results)
+        if TRACER.enabled:
+            self.statusBar().showMessage("计算完成 | " + format_stages(TRACER.since(self.trace_mark)))
+    
+    def closeEvent(self, event):
+        """关闭窗口前结束后台计算"""
+        self.calc_timer.stop()
+        self.pending_request = None
+        if self.calc_worker is not None:
+            self.calc_worker.cancel()
+            self.calc_worker.wait()
+        super().closeEvent(event)
     
     def create_parameters_section(self, main_layout):
         """创建参数输入区域"""
@@ -337,6 +568,12 @@ class AircraftRadiationApp(QMainWindow):
         row += 1
         
         self.add_parameter("俯仰角 (deg):", "txt_fy", row, 0)
+        
+        lbl_sampling = QLabel("角度采样:")
+        self.cmb_sampling = QComboBox()
+        self.cmb_sampling.addItems(list(IR_engine.ANGLE_SAMPLING))
+        self.params_layout.addWidget(lbl_sampling, row, 2)
+        self.params_layout.addWidget(self.cmb_sampling, row, 3)
         row += 1
         
         # 辐射参数分组
@@ -434,6 +671,7 @@ class AircraftRadiationApp(QMainWindow):
         self.canvas_horizontal = FigureCanvas(self.fig_horizontal)
         self.canvas_horizontal.setMinimumHeight(300)
         horizontal_layout.addWidget(self.canvas_horizontal)
+        self.horizontal_plot = RadiationPlot(self.fig_horizontal, self.canvas_horizontal)
         
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
@@ -454,6 +692,7 @@ class AircraftRadiationApp(QMainWindow):
         self.canvas_vertical = FigureCanvas(self.fig_vertical)
         self.canvas_vertical.setMinimumHeight(300)
         vertical_layout.addWidget(self.canvas_vertical)
+        self.vertical_plot = RadiationPlot(self.fig_vertical, self.canvas_vertical)
         
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
@@ -562,8 +801,9 @@ class AircraftRadiationApp(QMainWindow):
         self.txt_pixel_size.setText("15")
         self.txt_integration_time.setText("10")
     
+    @traced('gui.get_parameters')
     def get_parameters(self):
-        """获取所有参数值"""
+        """获取所有参数值，返回经过校验的 ScenarioParams 快照"""
         params = {
             'gama': float(self.txt_gama.text()),
             'r': float(self.txt_r.text()),
@@ -605,148 +845,29 @@ class AircraftRadiationApp(QMainWindow):
             'integration_time': float(self.txt_integration_time.text())
 
         }
-        return params
+        return ScenarioParams(**params)
     
-    def radiation_calculations(self, s_value, angle_mode='horizontal'):
-        """执行辐射计算"""
-        params = self.get_parameters()
-        
-        # 物理常数
-        c1 = 3.7415e-16
-        c2 = 1.438e-2
-        s4 = np.pi * params['Rp']**2
-        
-        # 1. 蒙皮辐射计算
-        if params['H'] <= 11000:
-            T0 = 288.2 - 0.0065 * params['H']
-        elif params['H'] <= 20000:
-            T0 = 216.7
-        elif params['H'] <= 32000:
-            T0 = 216.7 + 0.001 * (params['H'] - 20000)
-        else:
-            T0 = 216.7
-        
-        Tm = T0 * (1 + params['r'] * (params['gama'] - 1) / 2 * params['Ma']**2)
-        
-        def M(x):
-            return c1 / x**5 / (np.exp(c2 / (x * Tm)) - 1)
-        
-        L = params['emissivity_skin'] / np.pi * quad(M, params['l1']/1e6, params['l2']/1e6)[0]
-        
-        # 2. 发动机喷口辐射
-        Tp = params['tp_afterburner'] if params['jl'] == 1 else params['tp_normal']
-        
-        def Mp(x):
-            return c1 / x**5 / (np.exp(c2 / (x * Tp)) - 1)
-        
-        Lp = params['emissivity_nozzle'] / np.pi * quad(Mp, params['l1']/1e6, params['l2']/1e6)[0]
-        
-        # 3. 尾焰辐射
-        Tw = params['tw_base']
-        if params['fdj'] == 1:
-            Tw = 0.85 * Tw
-        else:
-            Tw = 0.9 * Tw
-        
-        def Mw(x):
-            return c1 / x**5 / (np.exp(c2 / (x * Tw)) - 1)
-        
-        Lw = params['emissivity_flame'] / np.pi * quad(Mw, params['l1']/1e6, params['l2']/1e6)[0]
-        
-        # 准备角度数据
-        myBeta = np.linspace(0, 2*np.pi, 360)
-        results = np.zeros_like(myBeta)
-        Im_arr = np.zeros_like(myBeta)
-        Ip_arr = np.zeros_like(myBeta)
-        Iw_arr = np.zeros_like(myBeta)
-        
-        # 角度分区计算
-        for i, beta in enumerate(myBeta):
-            if 0 <= beta < np.arctan(1/5):
-                z = 0
-            elif beta < np.pi/2:
-                z = 1
-            elif beta < (np.pi - np.arctan(0.2)):
-                z = 2
-            elif beta < (np.pi + np.arctan(0.2)):
-                z = 3
-            elif beta < 3*np.pi/2:
-                z = 4
-            elif beta < (2*np.pi - np.arctan(0.2)):
-                z = 5
-            else:
-                z = 6
-                
-            s = params['s1'] * np.abs(np.cos(beta)) + s_value * np.abs(np.sin(beta))
-            Im = s * L
-            Im_arr[i] = Im
-            
-            # 根据不同区域计算辐射
-            if z == 0:
-                Sw = 0
-                Ip = 0
-            elif z == 1:
-                Sw = (params['lwy'] * np.sin(beta) - np.cos(beta))**2 / (params['lwy'] * np.sin(beta))
-                Ip = 0
-            elif z == 2:
-                Sw = (params['lwy'] * np.sin(beta) - np.abs(np.cos(beta)))**2 / (params['lwy'] * np.sin(beta)) + s4 * np.abs(np.cos(beta))
-                Sp = np.pi * np.abs(np.cos(beta))**2
-                Ip = Lp * Sp
-            elif z == 3:
-                Sw = s4 * np.abs(np.cos(beta))
-                Sp = np.pi * np.abs(np.cos(beta))**2
-                Ip = Lp * Sp
-            elif z == 4:
-                Sw = (params['lwy'] * np.abs(np.sin(beta)) - np.abs(np.cos(beta)))**2 / (params['lwy'] * np.abs(np.sin(beta))) + s4 * np.abs(np.cos(beta))
-                Sp = np.pi * np.abs(np.cos(beta))**2
-                Ip = Lp * Sp
-            elif z == 5:
-                Sw = (params['lwy'] * np.abs(np.sin(beta)) - np.abs(np.cos(beta)))**2 / (params['lwy'] * np.abs(np.sin(beta)))
-                Ip = 0
-            else:  # z == 6
-                Sw = 0
-                Ip = 0
-                
-            Iw = Lw * Sw
-            Iw_arr[i] = Iw
-            Ip_arr[i] = Ip
-            
-            # 总辐射强度
-            if z in [2, 3, 4]:
-                I = Im + Iw + Ip
-            else:
-                I = Im + Iw
-                
-            results[i] = I
-            
-        return myBeta, results, np.max(results), Im_arr, Iw_arr, Ip_arr
+    def read_parameters(self):
+        """读取并校验参数，输入有误时在状态栏提示并返回 None"""
+        try:
+            return self.get_parameters()
+        except ValueError as e:
+            self.statusBar().showMessage(f"参数输入有误: {e}")
+            return None
+    
+    def get_sampling(self):
+        """当前的角度采样设置"""
+        return IR_engine.ANGLE_SAMPLING[self.cmb_sampling.currentText()]
     
     def plot_horizontal(self):
-        """绘制水平方向辐射模式"""
-        beta, results, max_I, Im_arr, Iw_arr, Ip_arr = self.radiation_calculations(
-            s_value=float(self.txt_s2.text()), 
-            angle_mode='horizontal'
-        )
-        
-        self.fig_horizontal.clf()
-        ax = self.fig_horizontal.add_subplot(111, projection='polar')
-        
-        # 绘制所有辐射分量
-        ax.plot(beta, results, 'r-', linewidth=2, label='总辐射')
-        ax.plot(beta, Im_arr, 'b--', label='蒙皮辐射')
-        ax.plot(beta, Iw_arr, 'g:', label='尾焰辐射')
-        ax.plot(beta, Ip_arr, 'm-.', label='喷口辐射')
-        
-        ax.set_rlabel_position(22.5)
-        ax.grid(True)
-        
-        # 将图例放在图的右侧
-        ax.legend(loc='upper right', bbox_to_anchor=(1.15, 1.15))
-        
-        # 调整布局
-        self.fig_horizontal.tight_layout(rect=[0, 0, 1, 0.95])
+        """绘制水平方向辐射模式（后台线程）"""
+        self.request_calculation('plot_horizontal')
+    
+    def draw_horizontal(self, radiation):
+        """根据辐射计算结果绘制水平方向辐射模式"""
+        beta, results, max_I, Im_arr, Iw_arr, Ip_arr = radiation
         
-        self.canvas_horizontal.draw()
+        self.horizontal_plot.update(beta, results, Im_arr, Iw_arr, Ip_arr)
         self.txt_horizontal_result.setText(
             f"最大辐射强度: {max_I:.4f} W/sr\n"
             f"蒙皮辐射最大值: {np.max(Im_arr):.4f} W/sr\n"
@@ -755,31 +876,14 @@ class AircraftRadiationApp(QMainWindow):
         )
     
     def plot_vertical(self):
-        """绘制垂直方向辐射模式"""
-        beta, results, max_I, Im_arr, Iw_arr, Ip_arr = self.radiation_calculations(
-            s_value=float(self.txt_s3.text()), 
-            angle_mode='vertical'
-        )
-        
-        self.fig_vertical.clf()
-        ax = self.fig_vertical.add_subplot(111, projection='polar')
-        
-        # 绘制所有辐射分量
-        ax.plot(beta, results, 'r-', linewidth=2, label='总辐射')
-        ax.plot(beta, Im_arr, 'b--', label='蒙皮辐射')
-        ax.plot(beta, Iw_arr, 'g:', label='尾焰辐射')
-        ax.plot(beta, Ip_arr, 'm-.', label='喷口辐射')
-        
-        ax.set_rlabel_position(22.5)
-        ax.grid(True)
-        
-        # 将图例放在图的右侧
-        ax.legend(loc='upper right', bbox_to_anchor=(1.15, 1.15))
-        
-        # 调整布局
-        self.fig_vertical.tight_layout(rect=[0, 0, 1, 0.95])
+        """绘制垂直方向辐射模式（后台线程）"""
+        self.request_calculation('plot_vertical')
+    
+    def draw_vertical(self, radiation):
+        """根据辐射计算结果绘制垂直方向辐射模式"""
+        beta, results, max_I, Im_arr, Iw_arr, Ip_arr = radiation
         
-        self.canvas_vertical.draw()
+        self.vertical_plot.update(beta, results, Im_arr, Iw_arr, Ip_arr)
         self.txt_vertical_result.setText(
             f"最大辐射强度: {max_I:.4f} W/sr\n"
             f"蒙皮辐射最大值: {np.max(Im_arr):.4f} W/sr\n"
@@ -788,8 +892,11 @@ class AircraftRadiationApp(QMainWindow):
         )
     
     def calc_horizontal(self):
-        """计算指定方位角的辐射"""
-        params = self.get_parameters()
+        """计算指定方位角的辐射（后台线程）"""
+        self.request_calculation('calc_horizontal')
+    
+    def show_horizontal(self, params, radiation):
+        """显示指定方位角的辐射与作用距离"""
         detector_info = (
             f"\n探测器参数:\n"
             f"孔径: {params['detector_aperture']*1000:.1f} mm | F数: {params['f_number']}\n"
@@ -798,14 +905,9 @@ class AircraftRadiationApp(QMainWindow):
         )
         
         # 找到最接近指定角度的索引
-        beta = np.linspace(0, 2*np.pi, 360)
-        idx = int(round(params['fwjiaodu'] * len(beta) / 360))
-        idx = min(idx, len(beta)-1)
+        idx = IR_engine.angle_index(radiation[0], params['fwjiaodu'])
         
-        _, results, _, Im_arr, Iw_arr, Ip_arr = self.radiation_calculations(
-            s_value=float(self.txt_s2.text()), 
-            angle_mode='horizontal'
-        )
+        _, results, _, Im_arr, Iw_arr, Ip_arr = radiation
         
         I_total = results[idx]
         I_skin = Im_arr[idx]
@@ -813,7 +915,8 @@ class AircraftRadiationApp(QMainWindow):
         I_nozzle = Ip_arr[idx]
         
         # 计算作用距离
-        R_range = self.calc_range_at_angle(I_total, params['fwjiaodu'], 'horizontal')
+        R_range = IR_engine.calc_range_at_angle(params, I_total, params['fwjiaodu'], 'horizontal',
+                                                  atmosphere=self.result_cache.atmosphere)
         
         self.txt_horizontal_result.setText(
             f"在方位角 {params['fwjiaodu']}° 的辐射强度:\n\n"
@@ -826,18 +929,15 @@ class AircraftRadiationApp(QMainWindow):
         )
     
     def calc_vertical(self):
-        """计算指定俯仰角的辐射"""
-        params = self.get_parameters()
-        
+        """计算指定俯仰角的辐射（后台线程）"""
+        self.request_calculation('calc_vertical')
+    
+    def show_vertical(self, params, radiation):
+        """显示指定俯仰角的辐射与作用距离"""
         # 找到最接近指定角度的索引
-        beta = np.linspace(0, 2*np.pi, 360)
-        idx = int(round(params['fyjiaodu'] * len(beta) / 360))
-        idx = min(idx, len(beta)-1)
+        idx = IR_engine.angle_index(radiation[0], params['fyjiaodu'])
         
-        _, results, _, Im_arr, Iw_arr, Ip_arr = self.radiation_calculations(
-            s_value=float(self.txt_s3.text()), 
-            angle_mode='vertical'
-        )
+        _, results, _, Im_arr, Iw_arr, Ip_arr = radiation
         
         I_total = results[idx]
         I_skin = Im_arr[idx]
@@ -845,7 +945,8 @@ class AircraftRadiationApp(QMainWindow):
         I_nozzle = Ip_arr[idx]
         
         # 计算作用距离
-        R_range = self.calc_range_at_angle(I_total, params['fyjiaodu'], 'vertical')
+        R_range = IR_engine.calc_range_at_angle(params, I_total, params['fyjiaodu'], 'vertical',
+                                                  atmosphere=self.result_cache.atmosphere)
         
         self.txt_vertical_result.setText(
             f"在俯仰角 {params['fyjiaodu']}° 的辐射强度:\n\n"
@@ -856,250 +957,80 @@ class AircraftRadiationApp(QMainWindow):
             f"作用距离: {R_range:.2f} km"
         )
     
-    def calc_range_at_angle(self, intensity, angle, angle_type):
-        """计算特定角度下的作用距离"""
-        params = self.get_parameters()
-        
-        # 获取高度（转换为km）
-        H_km = params['H'] / 1000.0
-        
-        # 确定波段（中波或长波）
-        if "中波" in params['band']:
-            # 中波红外大气透过率模型
-            # 基础衰减系数 (km⁻¹)
-            k_base = 0.2
-            
-            # 高度修正因子 (高度增加，透过率增加)
-            h_factor = np.exp(-H_km / 10.0)  # 10km为特征高度
-            
-            # 气象条件修正因子
-            weather_factors = {
-                "晴天": 1.0,
-                "多云": 0.8,
-                "阴天": 0.6,
-                "雨天": 0.2  # 雨天对长波影响更大
-            }
-            w_factor = weather_factors.get(params['weather'], 1.0)
-            
-            # 综合衰减系数
-            k = k_base * h_factor * w_factor
-        else:
-            # 长波红外大气透过率模型
-            # 基础衰减系数 (km⁻¹)
-            k_base = 0.15
-            
-            # 高度修正因子
-            h_factor = np.exp(-H_km / 8.0)  # 8km为特征高度
-            
-            # 气象条件修正因子
-            weather_factors = {
-                "晴天": 1.0,
-                "多云": 0.8,
-                "阴天": 0.6,
-                "雨天": 0.2  # 雨天对长波影响更大
-            }
-            w_factor = weather_factors.get(params['weather'], 1.0)
-            
-            # 综合衰减系数
-            k = k_base * h_factor * w_factor
-        
-        # 探测器参数
-        D = params['detector_aperture']  # 探测器孔径(m)
-        SNR_min = params['snr_threshold']  # 最小信噪比
-        
-        # 光学系统参数
-        f_number = params['f_number']  # F数
-        τ0 = params['optical_trans']  # 光学透过率
-        
-        # 探测器性能参数
-        NETD = params['netd']  # 噪声等效温差(K)
-        Δf = params['system_bandwidth']  # 系统带宽(Hz)
-        # D_ratio = params['detector_resp']  # 探测器响应率(A/W)
-        D_star = params['d_star']  # 比探测率(cm√Hz/W)
-        pixel_size = params['pixel_size'] * 1e-6  # 敏感元尺寸(m)
-        # t_int = params['integration_time'] / 1000.0  # 积分时间(s)
-        
-        # 计算探测器敏感元面积
-        A_d = (pixel_size)**2  # m²
-        
-        # 计算接收面积
-        A0 = np.pi * (D/2)**2  # 接收面积(m²)
-        
-        # 计算dW/dT (温度对辐射的变化率)
-        # 使用简化模型：dW/dT ≈ 4σT^3，其中σ是Stefan-Boltzmann常数
-        σ = 5.67e-8  # W/m²K⁴⁴
-        T_bg = params['bg_temp']  # 背景温度(K) - 假设为300K
-        dWdT = 4 * σ * T_bg**3  # W/m²K
-        
-        try:
-            range_netd = np.sqrt(
-                (intensity * τ0 * A0 * D_star * np.sqrt(A_d * Δf * 1e4)) /  # 注意单位转换
-                (NETD * np.sqrt(4*f_number**2 + 1) * dWdT * SNR_min)
-            ) / 1000.0  # 转换为km
-            
-            R_prev = range_netd
-            for _ in range(5):  # 进行5次迭代
-                τ_atm = np.exp(-k * R_prev)
-                R = np.sqrt(
-                    (intensity * τ0 * τ_atm * A0 * D_star * np.sqrt(A_d * Δf * 1e4)) / 
-                    (NETD * np.sqrt(4*f_number**2 + 1) * dWdT * SNR_min)
-                ) / 1000.0
-                R_prev = R  # 更新迭代值
-                
-        except Exception as e:
-            print(f"作用距离计算错误: {e}")
-            # 使用简单的经验公式作为后备
-            R = np.sqrt(intensity * τ0 * A0 * 1e6) / 1000.0  # km
-        
-        return R
-        
     def calc_range(self):
-        """计算作用距离包线 - 同时计算水平和垂直方向"""
-        # 获取辐射数据
-        beta_h, results_h, _, _, _, _ = self.radiation_calculations(
-            s_value=float(self.txt_s2.text()), 
-            angle_mode='horizontal'
-        )
-        
-        beta_v, results_v, _, _, _, _ = self.radiation_calculations(
-            s_value=float(self.txt_s3.text()), 
-            angle_mode='vertical'
-        )
+        """计算作用距离包线 - 同时计算水平和垂直方向（后台线程）"""
+        self.request_calculation('range')
+    
+    def draw_range(self, results):
+        """绘制作用距离包线"""
+        beta_h, results_h = results['horizontal']['radiation'][:2]
+        beta_v, results_v = results['vertical']['radiation'][:2]
+        range_h = results['horizontal']['range_values']
+        range_v = results['vertical']['range_values']
+        if not (np.all(results['horizontal']['converged']) and np.all(results['vertical']['converged'])):
+            self.statusBar().showMessage("部分角度的作用距离未收敛，结果仅供参考")
         
         # 存储数据用于鼠标交互
+        self.range_params = results['params']
         self.range_data = {
             'horizontal': {
+                'name': "水平",
                 'beta': beta_h,
-                'range_values': [],
+                'range_values': range_h,
                 'intensities': results_h
             },
             'vertical': {
+                'name': "垂直",
                 'beta': beta_v,
-                'range_values': [],
+                'range_values': range_v,
                 'intensities': results_v
             }
         }
-        
-        # 计算各角度对应的作用距离
-        for i, intensity in enumerate(results_h):
-            self.range_data['horizontal']['range_values'].append(
-                self.calc_range_at_angle(intensity, np.degrees(beta_h[i]), 'horizontal')
-            )
-        
-        for i, intensity in enumerate(results_v):
-            self.range_data['vertical']['range_values'].append(
-                self.calc_range_at_angle(intensity, np.degrees(beta_v[i]), 'vertical')
-            )
-        
-        # 绘制水平方向作用距离图
-        self.fig_horizontal_range.clf()
-        ax_h = self.fig_horizontal_range.add_subplot(111, projection='polar')
-        
-        # 绘制作用距离包线
-        ax_h.plot(beta_h, self.range_data['horizontal']['range_values'], 'c-', linewidth=2, label='作用距离包线')
-        
-        # 标记最大作用距离点
-        range_values_h = self.range_data['horizontal']['range_values']
-        max_range_idx_h = np.argmax(range_values_h)
-        max_range_h = range_values_h[max_range_idx_h]
-        max_range_angle_h = np.degrees(beta_h[max_range_idx_h])
-        ax_h.plot([beta_h[max_range_idx_h]], [max_range_h], 'ro', markersize=8)
-        ax_h.annotate(f'最大: {max_range_h:.1f}km', 
-                     xy=(beta_h[max_range_idx_h], max_range_h),
-                     xytext=(beta_h[max_range_idx_h] + 0.3, max_range_h * 1.1),
-                     arrowprops=dict(facecolor='red', shrink=0.05),
-                     color='black')
-        
-        # 设置标题和标签
-        ax_h.set_title("水平方向作用距离包线", fontsize=12, pad=15)
-        ax_h.set_rlabel_position(22.5)
-        ax_h.grid(True)
-        ax_h.legend(loc='upper right')
-        
-        # 添加表格信息
-        table_text_h = (
-            f"最大作用距离: {max_range_h:.1f} km @ {max_range_angle_h:.1f}°\n"
-            f"平均作用距离: {np.mean(range_values_h):.1f} km\n"
-            f"最小作用距离: {np.min(range_values_h):.1f} km"
+        params = self.range_params
+        self.range_meta = (
+            f"波段: {params['band'].split()[0]} | 气象: {params['weather']} | "
+            f"高度: {params['H'] / 1000.0:.1f} km"
         )
-        ax_h.text(0.5, -0.3, table_text_h, transform=ax_h.transAxes, 
-                fontsize=10, ha='center', va='top', 
-                bbox=dict(boxstyle='round', facecolor='#2D2D30', alpha=0.7, edgecolor='none'))
-        
-        # 绘制垂直方向作用距离图
-        self.fig_vertical_range.clf()
-        ax_v = self.fig_vertical_range.add_subplot(111, projection='polar')
-        
-        # 绘制作用距离包线
-        ax_v.plot(beta_v, self.range_data['vertical']['range_values'], 'm-', linewidth=2, label='作用距离包线')
-        
-        # 标记最大作用距离点
-        range_values_v = self.range_data['vertical']['range_values']
-        max_range_idx_v = np.argmax(range_values_v)
-        max_range_v = range_values_v[max_range_idx_v]
-        max_range_angle_v = np.degrees(beta_v[max_range_idx_v])
-        ax_v.plot([beta_v[max_range_idx_v]], [max_range_v], 'ro', markersize=8)
-        ax_v.annotate(f'最大: {max_range_v:.1f}km', 
-                     xy=(beta_v[max_range_idx_v], max_range_v),
-                     xytext=(beta_v[max_range_idx_v] + 0.3, max_range_v * 1.1),
-                     arrowprops=dict(facecolor='red', shrink=0.05),
-                     color='black')
-        
-        # 设置标题和标签
-        ax_v.set_title("垂直方向作用距离包线", fontsize=12, pad=15)
-        ax_v.set_rlabel_position(22.5)
-        ax_v.grid(True)
-        ax_v.legend(loc='upper right')
-        
-        # 添加表格信息
-        table_text_v = (
-            f"最大作用距离: {max_range_v:.1f} km @ {max_range_angle_v:.1f}°\n"
-            f"平均作用距离: {np.mean(range_values_v):.1f} km\n"
-            f"最小作用距离: {np.min(range_values_v):.1f} km"
-        )
-        ax_v.text(0.5, -0.3, table_text_v, transform=ax_v.transAxes, 
-                fontsize=10, ha='center', va='top', 
-                bbox=dict(boxstyle='round', facecolor='#2D2D30', alpha=0.7, edgecolor='none'))
         
-        self.canvas_horizontal_range.draw()
-        self.canvas_vertical_range.draw()
+        # 更新作用距离包线图
+        self.horizontal_range_plot.update(beta_h, range_h)
+        self.vertical_range_plot.update(beta_v, range_v)
         self.current_angle_label.setText("鼠标悬停查看角度详情")
 
 
     def on_mouse_move(self, event, direction):
-        """鼠标移动事件处理 - 支持双图"""
-        if not event.inaxes or not hasattr(self, 'range_data') or direction not in self.range_data:
+        """鼠标移动事件处理 - 只记录位置，由 hover_timer 按屏幕刷新率更新显示"""
+        if not event.inaxes or self.range_data is None:
             return
-            
-        # 获取鼠标位置对应的角度和距离
-        angle_rad = event.xdata
-        r = event.ydata
+        self.hover_position = (direction, event.xdata)
+        if not self.hover_timer.isActive():
+            self.hover_timer.start()
+    
+    def on_mouse_leave(self, event, direction):
+        """鼠标离开坐标区时隐藏光标标记"""
+        self.hover_position = None
+        self.hover_timer.stop()
+        self.range_plots[direction].set_cursor(None)
+    
+    def update_hover(self):
+        """显示鼠标所在角度的作用距离与辐射强度，并在包线上标记该点"""
+        if self.hover_position is None or self.range_data is None:
+            return
+        direction, angle_rad = self.hover_position
+        data = self.range_data[direction]
         
-        # 转换为角度
+        # 转换为角度并找到最近的角度索引（均匀网格直接计算，自适应网格二分查找）
         angle_deg = np.degrees(angle_rad) % 360
+        idx = IR_engine.angle_index(data['beta'], angle_deg)
+        range_value = data['range_values'][idx]
+        intensity = data['intensities'][idx]
         
-        # 找到最接近的角度索引
-        beta = self.range_data[direction]['beta']
-        idx = np.argmin(np.abs(beta - angle_rad))
-        
-        # 获取该角度的距离和辐射强度
-        range_value = self.range_data[direction]['range_values'][idx]
-        intensity = self.range_data[direction]['intensities'][idx]
-        dir_name = "水平" if direction == 'horizontal' else "垂直"
-        
-        # 获取当前大气参数
-        params = self.get_parameters()
-        band = params['band'].split()[0]  # 取第一个词
-        weather = params['weather']
-        H_km = params['H'] / 1000.0
-        
-        # 更新标签显示
+        # 更新标签显示（包线计算时的大气参数已在 draw_range 中格式化）
         self.current_angle_label.setText(
-            f"方向: {dir_name} | 角度: {angle_deg:.1f}° | 作用距离: {range_value:.1f} km | "
-            f"辐射强度: {intensity:.4f} W/sr | "
-            f"波段: {band} | 气象: {weather} | 高度: {H_km:.1f} km"
+            f"方向: {data['name']} | 角度: {angle_deg:.1f}° | 作用距离: {range_value:.1f} km | "
+            f"辐射强度: {intensity:.4f} W/sr | " + self.range_meta
         )
-
+        self.range_plots[direction].set_cursor(data['beta'][idx], range_value)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -0,0 +1,159 @@
+"""大气透过率表：按高度、路径长度、波段和气象条件插值"""
+import json
+import os
+
+import numpy as np
+
+from IR_engine import extinction_coefficient, detector_constant, lambertw, WEATHER_FACTORS
+
+# 默认表包含的探测波段
+BANDS = ("中波 (3-5μm)", "长波 (8-12μm)")
+
+# 默认高度网格 (km，覆盖界面允许的 0~30 km) 与路径长度网格 (km)
+ALTITUDES = np.linspace(0.0, 30.0, 61)
+PATHS = np.concatenate([np.linspace(0.0, 10.0, 21), np.linspace(12.0, 100.0, 45)])
+
+
+def _lookup(index, values, kind):
+    """将名称（可为字符串数组）映射为表中的下标"""
+    try:
+        if isinstance(values, str):
+            return index[values]
+        values = np.asarray(values, dtype=object)
+        return np.array([index[v] for v in values.ravel()], dtype=int).reshape(values.shape)
+    except KeyError as e:
+        raise ValueError(f"透过率表中没有{kind}: {e.args[0]}")
+
+
+class TransmittanceTable:
+    """大气透过率表
+
+    数据目录包含:
+      index.json    波段名与气象条件名列表
+      altitude.npy  高度网格 (km)，递增
+      path.npy      路径长度网格 (km)，递增，首个为 0
+      log_tau.npy   ln τ，形状 (波段, 气象, 高度, 路径)
+
+    各数组以只读内存映射方式加载。查询时对 ln τ 在高度和路径长度上
+    做双线性插值，超出路径网格时按最后一段的衰减率外推；
+    高度超出表的范围时抛出 ValueError。
+    """
+
+    def __init__(self, bands, weathers, altitude, path, log_tau):
+        self.bands = tuple(bands)
+        self.weathers = tuple(weathers)
+        self.band_index = {name: i for i, name in enumerate(self.bands)}
+        self.weather_index = {name: i for i, name in enumerate(self.weathers)}
+        self.altitude = altitude
+        self.path = path
+        self.log_tau = log_tau
+        if log_tau.shape != (len(self.bands), len(self.weathers), len(altitude), len(path)):
+            raise ValueError("透过率表维度与网格不一致")
+        if path[0] != 0:
+            raise ValueError("路径长度网格必须从 0 开始")
+
+    @classmethod
+    def load(cls, directory):
+        """以只读内存映射方式加载透过率表"""
+        with open(os.path.join(directory, 'index.json'), encoding='utf-8') as f:
+            index = json.load(f)
+        arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+                  for name in ('altitude', 'path', 'log_tau')]
+        return cls(index['bands'], index['weathers'], *arrays)
+
+    def save(self, directory):
+        """保存透过率表"""
+        os.makedirs(directory, exist_ok=True)
+        for name in ('altitude', 'path', 'log_tau'):
+            np.save(os.path.join(directory, f"{name}.npy"), np.asarray(getattr(self, name)))
+        with open(os.path.join(directory, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump({'bands': self.bands, 'weathers': self.weathers}, f, ensure_ascii=False)
+
+    @classmethod
+    def from_model(cls, altitude=ALTITUDES, path=PATHS, bands=BANDS, weathers=tuple(WEATHER_FACTORS)):
+        """由 extinction_coefficient 的指数衰减模型生成透过率表"""
+        altitude = np.asarray(altitude, dtype=float)
+        path = np.asarray(path, dtype=float)
+        k = extinction_coefficient({
+            'H': altitude * 1000.0,
+            'band': np.array(bands)[:, None, None],
+            'weather': np.array(weathers)[None, :, None],
+        })
+        log_tau = -k[..., None] * path
+        return cls(bands, weathers, altitude, path, log_tau)
+
+    def profile(self, H, band, weather):
+        """高度 H (m) 处沿路径网格的 ln τ，形状为 H/band/weather 广播形状 + (路径点数,)"""
+        b = _lookup(self.band_index, band, "波段")
+        w = _lookup(self.weather_index, weather, "气象条件")
+        h = np.asarray(H, dtype=float) / 1000.0
+        if np.any((h < self.altitude[0]) | (h > self.altitude[-1])):
+            raise ValueError(f"高度超出透过率表范围 "
+                             f"({self.altitude[0] * 1000:g}~{self.altitude[-1] * 1000:g} m)")
+        i = np.clip(np.searchsorted(self.altitude, h, side='right') - 1, 0, len(self.altitude) - 2)
+        f = (h - self.altitude[i]) / (self.altitude[i + 1] - self.altitude[i])
+        lower = self.log_tau[b, w, i]
+        upper = self.log_tau[b, w, i + 1]
+        return lower + np.asarray(f)[..., None] * (upper - lower)
+
+    def transmittance(self, H, R, band, weather):
+        """高度 H (m)、路径长度 R (km) 上的大气透过率，参数可广播"""
+        row = self.profile(H, band, weather)
+        R = np.asarray(R, dtype=float)
+        path = self.path
+        j = np.clip(np.searchsorted(path, R, side='right') - 1, 0, len(path) - 2)
+        shape = np.broadcast_shapes(row.shape[:-1], R.shape)
+        row = np.broadcast_to(row, shape + row.shape[-1:])
+        j = np.broadcast_to(j, shape)[..., None]
+        lo = np.take_along_axis(row, j, -1)[..., 0]
+        hi = np.take_along_axis(row, j + 1, -1)[..., 0]
+        j = j[..., 0]
+        f = (R - path[j]) / (path[j + 1] - path[j])
+        return np.exp(lo + f * (hi - lo))[()]
+
+    def detection_range(self, params, intensity, rtol=1e-12):
+        """按透过率表求解作用距离 (km)，返回 (R, converged)
+
+        ln τ 在每个路径区间内关于 R 线性，即 τ = exp(b_j - k_j R)，此时
+        R² = R0² τ(R) 在区间内有解析解 R = R1 exp(-W(k_j R1 / 2))，
+        R1 = R0 exp(b_j / 2)。由于 R² / τ(R) 单调递增，先在路径网格上
+        比较 R_j² / τ_j 与 R0² 定位所在区间，每个角度只需一次 Lambert W 计算。
+        """
+        intensity = np.asarray(intensity, dtype=float)
+        A = detector_constant(params) * intensity / 1e6  # 无衰减作用距离的平方 (km²)
+        row = self.profile(params['H'], params['band'], params['weather'])
+        path = self.path
+
+        # 各区间的衰减率与截距（衰减率截断为非负，保证单调）
+        k = np.maximum(-np.diff(row, axis=-1) / np.diff(path), 0.0)
+        b = row[..., :-1] + k * path[:-1]
+        q = np.maximum.accumulate(path**2 * np.exp(-row), axis=-1)
+
+        if row.ndim == 1:
+            j = np.clip(np.searchsorted(q, A, side='right') - 1, 0, len(path) - 2)
+            k_j, b_j = k[j], b[j]
+        else:
+            shape = np.broadcast_shapes(row.shape[:-1], A.shape)
+            j = np.sum(q <= A[..., None], axis=-1) - 1
+            j = np.clip(np.broadcast_to(j, shape), 0, len(path) - 2)[..., None]
+            k_j = np.take_along_axis(np.broadcast_to(k, shape + k.shape[-1:]), j, -1)[..., 0]
+            b_j = np.take_along_axis(np.broadcast_to(b, shape + b.shape[-1:]), j, -1)[..., 0]
+
+        R1 = np.sqrt(A * np.exp(b_j))
+        w, converged = lambertw(k_j * R1 / 2, rtol)
+        R = R1 * np.exp(-w)
+        return R[()], converged[()]
+
+
+_default_atmosphere = None
+
+
+def default_atmosphere():
+    """进程级默认透过率表，目录由环境变量 IR_ATMOSPHERE_DIR 指定，未设置时返回 None"""
+    global _default_atmosphere
+    directory = os.environ.get('IR_ATMOSPHERE_DIR')
+    if directory is None:
+        return None
+    if _default_atmosphere is None:
+        _default_atmosphere = TransmittanceTable.load(directory)
+    return _default_atmosphere
@@ -0,0 +1,262 @@
+"""性能基准：计时主要计算与绘图路径，与保存的基线比较
+
+用法示例:
+    python IR_benchmark.py --save                # 运行并保存基线
+    python IR_benchmark.py --threshold 20        # 与基线比较，变慢超过 20% 时返回非零
+                                                 # （基线缺少本次运行的项目时返回 2）
+    python IR_benchmark.py --filter radiation    # 只运行名称包含 radiation 的项目
+    python IR_benchmark.py --no-baseline         # 只运行，不与基线比较
+
+RELATIVE 中列出的项目另与参照项目比较（如级数求值不得慢于逐点数值积分），不依赖基线。
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+import IR_engine
+from IR_params import DEFAULTS, ScenarioParams
+from IR_sweep import sweep_table
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'IR_benchmark_baseline.json')
+
+
+def _radiation(sampling, snapshot=True):
+    # snapshot 为 False 时使用普通字典，不含 ScenarioParams 预计算的派生量
+    params = ScenarioParams(**DEFAULTS) if snapshot else dict(DEFAULTS)
+    n = len(IR_engine.sample_angles(params, params['s2'], sampling))
+
+    def run():
+        IR_engine.radiation_calculations(params, params['s2'], 'horizontal', sampling=sampling)
+    return run, n, 'angles'
+
+
+def _range_at_angle():
+    params = ScenarioParams(**DEFAULTS)
+    _, results, *_ = IR_engine.radiation_calculations(params, params['s2'])
+
+    def run():
+        IR_engine.calc_range_at_angle(params, results[75], 75.0, 'horizontal')
+    return run, 1, 'calls'
+
+
+def _envelope(sampling):
+    params = ScenarioParams(**DEFAULTS)
+
+    def run():
+        # calc_range 的完整路径：两个方向的辐射计算与作用距离
+        for s_key, mode in (('s2', 'horizontal'), ('s3', 'vertical')):
+            _, results, *_ = IR_engine.radiation_calculations(params, params[s_key], mode, sampling=sampling)
+            IR_engine.detection_range(params, results)
+    n = 2 * len(IR_engine.sample_angles(params, params['s2'], sampling))
+    return run, n, 'angles'
+
+
+def _planck(n, quad=False):
+    T = np.linspace(200.0, 2000.0, n)
+
+    def run():
+        if quad:
+            # 逐点数值积分的参考实现
+            for t in T:
+                IR_engine.band_radiance_quad(t, 3.0, 5.0)
+        else:
+            IR_engine.band_radiance(T, 3.0, 5.0)
+    return run, n, 'temperatures'
+
+
+def _sweep(n):
+    table = {'H': np.linspace(0.0, 15000.0, n), 'Ma': np.linspace(0.5, 2.5, n)}
+    beta = IR_engine.angle_grid()
+
+    def run():
+        sweep_table(DEFAULTS, table, beta)
+    return run, n, 'scenarios'
+
+
+def _envelopes(sampling):
+    """两组最大值相近的作用距离包线，交替更新时半径范围不变"""
+    params = ScenarioParams(**DEFAULTS)
+    beta, results, *_ = IR_engine.radiation_calculations(params, params['s2'], sampling=sampling)
+    R, _ = IR_engine.detection_range(params, results)
+    return beta, (R, R * 0.999)
+
+
+def _blit(sampling):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from IR_plot import RangePlot
+
+    beta, envelopes = _envelopes(sampling)
+    fig = Figure(figsize=(7, 7))
+    plot = RangePlot(fig, FigureCanvasAgg(fig), "作用距离包线", 'c-')
+    plot.update(beta, envelopes[1])
+    frames = [0]
+
+    def run():
+        # 与界面一致：RangePlot.update 只恢复背景并重画动态图元
+        frames[0] += 1
+        plot.update(beta, envelopes[frames[0] % 2])
+    return run, 1, 'frames'
+
+
+def _render(sampling, hit=False):
+    from IR_figures import FigureRenderer, draw_range
+
+    beta, envelopes = _envelopes(sampling)
+    renderer = FigureRenderer(maxsize=1)
+    frames = [0]
+
+    def run():
+        # 与 Streamlit 一致：FigureRenderer.render 渲染 PNG；hit 为 True 时数据不变，命中缓存
+        if not hit:
+            frames[0] += 1
+        renderer.render('range', draw_range, beta, envelopes[frames[0] % 2], "作用距离包线", 'c-')
+    return run, 1, 'frames'
+
+
+# 名称 -> 构造函数，构造函数返回 (待计时函数, 每次调用的处理量, 单位)
+CASES = {
+    'radiation/1deg': lambda: _radiation(1.0),
+    'radiation/0.1deg': lambda: _radiation(0.1),
+    'radiation/adaptive': lambda: _radiation('adaptive'),
+    'radiation_dict/1deg': lambda: _radiation(1.0, snapshot=False),
+    'range_at_angle': _range_at_angle,
+    'envelope/1deg': lambda: _envelope(1.0),
+    'envelope/0.1deg': lambda: _envelope(0.1),
+    'planck/1': lambda: _planck(1),
+    'planck/10000': lambda: _planck(10000),
+    'planck_quad/1': lambda: _planck(1, quad=True),
+    'planck_quad/100': lambda: _planck(100, quad=True),
+    'sweep/100': lambda: _sweep(100),
+    'sweep/1000': lambda: _sweep(1000),
+    'blit/1deg': lambda: _blit(1.0),
+    'blit/0.1deg': lambda: _blit(0.1),
+    'render/1deg': lambda: _render(1.0),
+    'render/0.1deg': lambda: _render(0.1),
+    'render_cached/0.1deg': lambda: _render(0.1, hit=True),
+}
+
+
+# 不依赖基线的相对检查: (项目, 参照项目)，项目不得慢于参照项目
+RELATIVE = (
+    ('planck/1', 'planck_quad/1'),
+)
+
+
+def measure(run, repeat=5, min_time=0.2):
+    """计时：先确定使单轮耗时不少于 min_time 的调用次数，取 repeat 轮中的中位数 (s/次)"""
+    run()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        times.append((time.perf_counter() - start) / number)
+    return float(np.median(times))
+
+
+def run_benchmarks(names, repeat=5, min_time=0.2, report=print):
+    """运行基准，返回 {名称: {'time': s/次, 'throughput': 处理量/s, 'unit': 单位}}"""
+    results = {}
+    for name in names:
+        run, n, unit = CASES[name]()
+        t = measure(run, repeat, min_time)
+        results[name] = {'time': t, 'throughput': n / t, 'unit': unit}
+        report(f"{name:<22s} {t * 1e3:10.3f} ms  {n / t:14,.0f} {unit}/s")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """与基线比较，返回变慢超过 threshold (%) 的项目 [(名称, 基线耗时, 当前耗时), ...]"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is not None and result['time'] > base['time'] * (1 + threshold / 100):
+            regressions.append((name, base['time'], result['time']))
+    return regressions
+
+
+def missing_cases(results, baseline):
+    """本次运行了但基线中没有的项目名称"""
+    return [name for name in results if name not in baseline.get('results', {})]
+
+
+def check_relative(results):
+    """检查 RELATIVE 中两者都已运行的项目，返回慢于参照的 [(名称, 参照名称, 耗时, 参照耗时), ...]"""
+    failures = []
+    for name, reference in RELATIVE:
+        if name in results and reference in results:
+            t, t_ref = results[name]['time'], results[reference]['time']
+            if t > t_ref:
+                failures.append((name, reference, t, t_ref))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="飞机红外辐射计算性能基准")
+    parser.add_argument('--baseline', default=BASELINE, help="基线文件")
+    parser.add_argument('--save', action='store_true', help="将本次结果保存为基线")
+    parser.add_argument('--no-baseline', action='store_true', help="不与基线比较")
+    parser.add_argument('--threshold', type=float, default=20.0, help="允许的变慢比例 (%%)")
+    parser.add_argument('--filter', default='', help="只运行名称包含该字符串的项目")
+    parser.add_argument('--repeat', type=int, default=5, help="重复轮数")
+    parser.add_argument('--min-time', type=float, default=0.2, help="每轮最短时间 (s)")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if args.filter in name]
+    results = run_benchmarks(names, args.repeat, args.min_time)
+    failures = check_relative(results)
+    for name, reference, t, t_ref in failures:
+        print(f"性能退化: {name} {t * 1e3:.3f} ms 慢于 {reference} {t_ref * 1e3:.3f} ms")
+    if failures:
+        return 1
+
+    if args.save:
+        baseline = {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.platform(),
+            'results': results,
+        }
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"基线已保存到 {args.baseline}")
+        return 0
+
+    if args.no_baseline:
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"没有基线文件 {args.baseline}，使用 --save 生成，或使用 --no-baseline 跳过比较")
+        return 2
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    missing = missing_cases(results, baseline)
+    if missing:
+        print(f"基线 {args.baseline} 中没有以下项目: {', '.join(missing)}，使用 --save 重新生成基线")
+        return 2
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, after in regressions:
+        print(f"性能退化: {name} {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms "
+              f"(+{(after / before - 1) * 100:.0f}%)")
+    if regressions:
+        return 1
+    print(f"全部项目均在基线的 {args.threshold:g}% 以内")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""按参数快照缓存辐射计算与作用距离包线结果"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from IR_engine import radiation_calculations, detection_range
+
+# 影响辐射强度的参数（投影面积 s2/s3 由 s_value 单独给出）
+RADIATION_KEYS = (
+    'gama', 'r', 's1', 'Rp', 'lwy', 'l1', 'l2', 'H', 'Ma', 'jl', 'fdj',
+    'emissivity_skin', 'emissivity_nozzle', 'emissivity_flame',
+    'tw_base', 'tp_normal', 'tp_afterburner',
+)
+
+# 影响作用距离的参数
+RANGE_KEYS = RADIATION_KEYS + (
+    'band', 'weather', 'bg_temp', 'detector_aperture', 'snr_threshold',
+    'f_number', 'optical_trans', 'netd', 'system_bandwidth', 'd_star', 'pixel_size',
+)
+
+
+def _canonical(value):
+    """数值统一为 float，使 12000 与 12000.0 得到相同的键"""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return str(value)
+
+
+def params_key(params, keys, *extra):
+    """参数子集的规范哈希"""
+    items = [[key, _canonical(params[key])] for key in sorted(keys)]
+    items.append([_canonical(x) for x in extra])
+    text = json.dumps(items, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _readonly(value):
+    """将结果中的数组设为只读，防止调用方修改缓存内容"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _readonly(item)
+    return value
+
+
+class LRUCache:
+    """线程安全的 LRU 缓存"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """命中则返回缓存结果，否则计算并缓存"""
+        value = self.get(key)
+        if value is None:
+            value = _readonly(compute())
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ResultCache:
+    """辐射计算与作用距离包线的结果缓存
+
+    缓存键只包含影响结果的参数，修改方位角、积分时间等
+    无关参数不会触发重新计算。atmosphere 为作用距离所用的大气模型，
+    默认使用 IR_engine 中的指数衰减模型。
+    """
+
+    def __init__(self, maxsize=128, atmosphere=None):
+        self.cache = LRUCache(maxsize)
+        self.atmosphere = atmosphere
+
+    def radiation(self, params, s_value, angle_mode='horizontal', sampling=1.0):
+        """带缓存的 radiation_calculations"""
+        key = ('radiation', params_key(params, RADIATION_KEYS, s_value, sampling))
+        return self.cache.get_or_compute(
+            key, lambda: radiation_calculations(params, s_value, angle_mode, sampling=sampling))
+
+    def envelope(self, params, s_value, angle_mode='horizontal', sampling=1.0):
+        """带缓存的作用距离包线，返回 (beta, range_values, converged, intensities)"""
+        key = ('envelope', params_key(params, RANGE_KEYS, s_value, sampling))
+
+        def compute():
+            beta, results = self.radiation(params, s_value, angle_mode, sampling)[:2]
+            range_values, converged = detection_range(params, results, atmosphere=self.atmosphere)
+            return beta, range_values, converged, results
+
+        return self.cache.get_or_compute(key, compute)
+
+    def clear(self):
+        self.cache.clear()
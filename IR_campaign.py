@@ -0,0 +1,121 @@
+"""大规模扫描任务的多进程执行器"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from IR_engine import band_radiance, angle_grid
+from IR_sweep import sweep_table, SweepResult, RESULT_FIELDS
+
+
+class CampaignCancelled(Exception):
+    """扫描任务被取消"""
+
+    def __init__(self, done, total):
+        super().__init__(f"扫描任务已取消（完成 {done}/{total} 个场景）")
+        self.done = done
+        self.total = total
+
+
+def grid_table(axes):
+    """将参数网格 {名称: 取值数组} 展开为逐行场景表"""
+    names = list(axes)
+    grids = np.meshgrid(*[np.asarray(axes[name]) for name in names], indexing='ij')
+    return {name: grid.ravel() for name, grid in zip(names, grids)}
+
+
+def guided_chunks(n, workers, chunk_size=None, min_chunk=64):
+    """划分场景区间 [(start, stop), ...]
+
+    指定 chunk_size 时按固定大小划分；否则采用递减的块大小
+    （剩余量 / (2 * workers)），前期大块减少调度开销，后期小块平衡负载。
+    """
+    chunks = []
+    start = 0
+    while start < n:
+        if chunk_size:
+            size = chunk_size
+        else:
+            size = max(min_chunk, (n - start) // (2 * workers))
+        stop = min(n, start + size)
+        chunks.append((start, stop))
+        start = stop
+    return chunks
+
+
+def _run_chunk(base_params, table, beta, direction, fields, use_table):
+    """子进程中执行一个场景区间"""
+    radiance = band_radiance
+    if use_table:
+        from IR_lut import default_cache
+        radiance = default_cache().band_radiance
+    result = sweep_table(base_params, table, beta, direction, radiance)
+    return {name: np.ascontiguousarray(result[name]) for name in fields}
+
+
+def run_campaign(base_params, table, beta=None, direction='horizontal', workers=None,
+                 chunk_size=None, fields=RESULT_FIELDS, use_table=False,
+                 progress=None, cancel_event=None):
+    """多进程执行逐行场景扫描
+
+    table 为参数名到等长一维数组的字典（可由 grid_table 生成）。
+    任务按 guided_chunks 划分后动态派发，空闲进程随时领取下一块，
+    结果按场景顺序写回，与 sweep_table 的结果一致。
+
+    progress(done, total) 在每块完成后调用；cancel_event 为
+    threading.Event，置位后取消未开始的块并抛出 CampaignCancelled。
+    use_table 为 True 时各进程使用 IR_lut.default_cache() 查表
+    （设置 IR_LUT_DIR 后各进程内存映射共享同一份表）。
+    """
+    if beta is None:
+        beta = angle_grid()
+    beta = np.asarray(beta, dtype=float)
+    table = {name: np.asarray(values) for name, values in table.items()}
+    if not table:
+        raise ValueError("table 不能为空")
+    n = len(next(iter(table.values())))
+    for name, values in table.items():
+        if len(values) != n:
+            raise ValueError(f"参数 {name} 的长度 {len(values)} 与其他参数 ({n}) 不一致")
+    workers = workers or os.cpu_count() or 1
+    cancel_event = cancel_event or threading.Event()
+
+    out = {name: np.empty((n, len(beta)), dtype=bool if name == 'converged' else float)
+           for name in fields}
+    chunks = guided_chunks(n, workers, chunk_size)
+    done = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        next_chunk = 0
+        try:
+            while next_chunk < len(chunks) or pending:
+                # 保持每个进程有一个在算、一个排队
+                while next_chunk < len(chunks) and len(pending) < 2 * workers and not cancel_event.is_set():
+                    start, stop = chunks[next_chunk]
+                    sub = {name: values[start:stop] for name, values in table.items()}
+                    future = pool.submit(_run_chunk, base_params, sub, beta, direction, fields, use_table)
+                    pending[future] = (start, stop)
+                    next_chunk += 1
+
+                if cancel_event.is_set():
+                    raise CampaignCancelled(done, n)
+
+                finished, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    start, stop = pending.pop(future)
+                    for name, values in future.result().items():
+                        out[name][start:stop] = values
+                    done += stop - start
+                    if progress is not None:
+                        progress(done, n)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+
+    coords = {'scenario': np.arange(n), 'beta': beta}
+    coords.update(table)
+    return SweepResult(['scenario', 'beta'], coords, out)
@@ -0,0 +1,124 @@
+"""Streamlit 的客户端交互极坐标图
+
+曲线按图表尺寸降采样后以 float32 数值序列发给浏览器，由 Plotly 在客户端绘制，
+缩放和悬停提示不再需要服务器重新运行或栅格化图片。需要安装 plotly。
+"""
+import numpy as np
+
+from IR_engine import close_curve, angular_mean
+
+try:
+    import plotly.graph_objects as go
+except ImportError:
+    go = None
+
+CHART_HEIGHT = 480
+
+# 与 Matplotlib 图一致的曲线样式：(名称, 颜色, 线型, 线宽)
+RADIATION_STYLES = (
+    ('总辐射', 'red', 'solid', 2),
+    ('蒙皮辐射', 'blue', 'dash', 1.5),
+    ('尾焰辐射', 'green', 'dot', 1.5),
+    ('喷口辐射', 'magenta', 'dashdot', 1.5),
+)
+
+
+def available():
+    """是否安装了 plotly"""
+    return go is not None
+
+
+def max_points(height=CHART_HEIGHT, margin=80):
+    """极坐标区域最大半径处圆周的像素数，点数再多在屏幕上也分辨不出"""
+    return int(np.pi * (height - margin))
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets 降采样，返回保留点的下标
+
+    首尾点保留，其余点按顺序分为 n_out - 2 个桶，每个桶保留与上一个保留点、
+    下一个桶的均值点构成三角形面积最大的点，从而保留峰谷等形状特征。
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    starts, stops = edges[:-1], edges[1:]
+    counts = stops - starts
+    mean_x = np.add.reduceat(x[1:n - 1], starts - 1) / counts
+    mean_y = np.add.reduceat(y[1:n - 1], starts - 1) / counts
+    # 每个桶的下一个参照点：下一个桶的均值，最后一个桶为末点
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(len(starts)):
+        s, e = starts[i], stops[i]
+        area = np.abs((x[s:e] - x[a]) * (next_y[i] - y[a]) - (next_x[i] - x[a]) * (y[s:e] - y[a]))
+        a = s + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample_polar(beta, values, n_out):
+    """极坐标曲线降采样，返回 (角度 (deg), 数值)，均为 float32
+
+    三角形面积在直角坐标 (r cosβ, r sinβ) 中计算，与屏幕上看到的形状一致。
+    """
+    idx = lttb_indices(values * np.cos(beta), values * np.sin(beta), n_out)
+    return np.degrees(beta[idx]).astype(np.float32), values[idx].astype(np.float32)
+
+
+def _layout(fig, height, title=None):
+    # 配色使用 Streamlit 的图表主题，不随数据发送 Plotly 模板
+    fig.update_layout(
+        height=height,
+        title=dict(text=title, x=0.5) if title else None,
+        margin=dict(l=40, r=40, t=60 if title else 30, b=30),
+        legend=dict(x=1.0, y=1.1, xanchor='right'),
+        polar=dict(radialaxis=dict(angle=22.5, tickangle=22.5)),
+    )
+    return fig
+
+
+def radiation_figure(beta, total, skin, plume, nozzle, height=CHART_HEIGHT):
+    """辐射模式图：总辐射与蒙皮、尾焰、喷口辐射四条曲线"""
+    n_out = max_points(height)
+    beta, *curves = close_curve(beta, total, skin, plume, nozzle)
+    fig = go.Figure()
+    for values, (name, color, dash, width) in zip(curves, RADIATION_STYLES):
+        theta, r = downsample_polar(beta, values, n_out)
+        fig.add_trace(go.Scatterpolar(
+            theta=theta, r=r, mode='lines', name=name,
+            line=dict(color=color, dash=dash, width=width),
+            hovertemplate='%{theta:.1f}°<br>%{r:.4f} W/sr<extra>' + name + '</extra>'))
+    return _layout(fig, height)
+
+
+def range_figure(beta, range_values, title, color, height=CHART_HEIGHT):
+    """作用距离包线图：包线、最大值标记和统计信息"""
+    i = int(np.argmax(range_values))
+    max_range = range_values[i]
+    max_angle = np.degrees(beta[i])
+    theta, r = downsample_polar(*close_curve(beta, range_values), max_points(height))
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        theta=theta, r=r, mode='lines', name='作用距离包线', line=dict(color=color, width=2),
+        hovertemplate='%{theta:.1f}°<br>%{r:.2f} km<extra></extra>'))
+    fig.add_trace(go.Scatterpolar(
+        theta=[max_angle], r=[max_range], mode='markers+text', name=f'最大: {max_range:.1f}km',
+        marker=dict(color='red', size=10), text=[f'最大: {max_range:.1f}km'],
+        textposition='top right', showlegend=False,
+        hovertemplate='%{theta:.1f}°<br>%{r:.2f} km<extra>最大</extra>'))
+    fig.add_annotation(
+        x=0.5, y=-0.12, xref='paper', yref='paper', showarrow=False, align='center',
+        bgcolor='#1E1E1E', bordercolor='#0078D7', borderwidth=1,
+        text=(f"最大作用距离: {max_range:.1f} km @ {max_angle:.1f}°<br>"
+              f"平均作用距离: {angular_mean(beta, range_values):.1f} km<br>"
+              f"最小作用距离: {np.min(range_values):.1f} km"))
+    _layout(fig, height, title)
+    fig.update_layout(margin=dict(b=90))
+    return fig
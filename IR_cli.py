@@ -0,0 +1,201 @@
+"""命令行批量计算：读取场景文件，并行计算辐射强度与作用距离包线，按列写出结果
+
+用法示例:
+    python IR_cli.py scenarios.csv -o results.npz --workers 8 --chunk-size 256
+    python IR_cli.py scenarios.yaml -o results.parquet --direction horizontal --resolution 0.5
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from IR_engine import angle_grid
+from IR_params import DEFAULTS, FIELDS, FIELD_NAMES, validate_values
+from IR_campaign import run_campaign
+from IR_sweep import RESULT_FIELDS
+
+FIELD_TYPES = dict(FIELDS)
+DIRECTIONS = ('horizontal', 'vertical')
+
+
+def _convert(name, value):
+    kind = FIELD_TYPES[name]
+    if kind is int:
+        return int(float(value))
+    return kind(value)
+
+
+def load_scenarios(path):
+    """读取场景文件，返回 (基准参数, 场景列表)
+
+    JSON/YAML 可为单个参数字典、参数字典列表，或
+    {"base": {...}, "scenarios": [{...}, ...]}；CSV 每行一个场景，
+    列名为参数名。未给出的参数取基准参数，基准参数缺省时取 DEFAULTS。
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            data = list(csv.DictReader(f))
+    elif ext in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("读取 YAML 需要安装 pyyaml")
+        with open(path, encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+    else:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+    base = dict(DEFAULTS)
+    if isinstance(data, dict) and 'scenarios' in data:
+        base.update(data.get('base') or {})
+        scenarios = data['scenarios']
+    elif isinstance(data, dict):
+        scenarios = [data]
+    else:
+        scenarios = data
+
+    for name in base:
+        if name not in FIELD_TYPES:
+            raise ValueError(f"未知参数: {name}")
+        base[name] = _convert(name, base[name])
+    return base, scenarios
+
+
+def scenario_table(base, scenarios):
+    """将场景列表整理为参数名到数组的表（只包含场景中出现的参数），并检查取值范围"""
+    names = [name for name in FIELD_NAMES if any(name in s for s in scenarios)]
+    unknown = {key for s in scenarios for key in s if key not in FIELD_TYPES}
+    if unknown:
+        raise ValueError(f"未知参数: {', '.join(sorted(unknown))}")
+
+    table = {}
+    for name in names:
+        values = [_convert(name, s[name]) if s.get(name) not in (None, '') else base[name]
+                  for s in scenarios]
+        table[name] = np.array(values)
+
+    # 与 ScenarioParams 使用同一套校验，逐场景检查
+    validate_values({name: table.get(name, base[name]) for name in FIELD_NAMES})
+    return table
+
+
+def run(base, table, directions=DIRECTIONS, resolution=1.0, workers=None, chunk_size=None,
+        use_table=False, progress=None):
+    """按方向执行扫描，返回列名到数组的字典
+
+    progress(direction, done, total) 在每块完成后调用。
+    """
+    beta = angle_grid(resolution)
+    columns = dict(table)
+    columns['beta'] = beta
+    for direction in directions:
+        report = None
+        if progress is not None:
+            def report(done, total, direction=direction):
+                progress(direction, done, total)
+        result = run_campaign(base, table, beta, direction, workers, chunk_size,
+                              RESULT_FIELDS, use_table, report)
+        for field in RESULT_FIELDS:
+            columns[f"{direction}_{field}"] = result[field]
+        # 作用距离包线的最大值及其所在角度
+        i = np.argmax(result['range'], axis=1)
+        columns[f"{direction}_max_range"] = result['range'][np.arange(len(i)), i]
+        columns[f"{direction}_max_angle"] = np.degrees(beta[i])
+    return columns
+
+
+def write_npz(path, columns):
+    np.savez_compressed(path, **columns)
+
+
+def write_parquet(path, columns):
+    """每个场景一行，逐角度结果存为定长列表列，beta 写入表元数据"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("写出 Parquet 需要安装 pyarrow")
+    arrays = {}
+    for name, values in columns.items():
+        if name == 'beta':
+            continue
+        if values.ndim == 2:
+            arrays[name] = pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), values.shape[1])
+        else:
+            arrays[name] = pa.array(values)
+    table = pa.table(arrays)
+    table = table.replace_schema_metadata({'beta': json.dumps(columns['beta'].tolist())})
+    pq.write_table(table, path)
+
+
+def write_hdf5(path, columns):
+    try:
+        import h5py
+    except ImportError:
+        raise SystemExit("写出 HDF5 需要安装 h5py")
+    with h5py.File(path, 'w') as f:
+        for name, values in columns.items():
+            if values.dtype.kind == 'U':
+                values = values.astype(h5py.string_dtype())
+                f.create_dataset(name, data=values)
+            else:
+                f.create_dataset(name, data=values, compression='gzip')
+
+
+WRITERS = {
+    '.npz': write_npz,
+    '.parquet': write_parquet,
+    '.h5': write_hdf5,
+    '.hdf5': write_hdf5,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="飞机红外辐射批量计算")
+    parser.add_argument('scenarios', help="场景文件 (.json/.yaml/.csv)")
+    parser.add_argument('-o', '--output', required=True, help="输出文件 (.npz/.parquet/.h5)")
+    parser.add_argument('--direction', choices=DIRECTIONS + ('both',), default='both',
+                        help="计算方向（默认水平和垂直）")
+    parser.add_argument('--resolution', type=float, default=1.0, help="角度网格间隔 (deg)")
+    parser.add_argument('--workers', type=int, default=None, help="进程数（默认 CPU 核数）")
+    parser.add_argument('--chunk-size', type=int, default=None, help="每个任务块的场景数（默认自动划分）")
+    parser.add_argument('--use-table', action='store_true', help="波段积分使用查找表")
+    parser.add_argument('-q', '--quiet', action='store_true', help="不显示进度")
+    args = parser.parse_args(argv)
+
+    writer = WRITERS.get(os.path.splitext(args.output)[1].lower())
+    if writer is None:
+        parser.error(f"不支持的输出格式: {args.output}")
+
+    try:
+        base, scenarios = load_scenarios(args.scenarios)
+        table = scenario_table(base, scenarios)
+    except (ValueError, OSError) as e:
+        parser.exit(2, f"错误: {e}\n")
+    if not table:
+        # 所有场景均为基准参数
+        table = {'H': np.full(len(scenarios), float(base['H']))}
+
+    def progress(direction, done, total):
+        # 每个方向占一行
+        end = '\n' if done == total else ''
+        print(f"\r{direction}: {done}/{total}", end=end, file=sys.stderr, flush=True)
+
+    directions = DIRECTIONS if args.direction == 'both' else (args.direction,)
+    start = time.perf_counter()
+    columns = run(base, table, directions, args.resolution, args.workers, args.chunk_size,
+                  args.use_table, None if args.quiet else progress)
+    writer(args.output, columns)
+    if not args.quiet:
+        print(f"{len(scenarios)} 个场景，用时 {time.perf_counter() - start:.1f} s，结果已写入 {args.output}",
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
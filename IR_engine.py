@@ -0,0 +1,497 @@
+"""红外辐射计算引擎（无界面，可被 IR_GUI.py 与 IR_streamlit.py 共同调用）"""
+import math
+from functools import lru_cache
+
+import numpy as np
+from scipy.integrate import quad
+
+from IR_trace import span, traced
+
+# 物理常数
+c1 = 3.7415e-16
+c2 = 1.438e-2
+
+# 角度分区边界
+ZONE_EDGE = np.arctan(0.2)
+
+
+def ambient_temperature(H):
+    """标准大气环境温度(K)，H 可为数组"""
+    if np.ndim(H) == 0:
+        H = float(H)
+        if H <= 11000:
+            return np.float64(288.2 - 0.0065 * H)
+        if 20000 < H <= 32000:
+            return np.float64(216.7 + 0.001 * (H - 20000))
+        return np.float64(216.7)
+    H = np.asarray(H, dtype=float)
+    T0 = np.select(
+        [H <= 11000, H <= 20000, H <= 32000],
+        [288.2 - 0.0065 * H, 216.7, 216.7 + 0.001 * (H - 20000)],
+        default=216.7
+    )
+    return T0[()]
+
+
+def _derived(params, name):
+    """读取参数快照 (IR_params.ScenarioParams) 上预计算的量，普通字典返回 None"""
+    return getattr(params, name, None)
+
+
+def source_temperatures(params):
+    """计算蒙皮、喷口、尾焰温度 (Tm, Tp, Tw)"""
+    if _derived(params, 'Tw') is not None:
+        return params.Tm, params.Tp, params.Tw
+    T0 = ambient_temperature(params['H'])
+    Tm = T0 * (1 + params['r'] * (params['gama'] - 1) / 2 * np.asarray(params['Ma'])**2)
+    Tp = np.where(np.asarray(params['jl']) == 1, params['tp_afterburner'], params['tp_normal'])[()]
+    Tw = params['tw_base'] * np.where(np.asarray(params['fdj']) == 1, 0.85, 0.9)[()]
+    return Tm, Tp, Tw
+
+
+# ∫_0^x t³/(e^t-1) dt 的 Bernoulli 展开系数: (k, B_k / k!)
+_BERNOULLI_TERMS = [
+    (0, 1.0),
+    (1, -1.0 / 2),
+    (2, 1.0 / 6 / 2),
+    (4, -1.0 / 30 / 24),
+    (6, 1.0 / 42 / 720),
+    (8, -1.0 / 30 / 40320),
+    (10, 5.0 / 66 / 3628800),
+    (12, -691.0 / 2730 / 479001600),
+    (14, 7.0 / 6 / 87178291200),
+    (16, -3617.0 / 510 / 20922789888000),
+    (18, 43867.0 / 798 / 6402373705728000),
+    (20, -174611.0 / 330 / 2432902008176640000),
+]
+# 偶数项 k = 20, 18, ..., 2 的系数 B_k / ((k+3) k!)，按 x² 的降幂排列，供 Horner 求值
+_BERNOULLI_EVEN = tuple(b / (k + 3) for k, b in reversed(_BERNOULLI_TERMS) if k >= 2)
+_PLANCK_TOTAL = np.pi**4 / 15
+
+_SERIES_SPLIT = 1.5  # x 小于该值用 Bernoulli 展开，否则用指数级数
+_SERIES_TERMS = 24   # 指数级数最多项数，x >= 1.5 时截断误差 < e^-36
+_SCALAR_SIZE = 8     # 元素数不超过该值时逐个用 Python 浮点运算，避免 numpy 的调用开销
+_INV_N4 = tuple(1.0 / n**4 for n in range(1, _SERIES_TERMS + 1))
+
+
+def _tail_small(x):
+    """x < 1.5 时的 Bernoulli 展开：π⁴/15 - Σ B_k x^(k+3) / ((k+3) k!)，x 为浮点数或数组"""
+    x2 = x * x
+    p = _BERNOULLI_EVEN[0]
+    for b in _BERNOULLI_EVEN[1:]:
+        p = p * x2 + b
+    return _PLANCK_TOTAL - x * x2 * (1.0 / 3 - x / 8 + x2 * p)
+
+
+def _tail_exp(x, q, terms):
+    """x >= 1.5 时的指数级数：Σ e^{-nx} (x³/n + 3x²/n² + 6x/n³ + 6/n⁴)，q = e^{-x}"""
+    total = 0.0
+    qn = q
+    for n, inv_n4 in enumerate(_INV_N4[:terms], 1):
+        u = n * x
+        total = total + qn * ((((u + 3.0) * u + 6.0) * u + 6.0) * inv_n4)
+        qn = qn * q
+    return total
+
+
+def _series_terms(x_min):
+    """x >= x_min 时截断误差 < e^-36 所需的指数级数项数"""
+    return max(1, min(_SERIES_TERMS, math.ceil(36 / x_min)))
+
+
+def _planck_tail_scalar(x):
+    """_planck_tail 的浮点版本"""
+    if x >= _SERIES_SPLIT:
+        if x == math.inf:
+            return 0.0
+        return _tail_exp(x, math.exp(-x), _series_terms(x))
+    return _tail_small(x)
+
+
+def _planck_tail(x):
+    """∫_x^∞ t³/(e^t-1) dt，x 为数组，相对误差 < 1e-12
+
+    每个元素只计算其所在区间的级数；指数级数的项数按区间内最小的 x 确定。
+    """
+    x = np.asarray(x, dtype=float)
+    if x.size <= _SCALAR_SIZE:
+        return np.array([_planck_tail_scalar(v) for v in x.ravel().tolist()]).reshape(x.shape)
+
+    tail = np.empty_like(x)
+    large = x >= _SERIES_SPLIT
+    small = ~large
+    tail[small] = _tail_small(x[small])
+    xl = x[large]
+    if xl.size:
+        with np.errstate(invalid='ignore'):
+            tail[large] = _tail_exp(xl, np.exp(-xl), _series_terms(xl.min()))
+        tail[x == np.inf] = 0.0
+    return tail
+
+
+def _band_radiance_scalar(T, l1, l2):
+    """band_radiance 的浮点版本，输入非正时返回 None"""
+    if not (T > 0 and l1 > 0 and l2 > 0):
+        return None
+    x1 = c2 / (l1 * 1e-6 * T)
+    x2 = c2 / (l2 * 1e-6 * T)
+    return c1 * T**4 / c2**4 * (_planck_tail_scalar(x2) - _planck_tail_scalar(x1))
+
+
+def band_radiance(T, l1, l2):
+    """黑体在 l1~l2 (μm) 波段内的辐射出射度 (W/m²)
+
+    T、l1、l2 可为任意可广播的数组。采用级数解析求值，
+    与 scipy.integrate.quad 结果的相对误差 < 1e-10。
+    """
+    T, l1, l2 = np.asarray(T, dtype=float), np.asarray(l1, dtype=float), np.asarray(l2, dtype=float)
+    b = np.broadcast(T, l1, l2)
+    if b.size <= _SCALAR_SIZE:
+        # 少量元素（如单个场景的三个辐射源）逐个用浮点运算
+        M = [_band_radiance_scalar(float(t), float(a), float(c)) for t, a, c in b]
+        if None not in M:
+            return np.array(M).reshape(b.shape)[()]
+    T, l1, l2 = np.broadcast_arrays(T, l1, l2)
+    x = c2 / (np.stack([l2, l1]) * 1e-6 * T)
+    tail = _planck_tail(x)
+    return (c1 * T**4 / c2**4 * (tail[0] - tail[1]))[()]
+
+
+def band_radiance_quad(T, l1, l2):
+    """band_radiance 的数值积分参考实现（仅标量）"""
+    def M(x):
+        return c1 / x**5 / (np.exp(c2 / (x * T)) - 1)
+
+    return quad(M, l1 / 1e6, l2 / 1e6)[0]
+
+
+def radiance_terms(params, radiance=band_radiance):
+    """计算蒙皮、喷口、尾焰的辐亮度 (L, Lp, Lw)
+
+    radiance 为波段积分函数，可替换为 IR_lut 中的查表版本。
+    """
+    if radiance is band_radiance and _derived(params, 'Lw') is not None:
+        return params.L, params.Lp, params.Lw
+    Tm, Tp, Tw = source_temperatures(params)
+    l1, l2 = params['l1'], params['l2']
+    # 三个辐射源一次性求波段积分
+    if np.ndim(Tm) == np.ndim(Tp) == np.ndim(Tw) == np.ndim(l1) == np.ndim(l2) == 0:
+        M = radiance(np.array([Tm, Tp, Tw], dtype=float), l1, l2)
+    else:
+        Tm, Tp, Tw, l1, l2 = np.broadcast_arrays(Tm, Tp, Tw, l1, l2)
+        M = radiance(np.stack([Tm, Tp, Tw]), l1, l2)
+    L = params['emissivity_skin'] / np.pi * M[0]
+    Lp = params['emissivity_nozzle'] / np.pi * M[1]
+    Lw = params['emissivity_flame'] / np.pi * M[2]
+    return L, Lp, Lw
+
+
+def zone_masks(beta):
+    """按角度分区返回布尔掩码 (尾焰侧面可见区, 喷口可见区)"""
+    beta = np.asarray(beta, dtype=float)
+    # 分区 1、2、4、5 可见尾焰侧面
+    lateral = ((beta >= ZONE_EDGE) & (beta < np.pi - ZONE_EDGE)) | \
+              ((beta >= np.pi + ZONE_EDGE) & (beta < 2*np.pi - ZONE_EDGE))
+    # 分区 2、3、4 可见喷口
+    rear = (beta >= np.pi / 2) & (beta < 3*np.pi / 2)
+    return lateral, rear
+
+
+def angle_factors(beta):
+    """角度数组上与参数无关的量
+
+    返回 (|sinβ|, |cosβ|, 尾焰侧面可见区掩码, 侧面可见区的 |sinβ|（其余为 1）,
+    喷口可见区的 |cosβ|（其余为 0）, 喷口投影面积 π cos²β（不可见处为 0）)。
+    """
+    beta = np.asarray(beta, dtype=float)
+    abs_sin = np.abs(np.sin(beta))
+    abs_cos = np.abs(np.cos(beta))
+    lateral, rear = zone_masks(beta)
+    return (abs_sin, abs_cos, lateral, np.where(lateral, abs_sin, 1.0),
+            np.where(rear, abs_cos, 0.0), np.where(rear, np.pi * abs_cos**2, 0.0))
+
+
+def angular_intensity(beta, params, s_value, L, Lp, Lw, factors=None):
+    """在角度数组上计算蒙皮、尾焰、喷口辐射强度 (Im, Iw, Ip)
+
+    factors 为 angle_factors(beta) 的结果，同一角度数组重复计算时可预先求出。
+    """
+    if factors is None:
+        factors = angle_factors(beta)
+    abs_sin, abs_cos = factors[:2]
+
+    # 1. 蒙皮投影面积
+    s = params['s1'] * abs_cos + s_value * abs_sin
+    Im = s * L
+
+    Iw, Ip = plume_nozzle_intensity(beta, params, Lp, Lw, factors)
+    return Im, Iw, Ip
+
+
+def plume_nozzle_intensity(beta, params, Lp, Lw, factors=None):
+    """尾焰与喷口辐射强度 (Iw, Ip)，beta 为观察方向与机头方向的夹角"""
+    _, abs_cos, lateral, lateral_sin, rear_cos, nozzle_area = \
+        angle_factors(beta) if factors is None else factors
+    s4 = _derived(params, 's4')
+    if s4 is None:
+        s4 = np.pi * np.asarray(params['Rp'])**2
+    lwy = np.asarray(params['lwy'])
+
+    # 2. 尾焰投影面积（侧面 + 尾部截面）
+    lwy_sin = lwy * lateral_sin
+    Sw = np.where(lateral, (lwy_sin - abs_cos)**2 / lwy_sin, 0.0) + s4 * rear_cos
+    Iw = Lw * Sw
+
+    # 3. 喷口投影面积
+    Ip = Lp * nozzle_area
+    return Iw, Ip
+
+
+# 分区边界角
+ZONE_BOUNDARIES = np.array([
+    ZONE_EDGE, np.pi / 2, np.pi - ZONE_EDGE, np.pi + ZONE_EDGE, 3*np.pi / 2, 2*np.pi - ZONE_EDGE
+])
+
+# 界面中的角度采样选项: 均匀网格间隔 (deg) 或自适应
+ANGLE_SAMPLING = {
+    "1°": 1.0,
+    "0.5°": 0.5,
+    "0.1°": 0.1,
+    "自适应": 'adaptive',
+}
+
+
+def angle_grid(resolution=1.0):
+    """[0, 2π) 上间隔为 resolution 度的均匀角度网格（不含重复的 2π）"""
+    n = int(round(360.0 / resolution))
+    return np.arange(n) * (2*np.pi / n)
+
+
+@lru_cache(maxsize=16)
+def uniform_angles(resolution=1.0):
+    """均匀角度网格及其 angle_factors，按间隔缓存，数组只读"""
+    beta = angle_grid(resolution)
+    factors = angle_factors(beta)
+    for a in (beta,) + factors:
+        a.flags.writeable = False
+    return beta, factors
+
+
+def adaptive_angle_grid(params, s_value, resolution=5.0, rtol=1e-4, min_step=0.01,
+                        max_points=4000, radiance=band_radiance):
+    """自适应角度网格
+
+    以间隔 resolution 度的粗网格为起点，在各分区边界两侧加点以捕捉间断，
+    然后反复二分中点处线性插值误差超过 rtol * max(I) 的区间，
+    直到误差满足要求、区间宽度小于 min_step 度或点数达到 max_points。
+    """
+    L, Lp, Lw = radiance_terms(params, radiance)
+
+    def total(beta):
+        return sum(angular_intensity(beta, params, s_value, L, Lp, Lw))
+
+    # 分区以 beta < 边界 划分，在边界左侧 1e-9 rad 处加点
+    beta = np.unique(np.concatenate([angle_grid(resolution), ZONE_BOUNDARIES, ZONE_BOUNDARIES - 1e-9]))
+    I = total(beta)
+    scale = max(np.max(I), np.finfo(float).tiny)
+    min_width = 2 * np.radians(min_step)
+
+    while len(beta) < max_points:
+        # 包括首尾相接的最后一个区间
+        beta_next = np.append(beta[1:], 2*np.pi)
+        I_next = np.append(I[1:], I[0])
+        width = beta_next - beta
+        mid = beta + width / 2
+        I_mid = total(mid)
+        err = np.abs(I_mid - (I + I_next) / 2) / scale
+        refine = (err > rtol) & (width > min_width)
+        if not np.any(refine):
+            break
+
+        # 点数预算不足时优先加密误差最大的区间
+        budget = max_points - len(beta)
+        if np.count_nonzero(refine) > budget:
+            refine &= err >= np.sort(err[refine])[-budget]
+
+        beta = np.concatenate([beta, mid[refine]])
+        I = np.concatenate([I, I_mid[refine]])
+        order = np.argsort(beta)
+        beta, I = beta[order], I[order]
+
+    return beta
+
+
+def sample_angles(params, s_value, sampling=1.0, radiance=band_radiance):
+    """按采样设置生成角度数组: sampling 为间隔 (deg) 或 'adaptive'"""
+    if sampling == 'adaptive':
+        return adaptive_angle_grid(params, s_value, radiance=radiance)
+    return angle_grid(sampling)
+
+
+def angle_index(beta, angle_deg):
+    """角度 angle_deg (deg) 在角度数组 beta 中最近的下标（按圆周计算）"""
+    n = len(beta)
+    angle = np.radians(angle_deg) % (2*np.pi)
+    step = 2*np.pi / n
+    if n > 1 and beta[0] == 0 and np.isclose(beta[-1], 2*np.pi - step):
+        # 均匀网格直接计算
+        return int(round(angle / step)) % n
+    i = int(np.searchsorted(beta, angle))
+    candidates = [(i - 1) % n, i % n]
+    return min(candidates, key=lambda j: abs((beta[j] - angle + np.pi) % (2*np.pi) - np.pi))
+
+
+def close_curve(beta, *values):
+    """在末尾补上首点 (beta + 2π)，使极坐标曲线闭合"""
+    beta = np.append(beta, beta[0] + 2*np.pi)
+    return (beta,) + tuple(np.append(v, v[0]) for v in values)
+
+
+def angular_mean(beta, values):
+    """按角度加权的平均值：闭合曲线的梯形积分除以 2π，适用于非均匀角度网格"""
+    beta, values = close_curve(beta, values)
+    return float(np.sum((values[1:] + values[:-1]) * np.diff(beta)) / (4 * np.pi))
+
+
+def radiation_calculations(params, s_value, angle_mode='horizontal', radiance=band_radiance, sampling=1.0):
+    """执行辐射计算
+
+    sampling 为角度采样间隔 (deg)，或 'adaptive' 表示在分区边界和
+    强度变化剧烈处自适应加密。
+    """
+    with span('radiation.radiance'):
+        L, Lp, Lw = radiance_terms(params, radiance)
+
+    # 准备角度数据
+    with span('radiation.angles'):
+        if sampling == 'adaptive':
+            myBeta = adaptive_angle_grid(params, s_value, radiance=radiance)
+            factors = angle_factors(myBeta)
+        else:
+            # 均匀网格及其三角函数值、分区掩码按间隔缓存（只读）
+            myBeta, factors = uniform_angles(sampling)
+    with span('radiation.intensity'):
+        Im_arr, Iw_arr, Ip_arr = angular_intensity(myBeta, params, s_value, L, Lp, Lw, factors)
+
+    # 总辐射强度
+    results = Im_arr + Iw_arr + Ip_arr
+    return myBeta, results, np.max(results), Im_arr, Iw_arr, Ip_arr
+
+
+# 气象条件修正因子
+WEATHER_FACTORS = {
+    "晴天": 1.0,
+    "多云": 0.8,
+    "阴天": 0.6,
+    "雨天": 0.2  # 雨天对长波影响更大
+}
+
+# Stefan-Boltzmann 常数 W/m²K⁴
+SIGMA = 5.67e-8
+
+
+def is_midwave(band):
+    """判断探测波段是否为中波，band 可为字符串数组"""
+    return (np.char.find(np.asarray(band, dtype=str), "中波") >= 0)[()]
+
+
+def weather_factor(weather):
+    """气象条件修正因子，weather 可为字符串数组"""
+    weather = np.asarray(weather, dtype=object)
+    w = np.array([WEATHER_FACTORS.get(x, 1.0) for x in weather.ravel()]).reshape(weather.shape)
+    return w[()]
+
+
+def extinction_coefficient(params):
+    """大气衰减系数 (km⁻¹)"""
+    if _derived(params, 'k') is not None:
+        return params.k
+    # 获取高度（转换为km）
+    H_km = np.asarray(params['H']) / 1000.0
+
+    # 中波: 基础衰减 0.2，特征高度 10km；长波: 基础衰减 0.15，特征高度 8km
+    mid = is_midwave(params['band'])
+    k_base = np.where(mid, 0.2, 0.15)
+    h_factor = np.exp(-H_km / np.where(mid, 10.0, 8.0))
+
+    return (k_base * h_factor * weather_factor(params['weather']))[()]
+
+
+def detector_constant(params):
+    """探测器常数 C，无大气衰减时作用距离 R(m) = sqrt(C * I)"""
+    if _derived(params, 'C') is not None:
+        return params.C
+    # 探测器参数
+    D = params['detector_aperture']  # 探测器孔径(m)
+    SNR_min = params['snr_threshold']  # 最小信噪比
+
+    # 光学系统参数
+    f_number = np.asarray(params['f_number'])  # F数
+    τ0 = params['optical_trans']  # 光学透过率
+
+    # 探测器性能参数
+    NETD = params['netd']  # 噪声等效温差(K)
+    Δf = params['system_bandwidth']  # 系统带宽(Hz)
+    D_star = params['d_star']  # 比探测率(cm√Hz/W)
+    pixel_size = np.asarray(params['pixel_size']) * 1e-6  # 敏感元尺寸(m)
+
+    # 探测器敏感元面积与接收面积
+    A_d = pixel_size**2  # m²
+    A0 = np.pi * (np.asarray(D) / 2)**2  # m²
+
+    # dW/dT ≈ 4σT^3
+    dWdT = 4 * SIGMA * np.asarray(params['bg_temp'])**3  # W/m²K
+
+    return (τ0 * A0 * D_star * np.sqrt(A_d * Δf * 1e4)) / \
+        (NETD * np.sqrt(4*f_number**2 + 1) * dWdT * SNR_min)
+
+
+def lambertw(z, rtol=1e-12, maxiter=20):
+    """实数主支 Lambert W 函数 (z >= 0)，Halley 迭代
+
+    返回 (w, converged)，converged 为逐元素的收敛标志。
+    """
+    z = np.asarray(z, dtype=float)
+    # Winitzki 初值，相对误差约 1e-2
+    lz = np.log1p(z)
+    w = lz * (1 - np.log1p(lz) / (2 + lz))
+    converged = np.zeros(z.shape, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(maxiter):
+            ew = np.exp(w)
+            f = w * ew - z
+            step = f / (ew * (w + 1) - (w + 2) * f / (2 * w + 2))
+            w = w - step
+            converged = np.abs(step) <= rtol * np.maximum(np.abs(w), np.finfo(float).tiny)
+            if np.all(converged | ~np.isfinite(w)):
+                break
+    converged &= np.isfinite(w)
+    return w, converged
+
+
+@traced('range.solve')
+def detection_range(params, intensity, rtol=1e-12, atmosphere=None):
+    """计算作用距离 (km)，intensity 可为数组
+
+    求解 R = R0 * exp(-k R / 2)，其中 R0 = sqrt(C I) / 1000 为无衰减作用距离。
+    令 w = k R / 2，则 w e^w = k R0 / 2，即 w = W(k R0 / 2)（Lambert W 函数），
+    R = R0 * exp(-w)。返回 (R, converged)，converged 为逐元素的收敛标志。
+
+    atmosphere 为提供 detection_range(params, intensity, rtol) 的大气模型
+    （如 IR_atmosphere.TransmittanceTable），给出时改用其透过率计算。
+    """
+    if atmosphere is not None:
+        return atmosphere.detection_range(params, intensity, rtol)
+    intensity = np.asarray(intensity, dtype=float)
+    k = np.asarray(extinction_coefficient(params), dtype=float)
+    R0 = np.sqrt(detector_constant(params) * intensity) / 1000.0
+
+    w, converged = lambertw(k * R0 / 2, rtol)
+    R = R0 * np.exp(-w)
+    return R[()], converged[()]
+
+
+def calc_range_at_angle(params, intensity, angle=None, angle_type=None, atmosphere=None):
+    """计算特定角度下的作用距离 (km)"""
+    R, _ = detection_range(params, intensity, atmosphere=atmosphere)
+    return R
@@ -0,0 +1,124 @@
+"""Streamlit 静态图的渲染与缓存
+
+图形不经过 pyplot，不会进入其全局图形注册表；每个图位复用同一个 Figure，
+渲染出的 PNG 按绘图函数、数据哈希和样式参数缓存，数据未变时不再重新渲染。
+"""
+import hashlib
+import io
+import threading
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from IR_cache import LRUCache
+from IR_engine import close_curve, angular_mean
+
+# 与 st.pyplot 相同的保存参数
+SAVEFIG_OPTIONS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+
+def data_key(*args):
+    """参数的内容哈希，数组按数据类型、形状和字节计算"""
+    h = hashlib.sha1()
+    for arg in args:
+        if isinstance(arg, np.ndarray):
+            arr = np.ascontiguousarray(arg)
+            h.update(f"{arr.dtype.str}{arr.shape}".encode())
+            h.update(arr.tobytes())
+        else:
+            h.update(repr(arg).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def draw_radiation(fig, beta, total, skin, plume, nozzle):
+    """辐射模式图：总辐射与蒙皮、尾焰、喷口辐射四条曲线"""
+    ax = fig.add_subplot(111, projection='polar')
+    curves = close_curve(beta, total, skin, plume, nozzle)
+    ax.plot(curves[0], curves[1], 'r-', linewidth=2, label='总辐射')
+    ax.plot(curves[0], curves[2], 'b--', label='蒙皮辐射')
+    ax.plot(curves[0], curves[3], 'g:', label='尾焰辐射')
+    ax.plot(curves[0], curves[4], 'm-.', label='喷口辐射')
+    ax.set_rlabel_position(22.5)
+    ax.grid(True)
+    ax.legend(loc='upper right', bbox_to_anchor=(1.15, 1.15))
+
+
+def draw_range(fig, beta, range_values, title, style):
+    """作用距离包线图：包线、最大值标记、标注和统计信息"""
+    ax = fig.add_subplot(111, projection='polar')
+    ax.plot(*close_curve(beta, range_values), style, linewidth=2, label='作用距离包线')
+
+    # 标记最大作用距离点
+    i = np.argmax(range_values)
+    max_range = range_values[i]
+    ax.plot([beta[i]], [max_range], 'ro', markersize=8)
+    ax.annotate(f'最大: {max_range:.1f}km',
+                xy=(beta[i], max_range),
+                xytext=(beta[i] + 0.3, max_range * 1.1),
+                arrowprops=dict(facecolor='red', shrink=0.05),
+                color='white')
+
+    ax.set_title(title, fontsize=12, pad=15, color='white')
+    ax.set_rlabel_position(22.5)
+    ax.grid(True)
+    ax.legend(loc='upper right')
+
+    # 添加表格信息
+    table_text = (
+        f"最大作用距离: {max_range:.1f} km @ {np.degrees(beta[i]):.1f}°\n"
+        f"平均作用距离: {angular_mean(beta, range_values):.1f} km\n"
+        f"最小作用距离: {np.min(range_values):.1f} km"
+    )
+    ax.text(0.5, -0.3, table_text, transform=ax.transAxes,
+            fontsize=10, ha='center', va='top', color='white',
+            bbox=dict(boxstyle='round', facecolor='#1E1E1E', alpha=0.8, edgecolor='#0078D7'))
+
+
+class FigureRenderer:
+    """按图位复用 Figure，并缓存渲染结果的 PNG 字节
+
+    缓存键为 (绘图函数, 参数内容哈希, 图幅与保存参数)，不同会话之间共享。
+    Figure 由各会话线程共用，渲染时加锁。
+    """
+
+    def __init__(self, maxsize=64, figsize=(8, 6), savefig=SAVEFIG_OPTIONS):
+        self.images = LRUCache(maxsize)
+        self.figsize = figsize
+        self.savefig = dict(savefig)
+        self.figures = {}
+        self.lock = threading.Lock()
+        self.renders = 0
+
+    def figure(self, slot):
+        """图位对应的 Figure，首次使用时创建"""
+        fig = self.figures.get(slot)
+        if fig is None:
+            fig = self.figures[slot] = Figure(figsize=self.figsize)
+        return fig
+
+    def render(self, slot, draw, *args):
+        """draw(fig, *args) 绘制到图位 slot 的 Figure，返回 PNG 字节"""
+        key = (draw.__name__, data_key(*args), self.figsize, tuple(sorted(self.savefig.items())))
+        image = self.images.get(key)
+        if image is not None:
+            return image
+        with self.lock:
+            fig = self.figure(slot)
+            fig.clf()
+            try:
+                draw(fig, *args)
+                buf = io.BytesIO()
+                fig.savefig(buf, **self.savefig)
+            finally:
+                # 清空图形，释放曲线数据
+                fig.clf()
+            self.renders += 1
+        image = buf.getvalue()
+        self.images.put(key, image)
+        return image
+
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+            self.figures.clear()
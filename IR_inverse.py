@@ -0,0 +1,141 @@
+"""逆向设计：求达到目标作用距离所需的参数值"""
+import numpy as np
+
+from IR_engine import detection_range, band_radiance, radiance_terms, angular_intensity
+from IR_cache import RADIATION_KEYS
+from IR_params import FRACTIONS
+from IR_sweep import DIRECTION_AREA
+
+# 只影响投影面积、不影响辐亮度的参数（另加当前方向的投影面积 s2/s3）
+GEOMETRY_KEYS = ('s1', 'Rp', 'lwy')
+
+
+class _Forward:
+    """固定角度下以参数 name 为自变量的作用距离，批量计算
+
+    辐射强度对三个辐射源的辐亮度是线性的：I = Am·L + Aw·Lw + Ap·Lp，
+    投影面积 Am、Aw、Ap 只与几何参数和角度有关。按 name 的类别缓存与其无关的部分：
+      探测器、大气参数    各角度的辐射强度只算一次，每次迭代只求解作用距离
+      几何参数            缓存辐亮度，每次迭代只重算投影面积
+      温度、发射率等参数  缓存投影面积，每次迭代只重算三个波段积分
+    """
+
+    def __init__(self, base_params, name, angles, direction, radiance):
+        self.params = dict(base_params)
+        self.name = name
+        self.beta = np.radians(angles)[:, None]
+        self.s_key = DIRECTION_AREA[direction]
+        self.radiance = radiance
+        self.intensity = self.terms = self.areas = None
+        if name in GEOMETRY_KEYS or name == self.s_key:
+            self.terms = radiance_terms(self.params, radiance)
+        elif name in RADIATION_KEYS:
+            self.areas = angular_intensity(self.beta, self.params, self.params[self.s_key], 1.0, 1.0, 1.0)
+        else:
+            L, Lp, Lw = radiance_terms(self.params, radiance)
+            Im, Iw, Ip = angular_intensity(self.beta, self.params, self.params[self.s_key], L, Lp, Lw)
+            self.intensity = (Im + Iw + Ip)[:, 0]
+
+    def __call__(self, x, rows=slice(None)):
+        params = dict(self.params)
+        if self.intensity is not None:
+            params[self.name] = x
+            return detection_range(params, self.intensity[rows])[0]
+        params[self.name] = x[:, None]
+        if self.terms is not None:
+            L, Lp, Lw = self.terms
+            Im, Iw, Ip = angular_intensity(self.beta[rows], params, params[self.s_key], L, Lp, Lw)
+            total = Im + Iw + Ip
+        else:
+            L, Lp, Lw = radiance_terms(params, self.radiance)
+            Am, Aw, Ap = (area[rows] for area in self.areas)
+            total = Am * L + Aw * Lw + Ap * Lp
+        return detection_range(params, total)[0][:, 0]
+
+
+def _expand_bracket(g, x0, upper, maxiter=40):
+    """从 x0 出发按倍数向两侧扩展，直至 g 在区间两端异号"""
+    lo = np.full_like(x0, x0)
+    hi = np.full_like(x0, x0)
+    g_lo = g(lo)
+    g_hi = g_lo.copy()
+    found = g_lo == 0
+    for _ in range(maxiter):
+        if np.all(found):
+            break
+        lo = np.where(found, lo, lo / 2)
+        hi = np.where(found, hi, np.minimum(hi * 2, upper))
+        g_lo = g(lo)
+        g_hi = g(hi)
+        found |= g_lo * g_hi <= 0
+    return lo, hi, found
+
+
+def solve_parameter(base_params, name, target_range, angle, direction='horizontal',
+                    bracket=None, rtol=1e-8, maxiter=60, radiance=band_radiance):
+    """求参数 name 的取值，使角度 angle (deg) 处的作用距离等于 target_range (km)
+
+    target_range 与 angle 可为数组（互相广播），所有目标在一次调用中批量求解。
+    bracket 为 (下限, 上限)；未给出时从当前值按倍数扩展（要求当前值为正）。
+    在区间内以 Newton 迭代求根，导数由同一批前向计算中的差分得到，
+    迭代越出区间时改用二分，保证收敛。正参数在对数坐标下迭代。
+
+    返回 (取值, converged)，区间内无解的目标取值为 nan。
+    """
+    target, angles = np.broadcast_arrays(np.asarray(target_range, dtype=float),
+                                         np.asarray(angle, dtype=float))
+    shape = target.shape
+    target = target.ravel().copy()
+    angles = angles.ravel().copy()
+    n = len(target)
+    forward = _Forward(base_params, name, angles, direction, radiance)
+    upper = 1.0 if name in FRACTIONS else np.inf
+
+    def g(x, rows=slice(None)):
+        return forward(x, rows) - target[rows]
+
+    if bracket is None:
+        x0 = float(base_params[name])
+        if not x0 > 0:
+            raise ValueError(f"参数 {name} 的当前值不为正，需要指定 bracket")
+        lo, hi, found = _expand_bracket(g, np.full(n, x0), upper)
+    else:
+        lo = np.full(n, float(bracket[0]))
+        hi = np.full(n, float(bracket[1]))
+        found = g(lo) * g(hi) <= 0
+
+    # 正参数在对数坐标下迭代
+    log = bool(np.all(lo > 0))
+    to_u, from_u = (np.log, np.exp) if log else (lambda v: v, lambda v: v)
+    u_lo, u_hi = to_u(lo), to_u(hi)
+    sign_hi = np.sign(g(hi))
+    u = (u_lo + u_hi) / 2
+    # 区间内无解的目标不参与迭代
+    finished = ~found
+
+    for _ in range(maxiter):
+        rows = np.flatnonzero(~finished)
+        if len(rows) == 0:
+            break
+        ur = u[rows]
+        h = 1e-6 * np.maximum(np.abs(ur), 1.0)
+        # 同一批计算当前点与差分点
+        values = g(from_u(np.concatenate([ur, ur + h])), np.concatenate([rows, rows]))
+        gr, gh = values[:len(rows)], values[len(rows):]
+
+        done = np.abs(gr) <= rtol * np.abs(target[rows])
+        above = gr * sign_hi[rows] > 0
+        u_hi[rows] = np.where(above, ur, u_hi[rows])
+        u_lo[rows] = np.where(above, u_lo[rows], ur)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u_new = ur - gr * h / (gh - gr)
+        inside = (u_new > np.minimum(u_lo[rows], u_hi[rows])) & (u_new < np.maximum(u_lo[rows], u_hi[rows]))
+        u_new = np.where(inside, u_new, (u_lo[rows] + u_hi[rows]) / 2)
+        done |= np.abs(u_new - ur) <= rtol * np.maximum(np.abs(ur), 1e-300)
+        u[rows] = np.where(done, ur, u_new)
+        finished[rows] = done
+
+    converged = finished & found
+    x = np.where(found, from_u(u), np.nan)
+    return x.reshape(shape)[()], converged.reshape(shape)[()]
@@ -0,0 +1,167 @@
+"""温度 × 波段辐射出射度查找表"""
+import os
+import numpy as np
+
+from IR_engine import band_radiance, c1, c2
+
+# 常用探测波段 (μm)
+COMMON_BANDS = [(3.0, 5.0), (8.0, 12.0)]
+
+# 默认温度范围 (K)，覆盖蒙皮、喷口和尾焰温度
+T_MIN = 100.0
+T_MAX = 3500.0
+
+
+def log_curvature(T, l1, l2):
+    """log M 对 log T 的二阶导数，M 为 l1~l2 (μm) 波段的辐射出射度
+
+    M = c1 T⁴ / c2⁴ · D，D = ∫_{x2}^{x1} t³/(e^t-1) dt，x = c2 / (λT)。
+    记 h(x) = x⁴/(e^x-1)，则 dD/dlogT = h(x2) - h(x1)，
+    d²D/dlogT² = x1 h'(x1) - x2 h'(x2)，其中 x h'(x) = h(x) (4 - x / (1 - e^-x))。
+    """
+    T = np.asarray(T, dtype=float)
+    D = band_radiance(T, l1, l2) * c2**4 / (c1 * T**4)
+    x1 = c2 / (l1 * 1e-6 * T)
+    x2 = c2 / (l2 * 1e-6 * T)
+    h1 = x1**4 / np.expm1(x1)
+    h2 = x2**4 / np.expm1(x2)
+    D1 = h2 - h1
+    D2 = h1 * (4 - x1 / -np.expm1(-x1)) - h2 * (4 - x2 / -np.expm1(-x2))
+    return D2 / D - (D1 / D)**2
+
+
+class RadianceTable:
+    """单一波段的辐射出射度查找表
+
+    在 log(T) 等间距网格上存储 log(M)，查询时做对数-对数线性插值。
+    每个区间的插值误差上界在建表时由插值余项逐区间求出并随表保存，
+    超出温度范围的查询回退到 band_radiance 精确计算。
+    """
+
+    def __init__(self, l1, l2, data):
+        self.l1 = float(l1)
+        self.l2 = float(l2)
+        # data: 第 0 行 log(T)，第 1 行 log(M)，第 2 行各区间相对误差上界
+        self.data = data
+        self.log_T = data[0]
+        self.log_M = data[1]
+        self.log_T0 = float(self.log_T[0])
+        self.dlog_T = float(self.log_T[1] - self.log_T[0])
+        self.T_min = float(np.exp(self.log_T[0]))
+        self.T_max = float(np.exp(self.log_T[-1]))
+        self.max_rel_error = float(np.max(data[2]))
+
+    @classmethod
+    def build(cls, l1, l2, T_min=T_MIN, T_max=T_MAX, tol=1e-6, n=256, n_max=65536):
+        """建表，网格逐次加密直至插值误差上界小于 tol"""
+        while True:
+            log_T = np.linspace(np.log(T_min), np.log(T_max), n)
+            log_M = np.log(band_radiance(np.exp(log_T), l1, l2))
+
+            # 线性插值余项: 区间内 |Δlog M| ≤ h²/8 · max|f''|，f = log M 为 log T 的函数。
+            # f'' 在一个区间内变化平缓，取区间两端及 1/4、1/2、3/4 处的最大值
+            h = log_T[1] - log_T[0]
+            frac = np.linspace(0.0, 1.0, 5)
+            curvature = np.abs(log_curvature(np.exp(log_T[:-1, None] + frac * h), l1, l2))
+            err = np.expm1(h**2 / 8 * np.max(curvature, axis=1))
+
+            if np.max(err) < tol or n >= n_max:
+                break
+            n *= 2
+
+        data = np.vstack([log_T, log_M, np.append(err, 0.0)])
+        return cls(l1, l2, data)
+
+    @classmethod
+    def load(cls, path, l1, l2):
+        """以只读内存映射方式加载查找表"""
+        return cls(l1, l2, np.load(path, mmap_mode='r'))
+
+    def save(self, path):
+        """保存查找表"""
+        np.save(path, np.asarray(self.data))
+
+    def __call__(self, T):
+        """查询温度 T (K) 对应的波段辐射出射度 (W/m²)"""
+        T = np.asarray(T, dtype=float)
+        u = (np.log(T) - self.log_T0) / self.dlog_T
+        i = np.clip(np.floor(u).astype(int), 0, len(self.log_T) - 2)
+        f = u - i
+        M = np.exp(self.log_M[i] + f * (self.log_M[i + 1] - self.log_M[i]))
+
+        outside = (T < self.T_min) | (T > self.T_max)
+        if np.any(outside):
+            M = np.where(outside, band_radiance(np.where(outside, T, self.T_min), self.l1, self.l2), M)
+        return M[()]
+
+
+class RadianceTableCache:
+    """按波段缓存的查找表集合
+
+    directory 不为空时，查找表以 .npy 文件保存在该目录，
+    之后的进程直接内存映射加载，多个进程共享同一份只读数据。
+    """
+
+    def __init__(self, directory=None, tol=1e-6, T_min=T_MIN, T_max=T_MAX):
+        self.directory = directory
+        self.tol = tol
+        self.T_min = T_min
+        self.T_max = T_max
+        self.tables = {}
+
+    def _path(self, l1, l2):
+        return os.path.join(self.directory, f"radiance_{l1:g}_{l2:g}_{self.tol:g}.npy")
+
+    def get(self, l1, l2):
+        """获取 l1~l2 (μm) 波段的查找表，必要时加载或新建"""
+        key = (float(l1), float(l2))
+        table = self.tables.get(key)
+        if table is not None:
+            return table
+
+        if self.directory is not None and os.path.exists(self._path(*key)):
+            table = RadianceTable.load(self._path(*key), *key)
+        else:
+            table = RadianceTable.build(*key, T_min=self.T_min, T_max=self.T_max, tol=self.tol)
+            if self.directory is not None:
+                os.makedirs(self.directory, exist_ok=True)
+                # 先写临时文件再改名，避免并发进程读到半个文件
+                tmp = self._path(*key) + f".{os.getpid()}.tmp.npy"
+                table.save(tmp)
+                os.replace(tmp, self._path(*key))
+        self.tables[key] = table
+        return table
+
+    def preload(self, bands=COMMON_BANDS):
+        """预先建立常用波段的查找表"""
+        for l1, l2 in bands:
+            self.get(l1, l2)
+
+    def band_radiance(self, T, l1, l2):
+        """与 IR_engine.band_radiance 接口一致的查表版本"""
+        if np.ndim(l1) == 0 and np.ndim(l2) == 0:
+            return self.get(l1, l2)(T)
+
+        # 多个波段：按不同波段分组查询
+        T, l1, l2 = np.broadcast_arrays(np.asarray(T, dtype=float), l1, l2)
+        if T.size and np.all(l1 == l1.flat[0]) and np.all(l2 == l2.flat[0]):
+            return self.get(l1.flat[0], l2.flat[0])(T)
+        M = np.empty(T.shape)
+        bands = np.stack([l1.ravel(), l2.ravel()], axis=1)
+        uniq, inverse = np.unique(bands, axis=0, return_inverse=True)
+        inverse = inverse.reshape(T.shape)
+        for j, (b1, b2) in enumerate(uniq):
+            mask = inverse == j
+            M[mask] = self.get(b1, b2)(T[mask])
+        return M
+
+
+_default_cache = None
+
+
+def default_cache():
+    """进程级默认查找表缓存，目录由环境变量 IR_LUT_DIR 指定"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RadianceTableCache(os.environ.get('IR_LUT_DIR'))
+    return _default_cache
@@ -0,0 +1,152 @@
+"""不确定参数的蒙特卡洛传播与流式统计"""
+import threading
+
+import numpy as np
+
+from IR_engine import band_radiance, angle_grid
+from IR_params import POSITIVE, FRACTIONS
+from IR_sweep import sweep_table, SweepResult
+from IR_campaign import CampaignCancelled
+
+# 默认输出的分位数
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+def sample(distributions, n, rng):
+    """按分布描述抽取 n 组参数，返回 {参数名: 长度 n 的数组}
+
+    distributions 为 {参数名: 分布}，分布可为
+      ('normal', 均值, 标准差)
+      ('lognormal', 中位数, 对数标准差)
+      ('uniform', 下限, 上限)
+      ('triangular', 下限, 众数, 上限)
+    或 f(rng, n) 形式的函数。抽样结果截断到参数的合法范围。
+    """
+    table = {}
+    for name, dist in distributions.items():
+        if callable(dist):
+            values = np.asarray(dist(rng, n), dtype=float)
+        else:
+            kind, *args = dist
+            if kind == 'normal':
+                values = rng.normal(args[0], args[1], n)
+            elif kind == 'lognormal':
+                values = args[0] * np.exp(rng.normal(0.0, args[1], n))
+            elif kind == 'uniform':
+                values = rng.uniform(args[0], args[1], n)
+            elif kind == 'triangular':
+                values = rng.triangular(args[0], args[1], args[2], n)
+            else:
+                raise ValueError(f"未知分布类型: {kind}")
+        if name in FRACTIONS:
+            values = np.clip(values, 1e-6, 1.0)
+        elif name in POSITIVE:
+            values = np.maximum(values, 1e-12)
+        table[name] = values
+    return table
+
+
+class StreamingStats:
+    """逐元素的单遍统计量：均值、方差、最值和分位数
+
+    均值与方差按批合并（Chan 等人的并行 Welford 公式）。分位数由对数
+    坐标下的固定直方图估计，各元素的直方图范围取首批数据范围的 1/4~4 倍，
+    超出部分计入两端的区间。内存占用与样本数无关。
+    """
+
+    def __init__(self, shape, bins=2048):
+        self.shape = tuple(shape)
+        self.bins = bins
+        self.count = 0
+        self.mean = np.zeros(self.shape)
+        self.m2 = np.zeros(self.shape)
+        self.min = np.full(self.shape, np.inf)
+        self.max = np.full(self.shape, -np.inf)
+        self.hist = None
+
+    def update(self, batch):
+        """加入一批样本，batch 形状为 (样本数,) + shape"""
+        batch = np.asarray(batch, dtype=float)
+        n = len(batch)
+        if n == 0:
+            return
+        mean_b = batch.mean(axis=0)
+        m2_b = ((batch - mean_b)**2).sum(axis=0)
+        total = self.count + n
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + m2_b + delta**2 * self.count * n / total
+        self.count = total
+        self.min = np.minimum(self.min, batch.min(axis=0))
+        self.max = np.maximum(self.max, batch.max(axis=0))
+
+        log_b = np.log(np.maximum(batch, np.finfo(float).tiny))
+        if self.hist is None:
+            self.log_lo = np.log(np.maximum(self.min, np.finfo(float).tiny) / 4)
+            self.log_step = (np.log(np.maximum(self.max, np.finfo(float).tiny) * 4) - self.log_lo) / self.bins
+            self.hist = np.zeros(self.shape + (self.bins,), dtype=np.int64)
+        j = np.clip(((log_b - self.log_lo) / self.log_step).astype(np.int64), 0, self.bins - 1)
+        flat = np.arange(int(np.prod(self.shape)), dtype=np.int64).reshape(self.shape) * self.bins + j
+        self.hist += np.bincount(flat.ravel(), minlength=self.hist.size).reshape(self.hist.shape)
+
+    @property
+    def variance(self):
+        """样本方差"""
+        return self.m2 / max(self.count - 1, 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def quantile(self, q):
+        """估计分位数 q，在所在直方图区间内线性插值"""
+        cdf = np.cumsum(self.hist, axis=-1)
+        target = q * self.count
+        j = np.minimum(np.sum(cdf < target, axis=-1), self.bins - 1)
+        below = np.take_along_axis(cdf, j[..., None], -1)[..., 0] - \
+            np.take_along_axis(self.hist, j[..., None], -1)[..., 0]
+        inside = np.maximum(np.take_along_axis(self.hist, j[..., None], -1)[..., 0], 1)
+        frac = np.clip((target - below) / inside, 0.0, 1.0)
+        value = np.exp(self.log_lo + (j + frac) * self.log_step)
+        return np.clip(value, self.min, self.max)
+
+
+def monte_carlo(base_params, distributions, n_samples, beta=None, direction='horizontal',
+                batch_size=4096, seed=None, fields=('range', 'total'), quantiles=QUANTILES,
+                radiance=band_radiance, progress=None, cancel_event=None):
+    """蒙特卡洛传播参数不确定性
+
+    每批抽取 batch_size 组参数，在整个角度网格上一次计算辐射强度与作用距离，
+    结果只并入 StreamingStats，不保留单个样本。
+
+    返回维度为 ('statistic', 'beta') 的 SweepResult，统计量依次为
+    mean、std、min、max 以及各分位数（如 q05、q50、q95）。
+    progress(done, total) 在每批完成后调用；cancel_event 置位后抛出 CampaignCancelled。
+    """
+    if beta is None:
+        beta = angle_grid()
+    beta = np.asarray(beta, dtype=float)
+    rng = np.random.default_rng(seed)
+    cancel_event = cancel_event or threading.Event()
+    stats = {name: StreamingStats((len(beta),)) for name in fields}
+
+    done = 0
+    while done < n_samples:
+        if cancel_event.is_set():
+            raise CampaignCancelled(done, n_samples)
+        n = min(batch_size, n_samples - done)
+        table = sample(distributions, n, rng)
+        result = sweep_table(base_params, table, beta, direction, radiance)
+        for name in fields:
+            stats[name].update(result[name])
+        done += n
+        if progress is not None:
+            progress(done, n_samples)
+
+    names = ['mean', 'std', 'min', 'max'] + [f"q{round(q * 100):02d}" for q in quantiles]
+    data = {}
+    for name, s in stats.items():
+        data[name] = np.stack([s.mean, s.std, s.min, s.max] + [s.quantile(q) for q in quantiles])
+    result = SweepResult(['statistic', 'beta'], {'statistic': np.array(names), 'beta': beta}, data)
+    result.count = done
+    return result
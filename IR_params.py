@@ -0,0 +1,156 @@
+"""经过校验的不可变参数快照"""
+from collections.abc import Mapping
+
+import numpy as np
+
+import IR_engine
+
+# 参数名及其类型
+FIELDS = (
+    ('gama', float), ('r', float), ('s1', float), ('s2', float), ('s3', float),
+    ('Rp', float), ('lwy', float), ('l1', float), ('l2', float), ('H', float), ('Ma', float),
+    ('jl', int), ('fdj', int), ('fwjiaodu', float), ('fyjiaodu', float),
+    ('emissivity_skin', float), ('emissivity_nozzle', float), ('emissivity_flame', float),
+    ('tw_base', float), ('tp_normal', float), ('tp_afterburner', float),
+    ('band', str), ('weather', str), ('bg_temp', float), ('detector_aperture', float),
+    ('snr_threshold', float), ('f_number', float), ('optical_trans', float), ('netd', float),
+    ('system_bandwidth', float), ('detector_resp', float), ('d_star', float),
+    ('pixel_size', float), ('integration_time', float),
+)
+FIELD_NAMES = tuple(name for name, _ in FIELDS)
+
+# 默认参数，与界面中的默认值一致
+DEFAULTS = {
+    'gama': 1.4, 'r': 0.82, 's1': 8.3, 's2': 26.61, 's3': 96.37,
+    'Rp': 1.0, 'lwy': 5.0, 'l1': 3.0, 'l2': 5.0, 'H': 12000.0, 'Ma': 2.0,
+    'jl': 0, 'fdj': 1, 'fwjiaodu': 75.0, 'fyjiaodu': 75.0,
+    'emissivity_skin': 0.7, 'emissivity_nozzle': 0.8, 'emissivity_flame': 0.2,
+    'tw_base': 750.0, 'tp_normal': 600.0, 'tp_afterburner': 1000.0,
+    'band': "中波 (3-5μm)", 'weather': "晴天", 'bg_temp': 300.0, 'detector_aperture': 0.1,
+    'snr_threshold': 5.0, 'f_number': 4.0, 'optical_trans': 0.85, 'netd': 0.02,
+    'system_bandwidth': 100.0, 'detector_resp': 1.0, 'd_star': 1e10,
+    'pixel_size': 15.0, 'integration_time': 10.0,
+}
+
+# 预计算的派生量
+DERIVED = ('s4', 'T0', 'Tm', 'Tp', 'Tw', 'L', 'Lp', 'Lw', 'k', 'C')
+
+# 必须为正数的参数
+POSITIVE = (
+    'gama', 'r', 's1', 's2', 's3', 'Rp', 'lwy', 'l1', 'l2', 'Ma',
+    'tw_base', 'tp_normal', 'tp_afterburner', 'bg_temp', 'detector_aperture',
+    'snr_threshold', 'f_number', 'netd', 'system_bandwidth', 'd_star', 'pixel_size',
+)
+
+# 取值在 (0, 1] 的参数
+FRACTIONS = ('emissivity_skin', 'emissivity_nozzle', 'emissivity_flame', 'optical_trans')
+
+
+def validate_values(values):
+    """检查参数取值范围，values 为参数名到数值的映射，数值可为数组（逐元素检查）"""
+    def column(name):
+        return np.asarray(values[name])
+
+    # NaN 与 ±inf 会在后续计算中扩散为 NaN，数值参数一律要求有限
+    for name, kind in FIELDS:
+        if kind is not str and not np.all(np.isfinite(column(name))):
+            raise ValueError(f"参数 {name} 必须为有限数值")
+    for name in POSITIVE:
+        if not np.all(column(name) > 0):
+            raise ValueError(f"参数 {name} 必须为正数")
+    for name in FRACTIONS:
+        v = column(name)
+        if not np.all((v > 0) & (v <= 1)):
+            raise ValueError(f"参数 {name} 必须在 (0, 1] 范围内")
+    if not np.all(column('l1') < column('l2')):
+        raise ValueError("波长范围起始值必须小于结束值")
+    if not np.all(column('H') >= 0):
+        raise ValueError("高度 H 不能为负")
+    if not (np.all(np.isin(column('jl'), (0, 1))) and np.all(np.isin(column('fdj'), (1, 2)))):
+        raise ValueError("发动机状态参数 jl/fdj 无效")
+    unknown = set(np.atleast_1d(column('weather')).tolist()) - set(IR_engine.WEATHER_FACTORS)
+    if unknown:
+        raise ValueError(f"未知气象条件: {', '.join(sorted(unknown))}")
+
+
+class ScenarioParams(Mapping):
+    """一次计算所用的全部参数
+
+    构造时完成类型转换和校验，并预计算 s4、T0、Tm、Tp、Tw、
+    辐亮度 L、Lp、Lw、大气衰减系数 k 和探测器常数 C。对象不可修改，可按字典方式读取，
+    IR_engine 中的函数会直接使用其中的派生量。
+    """
+    __slots__ = FIELD_NAMES + DERIVED
+
+    def __init__(self, **values):
+        missing = [name for name in FIELD_NAMES if name not in values]
+        if missing:
+            raise ValueError(f"缺少参数: {', '.join(missing)}")
+        unknown = [name for name in values if name not in FIELD_NAMES]
+        if unknown:
+            raise ValueError(f"未知参数: {', '.join(unknown)}")
+
+        for name, kind in FIELDS:
+            try:
+                object.__setattr__(self, name, kind(values[name]))
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError(f"参数 {name} 的值无效: {values[name]!r}")
+        self.validate()
+
+        s = object.__setattr__
+        s(self, 's4', np.pi * self.Rp**2)
+        s(self, 'T0', float(IR_engine.ambient_temperature(self.H)))
+        Tm, Tp, Tw = IR_engine.source_temperatures(self.as_dict())
+        s(self, 'Tm', float(Tm))
+        s(self, 'Tp', float(Tp))
+        s(self, 'Tw', float(Tw))
+        L, Lp, Lw = IR_engine.radiance_terms(self)
+        s(self, 'L', float(L))
+        s(self, 'Lp', float(Lp))
+        s(self, 'Lw', float(Lw))
+        s(self, 'k', float(IR_engine.extinction_coefficient(self)))
+        s(self, 'C', float(IR_engine.detector_constant(self)))
+
+    @classmethod
+    def from_dict(cls, params):
+        """由参数字典构造（已是 ScenarioParams 时原样返回）"""
+        if isinstance(params, cls):
+            return params
+        return cls(**params)
+
+    def validate(self):
+        """检查参数取值范围"""
+        validate_values(self)
+
+    def replace(self, **changes):
+        """返回修改部分参数后的新快照"""
+        values = self.as_dict()
+        values.update(changes)
+        return ScenarioParams(**values)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in FIELD_NAMES}
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ScenarioParams 不可修改，请使用 replace()")
+
+    def __getitem__(self, name):
+        if name not in FIELD_NAMES:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __iter__(self):
+        return iter(FIELD_NAMES)
+
+    def __len__(self):
+        return len(FIELD_NAMES)
+
+    def __repr__(self):
+        return f"ScenarioParams({self.as_dict()!r})"
+
+    def __reduce__(self):
+        return (_restore, (self.as_dict(),))
+
+
+def _restore(values):
+    return ScenarioParams(**values)
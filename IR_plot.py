@@ -0,0 +1,185 @@
+"""持久的极坐标绘图层：坐标轴和图元只创建一次，更新时只重绘变化的部分"""
+import numpy as np
+
+from IR_engine import close_curve, angular_mean
+from IR_trace import span
+
+# 半径上限取 1、2、2.5、5 × 10^n 中不小于数据最大值的最小者，
+# 参数小幅变化时坐标范围不变，可以只重绘曲线
+_NICE_STEPS = np.array([1.0, 2.0, 2.5, 5.0, 10.0])
+
+
+def nice_limit(value, headroom=1.05):
+    """不小于 value * headroom 的整齐数值"""
+    value = float(value) * headroom
+    if not np.isfinite(value) or value <= 0:
+        return 1.0
+    scale = 10.0 ** np.floor(np.log10(value))
+    return float(_NICE_STEPS[np.searchsorted(_NICE_STEPS, value / scale * (1 - 1e-12))] * scale)
+
+
+class BlitPlot:
+    """极坐标图的持久绘图层
+
+    需要更新的图元设为 animated，不参与常规绘制。完整绘制后缓存背景
+    （坐标轴、网格、刻度、图例），之后的数据更新只需恢复背景、重绘这些图元
+    并 blit。只有半径范围变化或窗口大小改变时才完整重绘。
+    layout_rect 为 tight_layout 的范围，None 表示不调整布局。
+
+    overlays 中的图元（如鼠标光标）画在最上层，画之前再缓存一次含数据的画面，
+    移动光标时只需恢复该画面并重画光标。
+    """
+
+    layout_rect = (0, 0, 1, 0.95)
+
+    def __init__(self, fig, canvas):
+        self.fig = fig
+        self.canvas = canvas
+        self.ax = fig.add_subplot(111, projection='polar')
+        self.ax.set_rlabel_position(22.5)
+        self.ax.grid(True)
+        self.artists = []
+        self.overlays = []
+        self.background = None
+        self.frame = None
+        self.rmax = None
+        self.needs_layout = True
+        canvas.mpl_connect('draw_event', self._on_draw)
+        canvas.mpl_connect('resize_event', self._on_resize)
+
+    def add_artist(self, artist, overlay=False):
+        """登记需要逐次更新的图元"""
+        artist.set_animated(True)
+        (self.overlays if overlay else self.artists).append(artist)
+        return artist
+
+    def _on_draw(self, event):
+        # 完整绘制结束后缓存背景，再画上动态图元
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_artists()
+
+    def _on_resize(self, event):
+        self.background = None
+        self.needs_layout = True
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+        if self.overlays:
+            self.frame = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._draw_overlays()
+
+    def _draw_overlays(self):
+        for artist in self.overlays:
+            self.fig.draw_artist(artist)
+
+    def set_rmax(self, value):
+        """按整齐数值设置半径上限，返回上限是否改变"""
+        rmax = nice_limit(value)
+        if rmax == self.rmax:
+            return False
+        self.rmax = rmax
+        self.ax.set_rlim(0, rmax)
+        self.background = None
+        return True
+
+    def refresh(self):
+        """有背景缓存时只重绘动态图元，否则完整重绘"""
+        if self.needs_layout and self.layout_rect is not None:
+            with span('render.tight_layout'):
+                self.fig.tight_layout(rect=self.layout_rect)
+            self.needs_layout = False
+            self.background = None
+        if self.background is None:
+            with span('render.canvas_draw'):
+                self.canvas.draw()
+            return
+        with span('render.blit'):
+            self.canvas.restore_region(self.background)
+            self._draw_artists()
+            self.canvas.blit(self.fig.bbox)
+
+    def refresh_overlays(self):
+        """只重画最上层图元；数据画面未缓存时退回 refresh()"""
+        if self.background is None or self.frame is None:
+            self.refresh()
+            return
+        with span('render.blit_overlay'):
+            self.canvas.restore_region(self.frame)
+            self._draw_overlays()
+            self.canvas.blit(self.fig.bbox)
+
+
+class RadiationPlot(BlitPlot):
+    """辐射模式图：总辐射与蒙皮、尾焰、喷口辐射四条曲线"""
+
+    def __init__(self, fig, canvas):
+        super().__init__(fig, canvas)
+        ax = self.ax
+        self.lines = [
+            self.add_artist(ax.plot([], [], 'r-', linewidth=2, label='总辐射')[0]),
+            self.add_artist(ax.plot([], [], 'b--', label='蒙皮辐射')[0]),
+            self.add_artist(ax.plot([], [], 'g:', label='尾焰辐射')[0]),
+            self.add_artist(ax.plot([], [], 'm-.', label='喷口辐射')[0]),
+        ]
+        # 将图例放在图的右侧
+        ax.legend(loc='upper right', bbox_to_anchor=(1.15, 1.15))
+
+    def update(self, beta, total, skin, plume, nozzle):
+        """更新四条曲线（首尾闭合）"""
+        beta, *values = close_curve(beta, total, skin, plume, nozzle)
+        for line, value in zip(self.lines, values):
+            line.set_data(beta, value)
+        self.set_rmax(np.max(values[0]))
+        self.refresh()
+
+
+class RangePlot(BlitPlot):
+    """作用距离包线图：包线、最大值标记、标注和统计信息"""
+
+    layout_rect = None
+
+    def __init__(self, fig, canvas, title, style):
+        super().__init__(fig, canvas)
+        ax = self.ax
+        ax.set_title(title, fontsize=12, pad=15)
+        self.line = self.add_artist(ax.plot([], [], style, linewidth=2, label='作用距离包线')[0])
+        self.marker = self.add_artist(ax.plot([], [], 'ro', markersize=8)[0])
+        self.annotation = self.add_artist(ax.annotate(
+            '', xy=(0, 0), xytext=(0, 0),
+            arrowprops=dict(facecolor='red', shrink=0.05), color='black'))
+        ax.legend(loc='upper right')
+        # 添加表格信息
+        self.table = self.add_artist(ax.text(
+            0.5, -0.3, "", transform=ax.transAxes, fontsize=10, ha='center', va='top',
+            bbox=dict(boxstyle='round', facecolor='#2D2D30', alpha=0.7, edgecolor='none')))
+        # 鼠标悬停位置的光标标记
+        self.cursor = self.add_artist(ax.plot([], [], 'o', color='#FFD700', markersize=7,
+                                              markeredgecolor='black')[0], overlay=True)
+
+    def update(self, beta, range_values):
+        """更新包线与最大作用距离标注"""
+        self.line.set_data(*close_curve(beta, range_values))
+
+        # 标记最大作用距离点
+        i = int(np.argmax(range_values))
+        max_range = range_values[i]
+        self.marker.set_data([beta[i]], [max_range])
+        self.annotation.xy = (beta[i], max_range)
+        self.annotation.set_position((beta[i] + 0.3, max_range * 1.1))
+        self.annotation.set_text(f'最大: {max_range:.1f}km')
+        self.table.set_text(
+            f"最大作用距离: {max_range:.1f} km @ {np.degrees(beta[i]):.1f}°\n"
+            f"平均作用距离: {angular_mean(beta, range_values):.1f} km\n"
+            f"最小作用距离: {np.min(range_values):.1f} km"
+        )
+        self.set_rmax(max_range * 1.1)
+        self.refresh()
+
+    def set_cursor(self, beta, r=None):
+        """将光标标记移到 (beta, r)，beta 为 None 时隐藏"""
+        if beta is None:
+            self.cursor.set_data([], [])
+        else:
+            self.cursor.set_data([beta], [r])
+        self.refresh_overlays()
@@ -0,0 +1,97 @@
+"""作用距离与辐射强度对各参数的灵敏度（弹性系数）分析"""
+import numpy as np
+
+from IR_cache import RANGE_KEYS
+from IR_engine import band_radiance, angle_grid
+from IR_params import FIELDS
+from IR_sweep import sweep_table, SweepResult, DIRECTION_AREA
+
+# 参与分析的连续参数：影响辐射强度或作用距离的浮点参数，以及投影面积 s2、s3
+# （整型开关、字符串参数和方位角等只用于显示的参数除外）
+SENSITIVITY_FIELDS = tuple(name for name, kind in FIELDS
+                           if kind is float and (name in RANGE_KEYS or name in DIRECTION_AREA.values()))
+
+
+def elasticities(base_params, names=None, beta=None, direction='horizontal',
+                 step=1e-4, fields=('total', 'range'), radiance=band_radiance):
+    """各参数的弹性系数 (∂Y/∂x)·(x/Y)
+
+    所有扰动叠加为一个场景表：第 0 行为基准，之后每个参数各占
+    +h、-h 两行，一次 sweep_table 完成全部计算，按中心差分求导。
+    参数为 0 时按绝对步长扰动，此时弹性系数为 0。
+    names 默认为 SENSITIVITY_FIELDS 中除另一方向投影面积外的参数。
+
+    返回维度为 ('parameter', 'beta') 的 SweepResult。
+    """
+    if beta is None:
+        beta = angle_grid()
+    beta = np.asarray(beta, dtype=float)
+    if names is None:
+        other = set(DIRECTION_AREA.values()) - {DIRECTION_AREA[direction]}
+        names = [name for name in SENSITIVITY_FIELDS if name not in other]
+    names = list(names)
+    m = len(names)
+
+    x0 = np.array([float(base_params[name]) for name in names])
+    dx = step * np.where(x0 != 0, np.abs(x0), 1.0)
+    table = {name: np.full(2 * m + 1, x0[i]) for i, name in enumerate(names)}
+    for i, name in enumerate(names):
+        table[name][1 + 2 * i] += dx[i]
+        table[name][2 + 2 * i] -= dx[i]
+
+    result = sweep_table(base_params, table, beta, direction, radiance)
+    data = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for field in fields:
+            Y = np.asarray(result[field], dtype=float)
+            dY = (Y[1::2] - Y[2::2]) / (2 * dx[:, None])
+            e = dY * x0[:, None] / Y[0]
+            data[field] = np.where(np.isfinite(e), e, 0.0)
+        data['base_range'] = np.broadcast_to(result['range'][0], (m, len(beta)))
+    return SweepResult(['parameter', 'beta'], {'parameter': np.array(names), 'beta': beta}, data)
+
+
+def sector_edges(sectors=8):
+    """角度扇区边界 (rad)，sectors 为扇区数或边界角度 (deg) 序列"""
+    if np.ndim(sectors) == 0:
+        return np.linspace(0.0, 2 * np.pi, int(sectors) + 1)
+    return np.radians(np.asarray(sectors, dtype=float))
+
+
+def tornado(result, field='range', sectors=8, top=None):
+    """按角度扇区排序的龙卷风图表
+
+    在每个扇区内取作用距离最大的角度，按该角度处弹性系数的绝对值
+    从大到小排列参数。返回 [(扇区标签, 峰值角度(deg), [(参数, 弹性系数, 扇区内最小值, 扇区内最大值), ...]), ...]。
+    """
+    beta = result.coords['beta']
+    names = result.coords['parameter']
+    e = result[field]
+    base_range = result['base_range'][0]
+    edges = sector_edges(sectors)
+
+    table = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        inside = np.flatnonzero((beta >= lo) & (beta < hi))
+        if len(inside) == 0:
+            continue
+        peak = inside[np.argmax(base_range[inside])]
+        sector = e[:, inside]
+        order = np.argsort(-np.abs(e[:, peak]), kind='stable')
+        if top is not None:
+            order = order[:top]
+        rows = [(str(names[i]), float(e[i, peak]), float(sector[i].min()), float(sector[i].max()))
+                for i in order]
+        label = f"{np.degrees(lo):g}°~{np.degrees(hi):g}°"
+        table.append((label, float(np.degrees(beta[peak])), rows))
+    return table
+
+
+def format_tornado(table):
+    """龙卷风图表的文本形式"""
+    lines = []
+    for label, peak, rows in table:
+        lines.append(f"扇区 {label}（峰值角度 {peak:.1f}°）")
+        for name, value, low, high in rows:
+            lines.append(f"  {name:<20s} {value:+.4f}  [{low:+.4f}, {high:+.4f}]")
+    return "\n".join(lines)
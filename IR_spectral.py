@@ -0,0 +1,116 @@
+"""光谱分辨模式：按波长分段计算辐射强度与逐段大气透过率"""
+from functools import lru_cache
+
+import numpy as np
+
+from IR_engine import (source_temperatures, band_radiance, angular_intensity,
+                       extinction_coefficient, detector_constant, angle_grid)
+
+# 相对消光系数谱形 (μm, 相对值)：3μm 附近 H2O 吸收、4.2~4.45μm CO2 吸收、
+# 6.3μm H2O 吸收带、9.6μm O3 吸收以及 12μm 以上的 H2O 连续吸收。
+# 在每个波段内归一化为平均值 1，即宽带衰减系数 k 按波长的分配方式。
+EXTINCTION_PROFILE = np.array([
+    (1.0, 1.0), (2.7, 3.0), (3.0, 1.6), (3.4, 0.8), (3.8, 0.5), (4.0, 0.6),
+    (4.15, 1.5), (4.2, 4.0), (4.3, 6.0), (4.45, 4.0), (4.55, 1.2), (4.8, 1.3),
+    (5.0, 2.0), (5.5, 4.0), (6.0, 8.0), (7.0, 3.0), (8.0, 1.0), (9.0, 0.8),
+    (9.6, 2.0), (10.0, 0.9), (11.0, 1.0), (12.0, 1.5), (13.0, 2.5), (14.0, 4.0),
+])
+
+
+@lru_cache(maxsize=64)
+def spectral_bins(l1, l2, n_bins=32):
+    """波段 l1~l2 (μm) 的等宽分段，返回 (边界, 中心波长, 相对消光系数)
+
+    结果按波段缓存，数组只读。
+    """
+    edges = np.linspace(l1, l2, n_bins + 1)
+    centers = (edges[:-1] + edges[1:]) / 2
+    profile = np.interp(centers, EXTINCTION_PROFILE[:, 0], EXTINCTION_PROFILE[:, 1])
+    profile = profile / np.mean(profile)
+    for a in (edges, centers, profile):
+        a.flags.writeable = False
+    return edges, centers, profile
+
+
+def bin_radiances(params, edges):
+    """各辐射源在每个波长段内的辐亮度，形状 (3, n_bins)，依次为蒙皮、喷口、尾焰"""
+    Tm, Tp, Tw = source_temperatures(params)
+    M = band_radiance(np.array([Tm, Tp, Tw], dtype=float)[:, None], edges[:-1], edges[1:])
+    emissivity = np.array([params['emissivity_skin'], params['emissivity_nozzle'],
+                           params['emissivity_flame']])[:, None]
+    return emissivity / np.pi * M
+
+
+def spectral_range(C, intensity, k, rtol=1e-12, maxiter=100):
+    """逐段透过率下的作用距离 (km)
+
+    求解 R² = C / 1e6 · Σ_i I_i exp(-k_i R)，intensity 形状为 (n_bins, ...)，
+    k 形状为 (n_bins,)。左端 f(R) 单调递增，在 [0, R0] 区间内用
+    带区间保护的 Newton 迭代求解。返回 (R, converged)。
+    """
+    intensity = np.asarray(intensity, dtype=float)
+    k = np.asarray(k, dtype=float).reshape((-1,) + (1,) * (intensity.ndim - 1))
+    a = C / 1e6
+    R0 = np.sqrt(a * np.sum(intensity, axis=0))
+
+    lo = np.zeros_like(R0)
+    hi = R0.copy()
+    R = R0.copy()
+    converged = R0 == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(maxiter):
+            e = intensity * np.exp(-k * R)
+            f = R**2 - a * np.sum(e, axis=0)
+            df = 2 * R + a * np.sum(k * e, axis=0)
+            lo = np.where(f < 0, R, lo)
+            hi = np.where(f > 0, R, hi)
+            R_new = R - f / df
+            # 超出当前区间时改用二分
+            R_new = np.where((R_new > lo) & (R_new < hi), R_new, (lo + hi) / 2)
+            step = np.abs(R_new - R)
+            R = R_new
+            converged = converged | (step <= rtol * np.maximum(R, np.finfo(float).tiny))
+            if np.all(converged):
+                break
+    return R[()], (converged & np.isfinite(R))[()]
+
+
+def spectral_calculations(params, s_value, beta=None, n_bins=32, extinction=None):
+    """光谱分辨的辐射强度与作用距离
+
+    在 (波长段 × 角度) 数组上一次计算辐射强度，按段施加大气透过率后
+    求解作用距离。extinction 为可选的 f(params, 中心波长) -> 各段衰减系数 (km⁻¹)，
+    默认由宽带衰减系数按 EXTINCTION_PROFILE 分配。
+
+    返回字典: beta、wavelength（各段中心波长）、intensity（各段强度，n_bins × 角度）、
+    total（总强度）、range、converged，以及对比用的宽带结果 range_broadband。
+    """
+    if beta is None:
+        beta = angle_grid()
+    beta = np.asarray(beta, dtype=float)
+    edges, centers, profile = spectral_bins(float(params['l1']), float(params['l2']), n_bins)
+
+    # 各投影面积只与角度有关，分段辐亮度只与波长有关
+    area_skin, area_plume, area_nozzle = angular_intensity(beta, params, s_value, 1.0, 1.0, 1.0)
+    L = bin_radiances(params, edges)
+    intensity = L[0][:, None] * area_skin + L[2][:, None] * area_plume + L[1][:, None] * area_nozzle
+
+    if extinction is None:
+        k = extinction_coefficient(params) * profile
+    else:
+        k = np.asarray(extinction(params, centers), dtype=float)
+
+    C = detector_constant(params)
+    R, converged = spectral_range(C, intensity, k)
+    R_broadband, _ = spectral_range(C, intensity.sum(axis=0, keepdims=True),
+                                    [extinction_coefficient(params)])
+
+    return {
+        'beta': beta,
+        'wavelength': centers,
+        'intensity': intensity,
+        'total': intensity.sum(axis=0),
+        'range': R,
+        'converged': converged,
+        'range_broadband': R_broadband,
+    }
@@ -0,0 +1,66 @@
+"""全空间（方位角 × 俯仰角）辐射强度与作用距离分布"""
+import numpy as np
+
+from IR_engine import (radiance_terms, plume_nozzle_intensity, detection_range,
+                       band_radiance, angle_grid)
+from IR_sweep import SweepResult
+
+
+def elevation_grid(resolution=1.0):
+    """[-π/2, π/2] 上间隔为 resolution 度的俯仰角网格（含两极）"""
+    n = int(round(180.0 / resolution)) + 1
+    return np.linspace(-np.pi / 2, np.pi / 2, n)
+
+
+def direction_intensity(az, el, params, L, Lp, Lw):
+    """方向 (az, el) 上的蒙皮、尾焰、喷口辐射强度
+
+    机体坐标系 x 指向机头、y 指向翼展方向、z 向上。蒙皮投影面积按方向余弦
+    混合正视面积 s1、侧视面积 s2 与俯视面积 s3；尾焰和喷口辐射绕机体轴
+    对称，按观察方向与机头方向的夹角计算。el = 0 时与水平方向结果一致，
+    az = 0 时与垂直方向结果一致。
+    """
+    cos_el = np.cos(el)
+    ux = cos_el * np.cos(az)
+    uy = cos_el * np.sin(az)
+    uz = np.sin(el) * np.ones_like(ux)
+
+    s = params['s1'] * np.abs(ux) + params['s2'] * np.abs(uy) + params['s3'] * np.abs(uz)
+    Im = s * L
+
+    # 与机头方向的夹角 θ ∈ [0, π]
+    theta = np.arccos(np.clip(ux, -1.0, 1.0))
+    Iw, Ip = plume_nozzle_intensity(theta, params, Lp, Lw)
+    return Im, Iw, Ip
+
+
+def spherical_map(params, resolution=1.0, azimuth=None, elevation=None,
+                  chunk_size=65536, radiance=band_radiance):
+    """计算全空间辐射强度与作用距离
+
+    默认网格为间隔 resolution 度的方位角 [0, 2π) × 俯仰角 [-π/2, π/2]。
+    按俯仰角分块计算，每块不超过 chunk_size 个方向，内存占用与网格大小无关。
+    返回维度为 ('elevation', 'azimuth') 的 SweepResult。
+    """
+    az = angle_grid(resolution) if azimuth is None else np.asarray(azimuth, dtype=float)
+    el = elevation_grid(resolution) if elevation is None else np.asarray(elevation, dtype=float)
+    L, Lp, Lw = radiance_terms(params, radiance)
+
+    shape = (len(el), len(az))
+    out = {name: np.empty(shape) for name in ('total', 'skin', 'plume', 'nozzle', 'range')}
+    out['converged'] = np.empty(shape, dtype=bool)
+
+    rows = max(1, chunk_size // len(az))
+    for start in range(0, len(el), rows):
+        stop = min(len(el), start + rows)
+        Im, Iw, Ip = direction_intensity(az[None, :], el[start:stop, None], params, L, Lp, Lw)
+        total = Im + Iw + Ip
+        R, converged = detection_range(params, total)
+        out['skin'][start:stop] = Im
+        out['plume'][start:stop] = Iw
+        out['nozzle'][start:stop] = Ip
+        out['total'][start:stop] = total
+        out['range'][start:stop] = R
+        out['converged'][start:stop] = converged
+
+    return SweepResult(['elevation', 'azimuth'], {'elevation': el, 'azimuth': az}, out)
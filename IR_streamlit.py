@@ -1,8 +1,14 @@
+import uuid
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 from matplotlib import rcParams
-from scipy.integrate import quad
+from IR_engine import calc_range_at_angle, angle_index, ANGLE_SAMPLING
+from IR_cache import ResultCache
+from IR_atmosphere import default_atmosphere
+from IR_trace import TRACER, span
+from IR_params import ScenarioParams
+import IR_chart
+from IR_figures import FigureRenderer, draw_radiation, draw_range
 # 设置中文字体
 rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'WenQuanYi Zen Hei']
 
@@ -92,214 +98,49 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def radiation_calculations(params, s_value, angle_mode='horizontal'):
-    """执行辐射计算"""
-    # 物理常数
-    c1 = 3.7415e-16
-    c2 = 1.438e-2
-    s4 = np.pi * params['Rp']**2
-    
-    # 1. 蒙皮辐射计算
-    if params['H'] <= 11000:
-        T0 = 288.2 - 0.0065 * params['H']
-    elif params['H'] <= 20000:
-        T0 = 216.7
-    elif params['H'] <= 32000:
-        T0 = 216.7 + 0.001 * (params['H'] - 20000)
-    else:
-        T0 = 216.7
-    
-    Tm = T0 * (1 + params['r'] * (params['gama'] - 1) / 2 * params['Ma']**2)
-    
-    def M(x):
-        return c1 / x**5 / (np.exp(c2 / (x * Tm)) - 1)
-    
-    L = params['emissivity_skin'] / np.pi * quad(M, params['l1']/1e6, params['l2']/1e6)[0]
-    
-    # 2. 发动机喷口辐射
-    Tp = params['tp_afterburner'] if params['jl'] == 1 else params['tp_normal']
-    
-    def Mp(x):
-        return c1 / x**5 / (np.exp(c2 / (x * Tp)) - 1)
-    
-    Lp = params['emissivity_nozzle'] / np.pi * quad(Mp, params['l1']/1e6, params['l2']/1e6)[0]
-    
-    # 3. 尾焰辐射
-    Tw = params['tw_base']
-    if params['fdj'] == 1:
-        Tw = 0.85 * Tw
-    else:
-        Tw = 0.9 * Tw
-    
-    def Mw(x):
-        return c1 / x**5 / (np.exp(c2 / (x * Tw)) - 1)
-    
-    Lw = params['emissivity_flame'] / np.pi * quad(Mw, params['l1']/1e6, params['l2']/1e6)[0]
-    
-    # 准备角度数据
-    myBeta = np.linspace(0, 2*np.pi, 360)
-    results = np.zeros_like(myBeta)
-    Im_arr = np.zeros_like(myBeta)
-    Ip_arr = np.zeros_like(myBeta)
-    Iw_arr = np.zeros_like(myBeta)
-    
-    # 角度分区计算
-    for i, beta in enumerate(myBeta):
-        if 0 <= beta < np.arctan(1/5):
-            z = 0
-        elif beta < np.pi/2:
-            z = 1
-        elif beta < (np.pi - np.arctan(0.2)):
-            z = 2
-        elif beta < (np.pi + np.arctan(0.2)):
-            z = 3
-        elif beta < 3*np.pi/2:
-            z = 4
-        elif beta < (2*np.pi - np.arctan(0.2)):
-            z = 5
-        else:
-            z = 6
-            
-        s = params['s1'] * np.abs(np.cos(beta)) + s_value * np.abs(np.sin(beta))
-        Im = s * L
-        Im_arr[i] = Im
-        
-        # 根据不同区域计算辐射
-        if z == 0:
-            Sw = 0
-            Ip = 0
-        elif z == 1:
-            Sw = (params['lwy'] * np.sin(beta) - np.cos(beta))**2 / (params['lwy'] * np.sin(beta))
-            Ip = 0
-        elif z == 2:
-            Sw = (params['lwy'] * np.sin(beta) - np.abs(np.cos(beta)))**2 / (params['lwy'] * np.sin(beta)) + s4 * np.abs(np.cos(beta))
-            Sp = np.pi * np.abs(np.cos(beta))**2
-            Ip = Lp * Sp
-        elif z == 3:
-            Sw = s4 * np.abs(np.cos(beta))
-            Sp = np.pi * np.abs(np.cos(beta))**2
-            Ip = Lp * Sp
-        elif z == 4:
-            Sw = (params['lwy'] * np.abs(np.sin(beta)) - np.abs(np.cos(beta)))**2 / (params['lwy'] * np.abs(np.sin(beta))) + s4 * np.abs(np.cos(beta))
-            Sp = np.pi * np.abs(np.cos(beta))**2
-            Ip = Lp * Sp
-        elif z == 5:
-            Sw = (params['lwy'] * np.abs(np.sin(beta)) - np.abs(np.cos(beta)))**2 / (params['lwy'] * np.abs(np.sin(beta)))
-            Ip = 0
-        else:  # z == 6
-            Sw = 0
-            Ip = 0
-            
-        Iw = Lw * Sw
-        Iw_arr[i] = Iw
-        Ip_arr[i] = Ip
-        
-        # 总辐射强度
-        if z in [2, 3, 4]:
-            I = Im + Iw + Ip
-        else:
-            I = Im + Iw
-            
-        results[i] = I
-        
-    return myBeta, results, np.max(results), Im_arr, Iw_arr, Ip_arr
+@st.cache_resource
+def get_result_cache():
+    """所有会话共享的计算结果缓存，设置 IR_ATMOSPHERE_DIR 时作用距离使用透过率表"""
+    return ResultCache(maxsize=256, atmosphere=default_atmosphere())
 
-def calc_range_at_angle(params, intensity, angle, angle_type):
-    """计算特定角度下的作用距离"""
-    # 获取高度（转换为km）
-    H_km = params['H'] / 1000.0
-    
-    # 确定波段（中波或长波）
-    if "中波" in params['band']:
-        # 中波红外大气透过率模型
-        # 基础衰减系数 (km⁻¹)
-        k_base = 0.2
-        
-        # 高度修正因子 (高度增加，透过率增加)
-        h_factor = np.exp(-H_km / 10.0)  # 10km为特征高度
-        
-        # 气象条件修正因子
-        weather_factors = {
-            "晴天": 1.0,
-            "多云": 0.8,
-            "阴天": 0.6,
-            "雨天": 0.2  # 雨天对长波影响更大
-        }
-        w_factor = weather_factors.get(params['weather'], 1.0)
-        
-        # 综合衰减系数
-        k = k_base * h_factor * w_factor
-    else:
-        # 长波红外大气透过率模型
-        # 基础衰减系数 (km⁻¹)
-        k_base = 0.15
-        
-        # 高度修正因子
-        h_factor = np.exp(-H_km / 8.0)  # 8km为特征高度
-        
-        # 气象条件修正因子
-        weather_factors = {
-            "晴天": 1.0,
-            "多云": 0.8,
-            "阴天": 0.6,
-            "雨天": 0.2  # 雨天对长波影响更大
-        }
-        w_factor = weather_factors.get(params['weather'], 1.0)
-        
-        # 综合衰减系数
-        k = k_base * h_factor * w_factor
-    
-    # 探测器参数
-    D = params['detector_aperture']  # 探测器孔径(m)
-    SNR_min = params['snr_threshold']  # 最小信噪比
-    
-    # 光学系统参数
-    f_number = params['f_number']  # F数
-    τ0 = params['optical_trans']  # 光学透过率
-    
-    # 探测器性能参数
-    NETD = params['netd']  # 噪声等效温差(K)
-    Δf = params['system_bandwidth']  # 系统带宽(Hz)
-    # D_ratio = params['detector_resp']  # 探测器响应率(A/W)
-    D_star = params['d_star']  # 比探测率(cm√Hz/W)
-    pixel_size = params['pixel_size'] * 1e-6  # 敏感元尺寸(m)
-    # t_int = params['integration_time'] / 1000.0  # 积分时间(s)
-    
-    # 计算探测器敏感元面积
-    A_d = (pixel_size)**2  # m²
-    
-    # 计算接收面积
-    A0 = np.pi * (D/2)**2  # 接收面积(m²)
-    
-    # 计算dW/dT (温度对辐射的变化率)
-    # 使用简化模型：dW/dT ≈ 4σT^3，其中σ是Stefan-Boltzmann常数
-    σ = 5.67e-8  # W/m²K⁴⁴⁴⁴⁴⁴⁴⁴
-    T_bg = params['bg_temp']  # 背景温度(K) - 假设为300K
-    dWdT = 4 * σ * T_bg**3  # W/m²K
-    
-    try:
-        range_netd = np.sqrt(
-            (intensity * τ0 * A0 * D_star * np.sqrt(A_d * Δf * 1e4)) /  # 注意单位转换
-            (NETD * np.sqrt(4*f_number**2 + 1) * dWdT * SNR_min)
-        ) / 1000.0  # 转换为km
-        
-        R_prev = range_netd
-        for _ in range(5):  # 进行5次迭代
-            τ_atm = np.exp(-k * R_prev)
-            R = np.sqrt(
-                (intensity * τ0 * τ_atm * A0 * D_star * np.sqrt(A_d * Δf * 1e4)) / 
-                (NETD * np.sqrt(4*f_number**2 + 1) * dWdT * SNR_min)
-            ) / 1000.0
-            R_prev = R  # 更新迭代值
-            
-    except Exception as e:
-        st.error(f"作用距离计算错误: {e}")
-        # 使用简单的经验公式作为后备
-        R = np.sqrt(intensity * τ0 * A0 * 1e6) / 1000.0  # km
-    
-    return R
+@st.cache_resource
+def get_figure_renderer():
+    """所有会话共享的静态图渲染缓存"""
+    return FigureRenderer(maxsize=64)
+
+def show_trace_panel(panel, mark):
+    """在侧边栏显示本次运行各阶段耗时，并提供本会话计时记录下载"""
+    if not st.session_state.trace_enabled:
+        return
+    with panel:
+        st.subheader("性能计时")
+        # 只统计本会话的阶段，其他会话同时记录的阶段不计入
+        stages = TRACER.since(mark, st.session_state.trace_session)
+        if stages:
+            st.table({
+                '阶段': list(stages),
+                '耗时 (ms)': [f"{duration * 1e3:.2f}" for duration in stages.values()],
+            })
+        else:
+            st.caption("本次运行没有新的计算")
+        st.download_button("导出计时记录", TRACER.to_json(st.session_state.trace_session), file_name="IR_trace.json",
+                           mime="application/json")
 
 def main():
+    # 性能计时开关，各阶段耗时显示在侧边栏
+    # 计时开关保存在会话状态中，只作用于本会话的脚本线程
+    trace_enabled = st.sidebar.checkbox("性能计时", value=TRACER.enabled, key='trace_enabled')
+    TRACER.enable_thread(trace_enabled)
+    # 脚本线程会被其他会话复用，计时记录按会话标记区分
+    TRACER.set_session(st.session_state.setdefault('trace_session', uuid.uuid4().hex))
+    trace_mark = TRACER.mark()
+    trace_panel = st.sidebar.container()
+    # 交互式图表在浏览器端绘制，未安装 plotly 时使用 Matplotlib 图片
+    interactive = st.sidebar.checkbox("交互式图表", value=IR_chart.available(),
+                                      disabled=not IR_chart.available(),
+                                      help="曲线降采样后由浏览器端绘制，支持缩放和悬停查看（需要 plotly）")
+    interactive = interactive and IR_chart.available()
+    
     # 应用标题
     st.title("目标红外辐射特性分析及作用距离评估系统")
     st.markdown("---")
@@ -334,6 +175,7 @@ def main():
                 engine_mode = st.selectbox("发动机类型:", ["常规模式", "加力模式"])
                 fw = st.number_input("方位角 (deg):", min_value=0, max_value=360, value=75, step=1)
                 fy = st.number_input("俯仰角 (deg):", min_value=0, max_value=90, value=75, step=1)
+                sampling = ANGLE_SAMPLING[st.selectbox("角度采样:", list(ANGLE_SAMPLING))]
             
             with col2:
                 st.subheader("辐射特性参数")
@@ -396,6 +238,15 @@ def main():
             'pixel_size': pixel_size,
             'integration_time': integration_time
         }
+        try:
+            with span('streamlit.params'):
+                params = ScenarioParams(**params)
+        except ValueError as e:
+            st.error(f"参数设置有误: {e}")
+            return
+        
+        result_cache = get_result_cache()
+        renderer = get_figure_renderer()
         
         # 添加操作按钮
         col_btn1, col_btn2, col_btn3, col_btn4 = st.columns(4)
@@ -415,26 +266,22 @@ def main():
             st.subheader("水平方向辐射模式")
             if btn_calculate_all or btn_calc_horizontal:
                 with st.spinner("计算水平方向辐射中..."):
-                    beta_h, results_h, max_I_h, Im_arr_h, Iw_arr_h, Ip_arr_h = radiation_calculations(params, s2, 'horizontal')
+                    beta_h, results_h, max_I_h, Im_arr_h, Iw_arr_h, Ip_arr_h = result_cache.radiation(params, s2, 'horizontal', sampling)
                     
                     # 绘制水平方向辐射模式
-                    fig1 = plt.figure(figsize=(8, 6))
-                    ax1 = fig1.add_subplot(111, projection='polar')
-                    ax1.plot(beta_h, results_h, 'r-', linewidth=2, label='总辐射')
-                    ax1.plot(beta_h, Im_arr_h, 'b--', label='蒙皮辐射')
-                    ax1.plot(beta_h, Iw_arr_h, 'g:', label='尾焰辐射')
-                    ax1.plot(beta_h, Ip_arr_h, 'm-.', label='喷口辐射')
-                    ax1.set_rlabel_position(22.5)
-                    ax1.grid(True)
-                    ax1.legend(loc='upper right', bbox_to_anchor=(1.15, 1.15))
-                    st.pyplot(fig1)
+                    if interactive:
+                        with span('render.plotly'):
+                            st.plotly_chart(IR_chart.radiation_figure(beta_h, results_h, Im_arr_h, Iw_arr_h, Ip_arr_h),
+                                            width='stretch')
+                    else:
+                        with span('render.matplotlib'):
+                            st.image(renderer.render('horizontal', draw_radiation, beta_h, results_h, Im_arr_h, Iw_arr_h, Ip_arr_h),
+                                     width='stretch')
                     
                     # 显示水平方向计算结果
                     st.subheader("水平方向计算结果")
                     # 找到最接近指定角度的索引
-                    beta = np.linspace(0, 2*np.pi, 360)
-                    idx = int(round(fw * len(beta) / 360))
-                    idx = min(idx, len(beta)-1)
+                    idx = angle_index(beta_h, fw)
                     
                     I_total = results_h[idx]
                     I_skin = Im_arr_h[idx]
@@ -442,7 +289,7 @@ def main():
                     I_nozzle = Ip_arr_h[idx]
                     
                     # 计算作用距离
-                    R_range = calc_range_at_angle(params, I_total, fw, 'horizontal')
+                    R_range = calc_range_at_angle(params, I_total, fw, 'horizontal', atmosphere=result_cache.atmosphere)
                     
                     # 使用卡片样式展示结果
                     st.markdown(f"""
@@ -468,26 +315,22 @@ def main():
             st.subheader("垂直方向辐射模式")
             if btn_calculate_all or btn_calc_vertical:
                 with st.spinner("计算垂直方向辐射中..."):
-                    beta_v, results_v, max_I_v, Im_arr_v, Iw_arr_v, Ip_arr_v = radiation_calculations(params, s3, 'vertical')
+                    beta_v, results_v, max_I_v, Im_arr_v, Iw_arr_v, Ip_arr_v = result_cache.radiation(params, s3, 'vertical', sampling)
                     
                     # 绘制垂直方向辐射模式
-                    fig2 = plt.figure(figsize=(8, 6))
-                    ax2 = fig2.add_subplot(111, projection='polar')
-                    ax2.plot(beta_v, results_v, 'r-', linewidth=2, label='总辐射')
-                    ax2.plot(beta_v, Im_arr_v, 'b--', label='蒙皮辐射')
-                    ax2.plot(beta_v, Iw_arr_v, 'g:', label='尾焰辐射')
-                    ax2.plot(beta_v, Ip_arr_v, 'm-.', label='喷口辐射')
-                    ax2.set_rlabel_position(22.5)
-                    ax2.grid(True)
-                    ax2.legend(loc='upper right', bbox_to_anchor=(1.15, 1.15))
-                    st.pyplot(fig2)
+                    if interactive:
+                        with span('render.plotly'):
+                            st.plotly_chart(IR_chart.radiation_figure(beta_v, results_v, Im_arr_v, Iw_arr_v, Ip_arr_v),
+                                            width='stretch')
+                    else:
+                        with span('render.matplotlib'):
+                            st.image(renderer.render('vertical', draw_radiation, beta_v, results_v, Im_arr_v, Iw_arr_v, Ip_arr_v),
+                                     width='stretch')
                     
                     # 显示垂直方向计算结果
                     st.subheader("垂直方向计算结果")
                     # 找到最接近指定角度的索引
-                    beta = np.linspace(0, 2*np.pi, 360)
-                    idx = int(round(fy * len(beta) / 360))
-                    idx = min(idx, len(beta)-1)
+                    idx = angle_index(beta_v, fy)
                     
                     I_total = results_v[idx]
                     I_skin = Im_arr_v[idx]
@@ -495,7 +338,7 @@ def main():
                     I_nozzle = Ip_arr_v[idx]
                     
                     # 计算作用距离
-                    R_range = calc_range_at_angle(params, I_total, fy, 'vertical')
+                    R_range = calc_range_at_angle(params, I_total, fy, 'vertical', atmosphere=result_cache.atmosphere)
                     
                     # 使用卡片样式展示结果
                     st.markdown(f"""
@@ -520,126 +363,41 @@ def main():
         # 作用距离包线图
         if btn_calculate_all or btn_calc_range:
             st.subheader("作用距离包线")
-            st.warning("计算作用距离包线需要较长时间，请耐心等待...")
             
             with st.spinner("计算作用距离包线中..."):
                 # 获取辐射数据
-                beta_h, results_h, _, _, _, _ = radiation_calculations(params, s2, 'horizontal')
-                beta_v, results_v, _, _, _, _ = radiation_calculations(params, s3, 'vertical')
+                beta_h, range_h, converged_h, results_h = result_cache.envelope(params, s2, 'horizontal', sampling)
+                beta_v, range_v, converged_v, results_v = result_cache.envelope(params, s3, 'vertical', sampling)
                 
-                # 存储数据
-                range_data = {
-                    'horizontal': {
-                        'beta': beta_h,
-                        'range_values': [],
-                        'intensities': results_h
-                    },
-                    'vertical': {
-                        'beta': beta_v,
-                        'range_values': [],
-                        'intensities': results_v
-                    }
-                }
-                
-                # 计算总步数
-                total_steps = len(results_h) + len(results_v)
-                current_step = 0
-                progress_bar = st.progress(0.0)
-                
-                # 计算各角度对应的作用距离（水平方向）
-                for i, intensity in enumerate(results_h):
-                    range_data['horizontal']['range_values'].append(
-                        calc_range_at_angle(params, intensity, np.degrees(beta_h[i]), 'horizontal')
-                    )
-                    current_step += 1
-                    progress_bar.progress(min(1.0, current_step / total_steps))
-                
-                # 计算各角度对应的作用距离（垂直方向）
-                for i, intensity in enumerate(results_v):
-                    range_data['vertical']['range_values'].append(
-                        calc_range_at_angle(params, intensity, np.degrees(beta_v[i]), 'vertical')
-                    )
-                    current_step += 1
-                    progress_bar.progress(min(1.0, current_step / total_steps))
-                
-                # 绘制水平方向作用距离图
-                fig3 = plt.figure(figsize=(8, 6))
-                ax3 = fig3.add_subplot(111, projection='polar')
-                
-                # 绘制作用距离包线
-                ax3.plot(beta_h, range_data['horizontal']['range_values'], 'c-', linewidth=2, label='作用距离包线')
-                
-                # 标记最大作用距离点
-                range_values_h = range_data['horizontal']['range_values']
-                max_range_idx_h = np.argmax(range_values_h)
-                max_range_h = range_values_h[max_range_idx_h]
-                max_range_angle_h = np.degrees(beta_h[max_range_idx_h])
-                ax3.plot([beta_h[max_range_idx_h]], [max_range_h], 'ro', markersize=8)
-                ax3.annotate(f'最大: {max_range_h:.1f}km', 
-                            xy=(beta_h[max_range_idx_h], max_range_h),
-                            xytext=(beta_h[max_range_idx_h] + 0.3, max_range_h * 1.1),
-                            arrowprops=dict(facecolor='red', shrink=0.05),
-                            color='white')
-                
-                # 设置标题和标签
-                ax3.set_title("水平方向作用距离包线", fontsize=12, pad=15, color='white')
-                ax3.set_rlabel_position(22.5)
-                ax3.grid(True)
-                ax3.legend(loc='upper right')
-                
-                # 添加表格信息
-                table_text_h = (
-                    f"最大作用距离: {max_range_h:.1f} km @ {max_range_angle_h:.1f}°\n"
-                    f"平均作用距离: {np.mean(range_values_h):.1f} km\n"
-                    f"最小作用距离: {np.min(range_values_h):.1f} km"
-                )
-                ax3.text(0.5, -0.3, table_text_h, transform=ax3.transAxes, 
-                        fontsize=10, ha='center', va='top', color='white',
-                        bbox=dict(boxstyle='round', facecolor='#1E1E1E', alpha=0.8, edgecolor='#0078D7'))
-                
-                # 绘制垂直方向作用距离图
-                fig4 = plt.figure(figsize=(8, 6))
-                ax4 = fig4.add_subplot(111, projection='polar')
-                
-                # 绘制作用距离包线
-                ax4.plot(beta_v, range_data['vertical']['range_values'], 'm-', linewidth=2, label='作用距离包线')
-                
-                # 标记最大作用距离点
-                range_values_v = range_data['vertical']['range_values']
-                max_range_idx_v = np.argmax(range_values_v)
-                max_range_v = range_values_v[max_range_idx_v]
-                max_range_angle_v = np.degrees(beta_v[max_range_idx_v])
-                ax4.plot([beta_v[max_range_idx_v]], [max_range_v], 'ro', markersize=8)
-                ax4.annotate(f'最大: {max_range_v:.1f}km', 
-                            xy=(beta_v[max_range_idx_v], max_range_v),
-                            xytext=(beta_v[max_range_idx_v] + 0.3, max_range_v * 1.1),
-                            arrowprops=dict(facecolor='red', shrink=0.05),
-                            color='white')
-                
-                # 设置标题和标签
-                ax4.set_title("垂直方向作用距离包线", fontsize=12, pad=15, color='white')
-                ax4.set_rlabel_position(22.5)
-                ax4.grid(True)
-                ax4.legend(loc='upper right')
-                
-                # 添加表格信息
-                table_text_v = (
-                    f"最大作用距离: {max_range_v:.1f} km @ {max_range_angle_v:.1f}°\n"
-                    f"平均作用距离: {np.mean(range_values_v):.1f} km\n"
-                    f"最小作用距离: {np.min(range_values_v):.1f} km"
-                )
-                ax4.text(0.5, -0.3, table_text_v, transform=ax4.transAxes, 
-                        fontsize=10, ha='center', va='top', color='white',
-                        bbox=dict(boxstyle='round', facecolor='#1E1E1E', alpha=0.8, edgecolor='#0078D7'))
+                if not (np.all(converged_h) and np.all(converged_v)):
+                    st.warning("部分角度的作用距离未收敛，结果仅供参考")
                 
                 # 显示图表
                 col_range1, col_range2 = st.columns(2)
-                with col_range1:
-                    st.pyplot(fig3)
-                with col_range2:
-                    st.pyplot(fig4)
+                if interactive:
+                    with col_range1:
+                        with span('render.plotly'):
+                            st.plotly_chart(IR_chart.range_figure(beta_h, range_h, "水平方向作用距离包线", 'cyan'),
+                                            width='stretch')
+                    with col_range2:
+                        with span('render.plotly'):
+                            st.plotly_chart(IR_chart.range_figure(beta_v, range_v, "垂直方向作用距离包线", 'magenta'),
+                                            width='stretch')
+                else:
+                    with col_range1:
+                        with span('render.matplotlib'):
+                            st.image(renderer.render('range_horizontal', draw_range, beta_h, range_h,
+                                                     "水平方向作用距离包线", 'c-'),
+                                     width='stretch')
+                    with col_range2:
+                        with span('render.matplotlib'):
+                            st.image(renderer.render('range_vertical', draw_range, beta_v, range_v,
+                                                     "垂直方向作用距离包线", 'm-'),
+                                     width='stretch')
                 
                 st.success("作用距离包线计算完成！")
+        
+        show_trace_panel(trace_panel, trace_mark)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""多场景参数扫描：一次调用计算整个参数网格的辐射强度和作用距离"""
+import numpy as np
+
+from IR_engine import radiance_terms, angular_intensity, detection_range, band_radiance, angle_grid
+
+# 各方向使用的投影面积参数
+DIRECTION_AREA = {
+    'horizontal': 's2',
+    'vertical': 's3',
+}
+
+RESULT_FIELDS = ('total', 'skin', 'plume', 'nozzle', 'range', 'converged')
+
+
+class SweepResult:
+    """带维度标签的扫描结果
+
+    dims 为各维名称（最后一维为 'beta'），coords 为各维坐标，
+    结果数组按字段名访问：total、skin、plume、nozzle、range、converged。
+    """
+
+    def __init__(self, dims, coords, data):
+        self.dims = tuple(dims)
+        self.coords = coords
+        self.data = data
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['data'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    @property
+    def shape(self):
+        return self.data['total'].shape
+
+    def sel(self, **indexers):
+        """按坐标值选取子集（数值坐标取最接近的值）"""
+        index = []
+        for dim in self.dims:
+            if dim in indexers:
+                coord = np.asarray(self.coords[dim])
+                if coord.dtype.kind in 'fiu':
+                    index.append(int(np.argmin(np.abs(coord - indexers[dim]))))
+                else:
+                    index.append(int(np.flatnonzero(coord == indexers[dim])[0]))
+            else:
+                index.append(slice(None))
+        index = tuple(index)
+        dims = [d for d in self.dims if d not in indexers]
+        coords = {d: self.coords[d] for d in dims}
+        return SweepResult(dims, coords, {k: v[index] for k, v in self.data.items()})
+
+    def to_xarray(self):
+        """转换为 xarray.Dataset（需要安装 xarray）"""
+        import xarray as xr
+        coords = {k: (k if k in self.dims else self.dims[0], v) for k, v in self.coords.items()}
+        return xr.Dataset({k: (self.dims, v) for k, v in self.data.items()}, coords=coords)
+
+
+def evaluate(params, beta, direction='horizontal', radiance=band_radiance):
+    """在可广播的参数上计算辐射强度与作用距离
+
+    params 中任意数值可为数组，其最后一维与 beta 对齐（通常为长度 1）。
+    返回字段名到结果数组的字典。
+    """
+    beta = np.asarray(beta, dtype=float)
+    L, Lp, Lw = radiance_terms(params, radiance)
+    s_value = params[DIRECTION_AREA[direction]]
+    Im, Iw, Ip = angular_intensity(beta, params, s_value, L, Lp, Lw)
+    total = Im + Iw + Ip
+    R, converged = detection_range(params, total)
+
+    shape = np.broadcast_shapes(total.shape, np.shape(R))
+    return {
+        'total': np.broadcast_to(total, shape),
+        'skin': np.broadcast_to(Im, shape),
+        'plume': np.broadcast_to(Iw, shape),
+        'nozzle': np.broadcast_to(Ip, shape),
+        'range': np.broadcast_to(R, shape),
+        'converged': np.broadcast_to(converged, shape),
+    }
+
+
+def sweep(base_params, axes, beta=None, direction='horizontal', radiance=band_radiance):
+    """参数网格扫描
+
+    axes 为参数名到一维取值数组的字典，每个参数各占一维，
+    结果形状为 (len(axes[k1]), len(axes[k2]), ..., len(beta))。
+    """
+    if beta is None:
+        beta = angle_grid()
+    names = list(axes)
+    ndim = len(names) + 1
+
+    params = dict(base_params)
+    coords = {}
+    for i, name in enumerate(names):
+        values = np.asarray(axes[name])
+        coords[name] = values
+        shape = [1] * ndim
+        shape[i] = len(values)
+        params[name] = values.reshape(shape)
+    coords['beta'] = np.asarray(beta)
+
+    data = evaluate(params, beta, direction, radiance)
+    shape = tuple(len(coords[name]) for name in names) + (len(beta),)
+    data = {k: np.broadcast_to(v, shape) for k, v in data.items()}
+    return SweepResult(names + ['beta'], coords, data)
+
+
+def sweep_table(base_params, table, beta=None, direction='horizontal', radiance=band_radiance):
+    """逐行场景扫描
+
+    table 为参数名到等长一维数组的字典，每个下标为一个场景，
+    结果形状为 (场景数, len(beta))。
+    """
+    if beta is None:
+        beta = angle_grid()
+    params = dict(base_params)
+    n = None
+    for name, values in table.items():
+        values = np.asarray(values)
+        if n is not None and len(values) != n:
+            raise ValueError(f"参数 {name} 的长度 {len(values)} 与其他参数 ({n}) 不一致")
+        n = len(values)
+        params[name] = values[:, None]
+    if n is None:
+        raise ValueError("table 不能为空")
+
+    coords = {'scenario': np.arange(n), 'beta': np.asarray(beta)}
+    coords.update({name: np.asarray(values) for name, values in table.items()})
+    data = evaluate(params, beta, direction, radiance)
+    data = {k: np.broadcast_to(v, (n, len(beta))) for k, v in data.items()}
+    return SweepResult(['scenario', 'beta'], coords, data)
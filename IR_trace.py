@@ -0,0 +1,157 @@
+"""计算与绘图各阶段的轻量计时
+
+关闭时 span() 返回共享的空上下文，几乎没有开销；可随时通过
+TRACER.enabled 开关，或在启动前设置环境变量 IR_TRACE=1 默认开启。
+多会话服务中可用 TRACER.enable_thread() 只对当前线程开关，并用
+TRACER.set_session() 为当前线程记录的阶段打上会话标记，按会话统计和导出。
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+
+_NULL = nullcontext()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class Tracer:
+    """阶段计时记录
+
+    保留最近 maxlen 条记录 (名称, 开始时间, 耗时, 线程号, 会话标记)，
+    并按名称累计调用次数、总耗时和最大耗时。
+    enabled 为全局开关，enable_thread() 设置的线程开关优先。
+    """
+
+    def __init__(self, enabled=False, maxlen=100000):
+        self.enabled = enabled
+        self.events = deque(maxlen=maxlen)
+        self.stats = {}
+        self.count = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.origin = time.perf_counter()
+
+    def enable_thread(self, enabled):
+        """只对当前线程开关计时，None 表示跟随全局开关"""
+        self.local.enabled = enabled
+
+    def set_session(self, session):
+        """设置当前线程的会话标记，之后本线程记录的阶段都带上该标记
+
+        线程号会被服务器的线程池复用，不能用来区分会话；None 表示不属于任何会话。
+        """
+        self.local.session = session
+
+    def active(self):
+        """当前线程是否记录"""
+        enabled = getattr(self.local, 'enabled', None)
+        return self.enabled if enabled is None else enabled
+
+    def span(self, name):
+        """计时上下文: with TRACER.span('radiation.intensity'): ..."""
+        if not self.active():
+            return _NULL
+        return _Span(self, name)
+
+    def record(self, name, start, duration):
+        with self.lock:
+            self.events.append((name, start, duration, threading.get_ident(),
+                                getattr(self.local, 'session', None)))
+            self.count += 1
+            stat = self.stats.get(name)
+            if stat is None:
+                self.stats[name] = [1, duration, duration]
+            else:
+                stat[0] += 1
+                stat[1] += duration
+                stat[2] = max(stat[2], duration)
+
+    def mark(self):
+        """当前位置，配合 since() 统计之后的各阶段耗时"""
+        return self.count
+
+    def since(self, mark, session=None):
+        """mark 之后各阶段的总耗时 {名称: s}，按记录顺序排列；session 给出时只统计该会话"""
+        with self.lock:
+            n = min(self.count - mark, len(self.events))
+            recent = list(self.events)[len(self.events) - n:] if n > 0 else []
+        totals = {}
+        for name, _, duration, _, tag in recent:
+            if session is None or tag == session:
+                totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def summary(self):
+        """[(名称, 次数, 总耗时, 平均耗时, 最大耗时), ...]，按总耗时降序"""
+        with self.lock:
+            rows = [(name, n, total, total / n, peak) for name, (n, total, peak) in self.stats.items()]
+        return sorted(rows, key=lambda row: -row[2])
+
+    def reset(self):
+        with self.lock:
+            self.events.clear()
+            self.stats.clear()
+            self.count = 0
+
+    def to_json(self, session=None):
+        """Chrome Trace 格式 (JSON) 文本，可在 chrome://tracing 或 Perfetto 中查看
+
+        session 给出时只导出该会话的记录。
+        """
+        with self.lock:
+            events = list(self.events)
+        trace = [{
+            'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+            'ts': (start - self.origin) * 1e6, 'dur': duration * 1e6,
+        } for name, start, duration, tid, tag in events if session is None or tag == session]
+        return json.dumps({'traceEvents': trace, 'displayTimeUnit': 'ms'}, ensure_ascii=False)
+
+    def export(self, path):
+        """导出为 Chrome Trace 文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+
+def format_stages(totals, limit=6):
+    """将 {名称: s} 格式化为一行文字，按耗时降序"""
+    items = sorted(totals.items(), key=lambda item: -item[1])[:limit]
+    return " · ".join(f"{name} {duration * 1e3:.1f}ms" for name, duration in items)
+
+
+TRACER = Tracer(enabled=os.environ.get('IR_TRACE', '') not in ('', '0'))
+
+
+def span(name):
+    """全局 TRACER 的计时上下文"""
+    return TRACER.span(name)
+
+
+def traced(name):
+    """函数计时装饰器"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.active():
+                return func(*args, **kwargs)
+            with _Span(TRACER, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,157 @@
+"""飞行航迹文件的分块流式计算"""
+import itertools
+import os
+
+import numpy as np
+
+from IR_engine import radiance_terms, detection_range, band_radiance
+from IR_lut import default_cache
+from IR_sphere import direction_intensity
+
+# 航迹记录：时间 (s)、高度 (m)、马赫数、加力状态 (0/1)、方位角 (deg)、俯仰角 (deg)
+TRACK_DTYPE = np.dtype([
+    ('time', '<f8'), ('H', '<f8'), ('Ma', '<f8'), ('jl', '<f8'),
+    ('azimuth', '<f8'), ('elevation', '<f8'),
+])
+
+# 输出记录：各辐射源强度 (W/sr)、作用距离 (km) 及收敛标志
+OUTPUT_DTYPE = np.dtype([
+    ('time', '<f8'), ('total', '<f8'), ('skin', '<f8'), ('plume', '<f8'),
+    ('nozzle', '<f8'), ('range', '<f8'), ('converged', '?'),
+])
+
+CHUNK_SIZE = 1 << 20
+
+# 每块计算的临时数组内存预算；不含大气表时每行约 0.5 KB，
+# 透过率表求解作用距离时每行另需约 5 个 (路径网格点数,) 的 float64 数组
+CHUNK_BYTES = 128 << 20
+ROW_BYTES = 512
+PATH_TEMPORARIES = 5
+
+
+def _is_csv(path):
+    return os.path.splitext(path)[1].lower() in ('.csv', '.txt')
+
+
+def _read_csv(path, chunk_size):
+    """分块读取 CSV，首行为列名时按列名对应，否则按 TRACK_DTYPE 的列顺序"""
+    names = TRACK_DTYPE.names
+    with open(path, encoding='utf-8') as f:
+        first = f.readline()
+        fields = [x.strip() for x in first.split(',')]
+        try:
+            [float(x) for x in fields]
+            order = list(range(len(names)))
+            lines = itertools.chain([first], f)
+        except ValueError:
+            missing = [name for name in names if name not in fields]
+            if missing:
+                raise ValueError(f"航迹文件缺少列: {', '.join(missing)}")
+            order = [fields.index(name) for name in names]
+            lines = f
+        while True:
+            rows = list(itertools.islice(lines, chunk_size))
+            if not rows:
+                return
+            block = np.loadtxt(rows, delimiter=',', usecols=order, ndmin=2)
+            chunk = np.empty(len(block), dtype=TRACK_DTYPE)
+            for i, name in enumerate(names):
+                chunk[name] = block[:, i]
+            yield chunk
+
+
+def read_track(path, chunk_size=CHUNK_SIZE):
+    """分块读取航迹文件，逐块产出 TRACK_DTYPE 结构化数组
+
+    .csv/.txt 为逗号分隔文本；.npy 为结构化数组文件；
+    其他扩展名按 TRACK_DTYPE 的原始二进制记录读取。
+    """
+    if _is_csv(path):
+        yield from _read_csv(path, chunk_size)
+        return
+    with open(path, 'rb') as f:
+        dtype = TRACK_DTYPE
+        if path.endswith('.npy'):
+            fmt = np.lib.format
+            version = fmt.read_magic(f)
+            read_header = fmt.read_array_header_1_0 if version == (1, 0) else fmt.read_array_header_2_0
+            _, _, dtype = read_header(f)
+        while True:
+            chunk = np.fromfile(f, dtype=dtype, count=chunk_size)
+            if len(chunk) == 0:
+                return
+            yield chunk
+
+
+def evaluate_track(base_params, chunks, radiance=band_radiance, atmosphere=None):
+    """逐块计算航迹各时刻的辐射强度与作用距离，产出 OUTPUT_DTYPE 结构化数组
+
+    每块内高度、马赫数、加力状态和观察方向均按数组计算，发动机状态 fdj
+    由加力状态导出（与界面一致：加力为 2，常规为 1），其余参数取自 base_params。
+    """
+    base = dict(base_params)
+    for chunk in chunks:
+        params = dict(base)
+        params['H'] = chunk['H']
+        params['Ma'] = chunk['Ma']
+        params['jl'] = chunk['jl']
+        params['fdj'] = np.where(chunk['jl'] == 1, 2, 1)
+        L, Lp, Lw = radiance_terms(params, radiance)
+        Im, Iw, Ip = direction_intensity(np.radians(chunk['azimuth']), np.radians(chunk['elevation']),
+                                         params, L, Lp, Lw)
+        total = Im + Iw + Ip
+        R, converged = detection_range(params, total, atmosphere=atmosphere)
+
+        out = np.empty(len(chunk), dtype=OUTPUT_DTYPE)
+        out['time'] = chunk['time']
+        out['total'] = total
+        out['skin'] = Im
+        out['plume'] = Iw
+        out['nozzle'] = Ip
+        out['range'] = R
+        out['converged'] = converged
+        yield out
+
+
+def chunk_rows(atmosphere=None):
+    """按内存预算确定每块的行数，使用透过率表时按其路径网格点数缩小分块"""
+    row_bytes = ROW_BYTES
+    path = getattr(atmosphere, 'path', None)
+    if path is not None:
+        row_bytes += PATH_TEMPORARIES * 8 * len(path)
+    return max(1024, min(CHUNK_SIZE, CHUNK_BYTES // row_bytes))
+
+
+def write_track(chunks, path):
+    """逐块写出结果，.csv/.txt 写文本，其他扩展名写 OUTPUT_DTYPE 原始二进制记录
+
+    返回写出的行数。
+    """
+    n = 0
+    if _is_csv(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(','.join(OUTPUT_DTYPE.names) + '\n')
+            for chunk in chunks:
+                np.savetxt(f, np.column_stack([chunk[name] for name in OUTPUT_DTYPE.names]),
+                           delimiter=',', fmt=['%.6f'] + ['%.9g'] * 5 + ['%d'])
+                n += len(chunk)
+    else:
+        with open(path, 'wb') as f:
+            for chunk in chunks:
+                chunk.tofile(f)
+                n += len(chunk)
+    return n
+
+
+def process_track(base_params, source, target, chunk_size=None,
+                  use_table=True, atmosphere=None):
+    """读取航迹文件 source，计算后写入 target，内存占用只与 chunk_size 有关
+
+    chunk_size 为 None 时由 chunk_rows(atmosphere) 按内存预算确定。
+    use_table 为 True 时波段积分使用 IR_lut.default_cache() 查表。
+    """
+    if chunk_size is None:
+        chunk_size = chunk_rows(atmosphere)
+    radiance = default_cache().band_radiance if use_table else band_radiance
+    chunks = read_track(source, chunk_size)
+    return write_track(evaluate_track(base_params, chunks, radiance, atmosphere), target)
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+import IR_engine
+from IR_atmosphere import TransmittanceTable
+from IR_params import DEFAULTS, ScenarioParams
+
+
+@pytest.mark.parametrize('H', [0.0, 12000.0, 25000.0, 30000.0])
+def test_default_table_matches_model(H):
+    # 默认表覆盖界面允许的全部高度
+    params = ScenarioParams(**dict(DEFAULTS, H=H))
+    table = TransmittanceTable.from_model()
+    intensity = np.array([100.0, 5000.0])
+    np.testing.assert_allclose(table.detection_range(params, intensity, 1e-12)[0],
+                               IR_engine.detection_range(params, intensity)[0], rtol=1e-10)
+
+
+def test_altitude_outside_table():
+    table = TransmittanceTable.from_model(altitude=np.linspace(0.0, 20.0, 41))
+    with pytest.raises(ValueError):
+        table.detection_range(ScenarioParams(**dict(DEFAULTS, H=25000.0)), 5000.0, 1e-12)
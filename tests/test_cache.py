@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from IR_cache import params_key, LRUCache, ResultCache, RADIATION_KEYS, RANGE_KEYS
+from IR_params import DEFAULTS, ScenarioParams
+
+
+def test_params_key_canonical_numbers():
+    a = dict(DEFAULTS, H=12000)
+    b = dict(DEFAULTS, H=12000.0)
+    assert params_key(a, RANGE_KEYS, 26.61, 1.0) == params_key(b, RANGE_KEYS, 26.61, 1)
+    assert params_key(a, RANGE_KEYS, 26.61) != params_key(dict(a, H=12001), RANGE_KEYS, 26.61)
+
+
+def test_irrelevant_field_hits():
+    cache = ResultCache()
+    params = ScenarioParams(**DEFAULTS)
+    first = cache.radiation(params, params['s2'])
+    other = params.replace(fwjiaodu=30.0, integration_time=1.0)
+    second = cache.radiation(other, other['s2'])
+    assert second is first
+    assert (cache.cache.hits, cache.cache.misses) == (1, 1)
+
+
+def test_band_misses_envelope_but_hits_radiation():
+    cache = ResultCache()
+    params = ScenarioParams(**DEFAULTS)
+    assert 'band' in RANGE_KEYS and 'band' not in RADIATION_KEYS
+    mid = cache.envelope(params, params['s2'])
+    long_wave = params.replace(band="长波 (8-12μm)")
+    hits = cache.cache.hits
+    lw = cache.envelope(long_wave, long_wave['s2'])
+    # 包线未命中，内部的辐射计算命中
+    assert cache.cache.hits == hits + 1
+    assert lw[3] is mid[3]
+    assert not np.array_equal(lw[1], mid[1])
+
+
+def test_cached_arrays_are_read_only():
+    cache = ResultCache()
+    params = ScenarioParams(**DEFAULTS)
+    beta, range_values, converged, results = cache.envelope(params, params['s2'])
+    for a in (beta, range_values, converged, results):
+        assert not a.flags.writeable
+    with pytest.raises(ValueError):
+        range_values[0] = 0.0
+
+
+def test_lru_evicts_oldest():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
@@ -0,0 +1,65 @@
+import threading
+
+import numpy as np
+import pytest
+
+from IR_campaign import run_campaign, grid_table, guided_chunks, CampaignCancelled
+from IR_engine import angle_grid
+from IR_params import DEFAULTS
+from IR_sweep import sweep_table, RESULT_FIELDS
+
+
+def _table():
+    return grid_table({'H': np.linspace(0.0, 15000.0, 5), 'Ma': np.linspace(0.5, 2.5, 4)})
+
+
+@pytest.mark.parametrize('chunk_size', [None, 1, 7, 100])
+def test_campaign_matches_sweep_table(chunk_size):
+    table = _table()
+    beta = angle_grid(5.0)
+    result = run_campaign(DEFAULTS, table, beta, workers=2, chunk_size=chunk_size)
+    expected = sweep_table(DEFAULTS, table, beta)
+    assert result.shape == (20, len(beta))
+    # 块大小不同时辐亮度的求值方式不同（逐个浮点或向量化），结果相差若干 ulp
+    for name in RESULT_FIELDS:
+        np.testing.assert_allclose(result[name], expected[name], rtol=1e-13)
+    np.testing.assert_array_equal(result.coords['H'], table['H'])
+
+
+def test_guided_chunks_cover_range():
+    chunks = guided_chunks(1000, 4, min_chunk=10)
+    assert chunks[0] == (0, 125)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    assert chunks[-1][1] == 1000
+
+
+def test_campaign_cancel_stops_run():
+    cancel = threading.Event()
+    calls = []
+
+    def progress(done, total):
+        calls.append(done)
+        cancel.set()
+
+    with pytest.raises(CampaignCancelled) as info:
+        run_campaign(DEFAULTS, _table(), angle_grid(5.0), workers=1, chunk_size=1,
+                     progress=progress, cancel_event=cancel)
+    assert info.value.total == 20
+    assert 0 < info.value.done < 20
+    # 取消后不再派发新的块，最多完成已排队的块
+    assert len(calls) <= 2
+
+
+def test_campaign_cancelled_before_start():
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(CampaignCancelled) as info:
+        run_campaign(DEFAULTS, _table(), workers=1, cancel_event=cancel)
+    assert info.value.done == 0
+
+
+def test_campaign_rejects_bad_table():
+    with pytest.raises(ValueError):
+        run_campaign(DEFAULTS, {}, workers=1)
+    with pytest.raises(ValueError):
+        run_campaign(DEFAULTS, {'H': [0.0, 1000.0], 'Ma': [1.0]}, workers=1)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from IR_cli import main
+from IR_engine import angle_grid
+from IR_params import DEFAULTS
+from IR_sweep import sweep_table, RESULT_FIELDS
+
+
+def _write_csv(path, header, rows):
+    path.write_text('\n'.join([header] + rows) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_main_writes_npz_from_csv(tmp_path):
+    # 空单元格取基准参数
+    source = _write_csv(tmp_path / 'scenarios.csv', 'H,Ma,jl',
+                        ['1000,0.8,0', '12000,2.0,1', '5000,1.2,'])
+    target = str(tmp_path / 'results.npz')
+    main([source, '-o', target, '--workers', '1', '--resolution', '10', '-q'])
+
+    beta = angle_grid(10.0)
+    table = {'H': np.array([1000.0, 12000.0, 5000.0]), 'Ma': np.array([0.8, 2.0, 1.2]),
+             'jl': np.array([0, 1, DEFAULTS['jl']])}
+    with np.load(target) as data:
+        np.testing.assert_array_equal(data['beta'], beta)
+        for name, values in table.items():
+            np.testing.assert_array_equal(data[name], values)
+        for direction in ('horizontal', 'vertical'):
+            expected = sweep_table(DEFAULTS, table, beta, direction)
+            for field in RESULT_FIELDS:
+                np.testing.assert_allclose(data[f"{direction}_{field}"], expected[field], rtol=1e-13)
+            np.testing.assert_allclose(data[f"{direction}_max_range"], expected['range'].max(axis=1),
+                                       rtol=1e-13)
+
+
+@pytest.mark.parametrize('header, row, message', [
+    ('H,foo', '1000,1', '未知参数: foo'),
+    ('H,Ma', '-1000,0.8', '高度 H 不能为负'),
+    ('H,Ma', '1000,abc', 'could not convert'),
+    ('H,Ma', '1000,nan', '参数 Ma 必须为有限数值'),
+])
+def test_main_rejects_invalid_scenarios(tmp_path, capsys, header, row, message):
+    source = _write_csv(tmp_path / 'scenarios.csv', header, [row])
+    target = tmp_path / 'results.npz'
+    with pytest.raises(SystemExit) as info:
+        main([source, '-o', str(target), '--workers', '1', '-q'])
+    assert info.value.code == 2
+    assert message in capsys.readouterr().err
+    assert not target.exists()
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+import IR_engine
+from IR_params import DEFAULTS, ScenarioParams
+
+
+def test_angular_mean_independent_of_sampling():
+    # 自适应网格在强度变化剧烈处加密，算术平均会偏向这些区域
+    params = ScenarioParams(**dict(DEFAULTS, jl=1, fdj=2))
+    means = []
+    for sampling in (0.1, 'adaptive'):
+        beta, results = IR_engine.radiation_calculations(params, params['s2'], sampling=sampling)[:2]
+        R, _ = IR_engine.detection_range(params, results)
+        means.append(IR_engine.angular_mean(beta, R))
+    np.testing.assert_allclose(means[1], means[0], rtol=1e-3)
+
+
+@pytest.mark.parametrize('sampling', [1.0, 0.1, 'adaptive'])
+def test_radiation_calculations_uses_precomputed_terms(sampling):
+    # ScenarioParams 预计算的辐亮度与缓存的角度量不改变结果
+    values = dict(DEFAULTS, jl=1, fdj=2)
+    params = ScenarioParams(**values)
+    expected = IR_engine.radiation_calculations(values, values['s2'], sampling=sampling)
+    result = IR_engine.radiation_calculations(params, params['s2'], sampling=sampling)
+    for a, b in zip(result, expected):
+        np.testing.assert_array_equal(a, b)
+    if sampling != 'adaptive':
+        assert not result[0].flags.writeable
+
+
+def test_angular_mean_of_constant():
+    beta = np.sort(np.random.default_rng(0).uniform(0, 2 * np.pi, 50))
+    assert np.isclose(IR_engine.angular_mean(beta, np.full(50, 3.0)), 3.0)
+
+
+@pytest.mark.parametrize('T', [200.0, 300.0, 600.0, 1000.0, 2000.0, 5000.0])
+@pytest.mark.parametrize('band', [(3.0, 5.0), (8.0, 12.0), (1.0, 14.0), (0.5, 1.0), (2.9, 3.1)])
+def test_band_radiance_matches_quad(T, band):
+    l1, l2 = band
+    np.testing.assert_allclose(IR_engine.band_radiance(T, l1, l2),
+                               IR_engine.band_radiance_quad(T, l1, l2), rtol=1e-10)
+
+
+def test_band_radiance_across_series_split():
+    # x = c2 / (λT) = 1.5 落在波段内，两种级数在此衔接
+    T = 1000.0
+    split = IR_engine.c2 / (1.5 * T) * 1e6
+    for l1, l2 in ((split - 0.5, split + 0.5), (split - 0.01, split), (split, split + 0.01)):
+        np.testing.assert_allclose(IR_engine.band_radiance(T, l1, l2),
+                                   IR_engine.band_radiance_quad(T, l1, l2), rtol=1e-10)
+
+
+def test_band_radiance_broadcasts():
+    T = np.array([[300.0], [900.0]])
+    l1 = np.array([3.0, 8.0])
+    l2 = np.array([5.0, 12.0])
+    M = IR_engine.band_radiance(T, l1, l2)
+    assert M.shape == (2, 2)
+    expected = [[IR_engine.band_radiance_quad(t, a, b) for a, b in zip(l1, l2)] for t in T[:, 0]]
+    np.testing.assert_allclose(M, expected, rtol=1e-10)
+    assert np.ndim(IR_engine.band_radiance(300.0, 3.0, 5.0)) == 0
+
+
+def test_band_radiance_array_matches_scalar():
+    # 元素较多时按区间分组向量化求值，与逐个浮点求值的结果一致
+    T = np.linspace(200.0, 5000.0, 97)
+    l1 = np.linspace(0.5, 8.0, 97)
+    M = IR_engine.band_radiance(T, l1, l1 + 2.0)
+    expected = [IR_engine.band_radiance(t, a, a + 2.0) for t, a in zip(T, l1)]
+    np.testing.assert_allclose(M, expected, rtol=1e-13)
+
+
+def _range_inputs(params, intensity):
+    k = IR_engine.extinction_coefficient(params)
+    R0 = np.sqrt(IR_engine.detector_constant(params) * intensity) / 1000.0
+    return k, R0
+
+
+@pytest.mark.parametrize('H', [0.0, 5000.0, 12000.0, 30000.0])
+@pytest.mark.parametrize('band', ["中波 (3-5μm)", "长波 (8-12μm)"])
+@pytest.mark.parametrize('weather', ["晴天", "雨天"])
+def test_detection_range_residual(H, band, weather):
+    params = ScenarioParams(**dict(DEFAULTS, H=H, band=band, weather=weather))
+    intensity = np.logspace(-3, 6, 50)
+    R, converged = IR_engine.detection_range(params, intensity)
+    k, R0 = _range_inputs(params, intensity)
+    assert np.all(converged)
+    np.testing.assert_allclose(R, R0 * np.exp(-k * R / 2), rtol=1e-13)
+
+
+def test_detection_range_without_extinction():
+    # k -> 0 时 R -> R0，小 k 时 R ≈ R0 (1 - k R0 / 2)
+    intensity = np.array([0.0, 1.0, 1e4])
+    far = ScenarioParams(**dict(DEFAULTS, H=1e6))
+    k, R0 = _range_inputs(far, intensity)
+    assert k < 1e-40
+    R, converged = IR_engine.detection_range(far, intensity)
+    assert np.all(converged)
+    np.testing.assert_allclose(R, R0, rtol=1e-15)
+    assert R[0] == 0.0
+
+    w, converged = IR_engine.lambertw(np.array([0.0, 1e-300, 1e-12]))
+    assert np.all(converged)
+    np.testing.assert_allclose(w, [0.0, 1e-300, 1e-12 - 1e-24], rtol=1e-15)
+
+
+def test_lambertw_matches_scipy():
+    from scipy.special import lambertw
+
+    z = np.concatenate([[0.0], np.logspace(-300, 300, 121)])
+    w, converged = IR_engine.lambertw(z)
+    assert np.all(converged)
+    np.testing.assert_allclose(w, lambertw(z).real, rtol=1e-14)
+    # w e^w 的相对误差约为 w 的 (1 + w) 倍
+    assert np.all(np.abs(w * np.exp(w) - z) <= 1e-14 * (1 + w) * z)
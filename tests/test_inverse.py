@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from IR_inverse import solve_parameter
+from IR_params import DEFAULTS
+from IR_sweep import evaluate
+
+
+def _range_at(name, x, angles, direction):
+    params = dict(DEFAULTS)
+    params[name] = np.asarray(x)[:, None]
+    beta = np.radians(angles)[:, None]
+    return evaluate(params, beta, direction)['range'][:, 0]
+
+
+# 分别覆盖温度、发射率、几何和探测器参数
+@pytest.mark.parametrize('name', ['H', 'tw_base', 'emissivity_flame', 's1', 'lwy', 'd_star'])
+@pytest.mark.parametrize('direction', ['horizontal', 'vertical'])
+def test_solution_reproduces_target(name, direction):
+    angles = np.array([0.0, 45.0, 90.0, 150.0, 180.0, 270.0])
+    target = 12.0
+    x, converged = solve_parameter(DEFAULTS, name, target, angles, direction, rtol=1e-10)
+    assert np.all(np.isfinite(x) == converged)
+    assert np.any(converged)
+    R = _range_at(name, x[converged], angles[converged], direction)
+    np.testing.assert_allclose(R, target, rtol=1e-8)
+
+
+def test_unreachable_target_is_nan():
+    # 发射率不超过 1，远大于上限可达到的作用距离无解
+    x, converged = solve_parameter(DEFAULTS, 'emissivity_skin', 1e4, 90.0)
+    assert np.isnan(x) and not converged
+
+
+def test_broadcast_targets():
+    target = np.array([[8.0], [10.0]])
+    angles = np.array([30.0, 60.0, 90.0])
+    x, converged = solve_parameter(DEFAULTS, 'd_star', target, angles)
+    assert x.shape == (2, 3) and np.all(converged)
+    for i in range(2):
+        np.testing.assert_allclose(_range_at('d_star', x[i], angles, 'horizontal'), target[i, 0], rtol=1e-7)
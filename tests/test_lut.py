@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from IR_engine import band_radiance
+from IR_lut import RadianceTable, T_MIN, T_MAX, log_curvature
+
+
+@pytest.mark.parametrize('band', [(3.0, 5.0), (8.0, 12.0)])
+def test_table_error_bound(band):
+    table = RadianceTable.build(*band, tol=1e-6)
+    assert table.max_rel_error < 1e-6
+    T = np.random.default_rng(1).uniform(T_MIN, T_MAX, 200000)
+    err = np.abs(table(T) / band_radiance(T, *band) - 1)
+    assert np.max(err) <= table.max_rel_error
+
+
+@pytest.mark.parametrize('band', [(3.0, 5.0), (8.0, 12.0)])
+def test_log_curvature_matches_finite_difference(band):
+    u = np.linspace(np.log(T_MIN), np.log(T_MAX), 40)
+    h = 1e-4
+
+    def f(u):
+        return np.log(band_radiance(np.exp(u), *band))
+    expected = (f(u + h) - 2 * f(u) + f(u - h)) / h**2
+    np.testing.assert_allclose(log_curvature(np.exp(u), *band), expected, rtol=1e-4)
+
+
+def test_table_outside_range_is_exact():
+    table = RadianceTable.build(3.0, 5.0)
+    T = np.array([50.0, T_MAX * 1.5])
+    np.testing.assert_array_equal(table(T), band_radiance(T, 3.0, 5.0))
@@ -0,0 +1,54 @@
+import numpy as np
+
+from IR_engine import angle_grid
+from IR_montecarlo import StreamingStats, monte_carlo
+from IR_params import DEFAULTS
+from IR_sweep import sweep_table
+
+
+def test_streaming_moments_match_numpy():
+    rng = np.random.default_rng(0)
+    data = rng.lognormal(3.0, 0.5, size=(10000, 3)) * [1.0, 10.0, 1000.0]
+    stats = StreamingStats((3,))
+    for batch in np.array_split(data, [1, 7, 500, 4096]):
+        stats.update(batch)
+    stats.update(data[:0])
+    assert stats.count == len(data)
+    np.testing.assert_allclose(stats.mean, data.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(stats.variance, data.var(axis=0, ddof=1), rtol=1e-10)
+    np.testing.assert_array_equal(stats.min, data.min(axis=0))
+    np.testing.assert_array_equal(stats.max, data.max(axis=0))
+
+
+def test_streaming_quantiles_within_bin_width():
+    rng = np.random.default_rng(1)
+    data = rng.lognormal(0.0, 1.0, size=(200000, 2))
+    stats = StreamingStats((2,), bins=2048)
+    for batch in np.array_split(data, 50):
+        stats.update(batch)
+    # 直方图在对数坐标下等宽，分位数的相对误差不超过一个区间宽度
+    tol = np.exp(stats.log_step) - 1
+    for q in (0.05, 0.5, 0.95):
+        expected = np.quantile(data, q, axis=0)
+        assert np.all(np.abs(stats.quantile(q) / expected - 1) <= tol)
+
+
+def test_monte_carlo_degenerate_distribution():
+    # 分布退化为常数时，各统计量均等于确定性结果
+    beta = angle_grid(10.0)
+    result = monte_carlo(DEFAULTS, {'Ma': ('uniform', 2.0, 2.0)}, 100, beta, batch_size=32, seed=0)
+    expected = sweep_table(DEFAULTS, {'Ma': np.array([2.0])}, beta)['range'][0]
+    assert result.count == 100
+    for name, row in zip(result.coords['statistic'], result['range']):
+        if name == 'std':
+            assert np.all(row < 1e-12 * expected)
+        else:
+            np.testing.assert_allclose(row, expected, rtol=1e-12)
+
+
+def test_monte_carlo_reproducible():
+    beta = angle_grid(30.0)
+    dists = {'H': ('normal', 12000.0, 500.0), 'emissivity_skin': ('triangular', 0.6, 0.7, 0.8)}
+    a = monte_carlo(DEFAULTS, dists, 1000, beta, batch_size=256, seed=42)
+    b = monte_carlo(DEFAULTS, dists, 1000, beta, batch_size=256, seed=42)
+    np.testing.assert_array_equal(a['range'], b['range'])
@@ -0,0 +1,84 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import IR_engine
+from IR_params import DEFAULTS, FIELD_NAMES, ScenarioParams, validate_values
+
+
+def test_defaults_are_valid():
+    params = ScenarioParams(**DEFAULTS)
+    assert dict(params) == DEFAULTS
+    assert len(params) == len(FIELD_NAMES)
+
+
+@pytest.mark.parametrize('name', ['Ma', 'H', 'tw_base', 'emissivity_skin', 'fwjiaodu', 'd_star'])
+@pytest.mark.parametrize('value', [np.nan, np.inf, -np.inf])
+def test_rejects_non_finite(name, value):
+    with pytest.raises(ValueError, match=name):
+        ScenarioParams(**dict(DEFAULTS, **{name: value}))
+
+
+@pytest.mark.parametrize('value', [np.nan, np.inf])
+def test_rejects_non_finite_engine_state(value):
+    with pytest.raises(ValueError, match='jl'):
+        ScenarioParams(**dict(DEFAULTS, jl=value))
+
+
+@pytest.mark.parametrize('changes', [
+    {'Ma': 0.0}, {'H': -1.0}, {'emissivity_flame': 1.5}, {'l1': 5.0, 'l2': 3.0}, {'fdj': 3},
+])
+def test_rejects_out_of_range(changes):
+    with pytest.raises(ValueError):
+        ScenarioParams(**dict(DEFAULTS, **changes))
+
+
+def test_rejects_unknown_weather_and_fields():
+    with pytest.raises(ValueError, match="未知气象条件"):
+        ScenarioParams(**dict(DEFAULTS, weather="大雾"))
+    with pytest.raises(ValueError, match="未知参数"):
+        ScenarioParams(**dict(DEFAULTS, speed=1.0))
+    values = dict(DEFAULTS)
+    del values['H']
+    with pytest.raises(ValueError, match="缺少参数"):
+        ScenarioParams(**values)
+
+
+def test_validate_values_checks_every_element():
+    table = {name: DEFAULTS[name] for name in FIELD_NAMES}
+    table['Ma'] = np.array([0.8, 1.2, np.inf])
+    with pytest.raises(ValueError, match='Ma'):
+        validate_values(table)
+    table['Ma'] = np.array([0.8, 1.2, 2.0])
+    table['weather'] = np.array(["晴天", "雨天"])
+    validate_values(table)
+
+
+def test_immutable():
+    params = ScenarioParams(**DEFAULTS)
+    with pytest.raises(AttributeError):
+        params.H = 0.0
+    with pytest.raises(TypeError):
+        params['H'] = 0.0
+    changed = params.replace(H=5000.0)
+    assert params['H'] == 12000.0 and changed['H'] == 5000.0
+    assert changed.T0 != params.T0
+
+
+def test_pickle_round_trip():
+    params = ScenarioParams(**dict(DEFAULTS, jl=1, fdj=2, H=25000.0))
+    restored = pickle.loads(pickle.dumps(params))
+    assert isinstance(restored, ScenarioParams)
+    assert dict(restored) == dict(params)
+    for name in ('s4', 'T0', 'Tm', 'Tp', 'Tw', 'L', 'Lp', 'Lw', 'k', 'C'):
+        assert getattr(restored, name) == getattr(params, name)
+
+
+def test_derived_values_match_engine():
+    values = dict(DEFAULTS, jl=1, fdj=2)
+    params = ScenarioParams(**values)
+    assert (params.Tm, params.Tp, params.Tw) == tuple(IR_engine.source_temperatures(values))
+    assert (params.L, params.Lp, params.Lw) == tuple(IR_engine.radiance_terms(values))
+    assert params.k == IR_engine.extinction_coefficient(values)
+    assert params.C == IR_engine.detector_constant(values)
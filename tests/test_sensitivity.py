@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+import IR_engine
+from IR_params import DEFAULTS, ScenarioParams
+from IR_sensitivity import SENSITIVITY_FIELDS, elasticities, tornado
+
+
+def test_fields_are_model_inputs():
+    for name in ('fwjiaodu', 'fyjiaodu', 'detector_resp', 'integration_time'):
+        assert name not in SENSITIVITY_FIELDS
+    for name in ('s2', 's3', 'H', 'Ma', 'netd'):
+        assert name in SENSITIVITY_FIELDS
+
+
+@pytest.mark.parametrize('direction, other', [('horizontal', 's3'), ('vertical', 's2')])
+def test_default_names_follow_direction(direction, other):
+    result = elasticities(DEFAULTS, beta=IR_engine.angle_grid(10.0), direction=direction)
+    names = list(result.coords['parameter'])
+    assert other not in names
+    # 默认参数集中没有恒为 0 的行（加力温度只在加力状态下起作用）
+    zero = [n for i, n in enumerate(names) if not np.any(result['range'][i])]
+    assert zero == ['tp_afterburner']
+
+
+@pytest.mark.parametrize('name', ['H', 'Ma', 'tw_base', 'netd'])
+def test_elasticity_matches_finite_difference(name):
+    beta = IR_engine.angle_grid(1.0)
+    result = elasticities(DEFAULTS, [name], beta)
+    i = 75
+
+    def range_at(x):
+        params = ScenarioParams(**dict(DEFAULTS, **{name: x}))
+        total = IR_engine.radiation_calculations(params, params['s2'])[1]
+        return IR_engine.detection_range(params, total[i])[0]
+    x0 = DEFAULTS[name]
+    h = 1e-5 * x0
+    expected = (range_at(x0 + h) - range_at(x0 - h)) / (2 * h) * x0 / range_at(x0)
+    np.testing.assert_allclose(result['range'][0, i], expected, rtol=1e-5)
+
+
+def test_tornado_orders_by_peak_elasticity():
+    result = elasticities(DEFAULTS, beta=IR_engine.angle_grid(5.0))
+    for _, _, rows in tornado(result, sectors=4):
+        values = [abs(value) for _, value, _, _ in rows]
+        assert values == sorted(values, reverse=True)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import IR_engine
+from IR_params import DEFAULTS, ScenarioParams
+from IR_spectral import spectral_bins, bin_radiances, spectral_range, spectral_calculations
+
+BANDS = [
+    dict(),
+    dict(l1=8.0, l2=12.0, band="长波 (8-12μm)"),
+    dict(jl=1, fdj=2, weather="雨天"),
+]
+
+
+@pytest.mark.parametrize('changes', BANDS)
+def test_bins_sum_to_band_radiance(changes):
+    params = ScenarioParams(**dict(DEFAULTS, **changes))
+    edges = spectral_bins(params['l1'], params['l2'])[0]
+    L = bin_radiances(params, edges)
+    np.testing.assert_allclose(L.sum(axis=1), [params.L, params.Lp, params.Lw], rtol=1e-12)
+
+
+@pytest.mark.parametrize('changes', BANDS)
+def test_broadband_matches_engine(changes):
+    params = ScenarioParams(**dict(DEFAULTS, **changes))
+    result = spectral_calculations(params, params['s2'])
+    beta, total = IR_engine.radiation_calculations(params, params['s2'])[:2]
+    np.testing.assert_array_equal(result['beta'], beta)
+    np.testing.assert_allclose(result['total'], total, rtol=1e-12)
+    R, _ = IR_engine.detection_range(params, total)
+    np.testing.assert_allclose(result['range_broadband'], R, rtol=1e-10)
+    assert np.all(result['converged'])
+
+
+def test_spectral_range_converges_multi_bin():
+    rng = np.random.default_rng(2)
+    intensity = rng.uniform(0.0, 500.0, (32, 200))
+    intensity[:, 0] = 0.0
+    k = rng.uniform(0.01, 2.0, 32)
+    C = 2.0e6
+    R, converged = spectral_range(C, intensity, k)
+    assert np.all(converged)
+    assert R[0] == 0.0
+    # R² = C / 1e6 · Σ I_i exp(-k_i R)
+    rhs = C / 1e6 * np.sum(intensity * np.exp(-k[:, None] * R), axis=0)
+    np.testing.assert_allclose(R**2, rhs, rtol=1e-11)
+
+
+def test_uniform_extinction_reduces_to_broadband():
+    params = ScenarioParams(**DEFAULTS)
+
+    def uniform(params, centers):
+        return np.full(len(centers), IR_engine.extinction_coefficient(params))
+    result = spectral_calculations(params, params['s2'], n_bins=8, extinction=uniform)
+    np.testing.assert_allclose(result['range'], result['range_broadband'], rtol=1e-10)
+
+
+def test_bins_cached_read_only():
+    edges, centers, profile = spectral_bins(3.0, 5.0)
+    assert spectral_bins(3.0, 5.0)[0] is edges
+    assert not edges.flags.writeable
+    assert np.isclose(np.mean(profile), 1.0)
+    assert np.all(np.diff(edges) > 0) and len(centers) == 32
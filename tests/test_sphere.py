@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import IR_engine
+from IR_params import DEFAULTS, ScenarioParams
+from IR_sphere import spherical_map, elevation_grid
+
+
+@pytest.fixture(scope='module')
+def params():
+    return ScenarioParams(**dict(DEFAULTS, jl=1, fdj=2))
+
+
+@pytest.fixture(scope='module')
+def sphere(params):
+    return spherical_map(params, 1.0)
+
+
+def test_horizontal_cut(params, sphere):
+    # el = 0 一行即水平方向
+    i = int(np.flatnonzero(sphere.coords['elevation'] == 0.0)[0])
+    _, total, _, skin, plume, nozzle = IR_engine.radiation_calculations(params, params['s2'])
+    for name, expected in (('total', total), ('skin', skin), ('plume', plume), ('nozzle', nozzle)):
+        np.testing.assert_allclose(sphere[name][i], expected, rtol=0, atol=1e-12 * np.max(total))
+    R, _ = IR_engine.detection_range(params, total)
+    np.testing.assert_allclose(sphere['range'][i], R, rtol=1e-12)
+
+
+def test_vertical_cut(params, sphere):
+    # az = 0 一列对应垂直面内 β = el，az = 180° 一列对应 β = π - el
+    beta, total = IR_engine.radiation_calculations(params, params['s3'], 'vertical')[:2]
+    el = sphere.coords['elevation']
+    az = sphere.coords['azimuth']
+    for az_deg, beta_of_el in ((0.0, el), (180.0, np.pi - el)):
+        j = int(np.argmin(np.abs(az - np.radians(az_deg))))
+        idx = [IR_engine.angle_index(beta, np.degrees(b) % 360) for b in beta_of_el]
+        np.testing.assert_allclose(sphere['total'][:, j], total[idx], rtol=0, atol=1e-12 * np.max(total))
+
+
+@pytest.mark.parametrize('resolution', [1.0, 2.0, 5.0])
+def test_map_shape(params, resolution):
+    result = spherical_map(params, resolution)
+    n_az = int(round(360 / resolution))
+    n_el = int(round(180 / resolution)) + 1
+    assert result.dims == ('elevation', 'azimuth')
+    assert result.shape == (n_el, n_az)
+    assert len(elevation_grid(resolution)) == n_el
+    for name in ('total', 'skin', 'plume', 'nozzle', 'range', 'converged'):
+        assert result[name].shape == (n_el, n_az)
+    assert np.all(result['converged'])
+
+
+def test_chunking_does_not_change_result(params, sphere):
+    small = spherical_map(params, 1.0, chunk_size=1000)
+    np.testing.assert_array_equal(small['total'], sphere['total'])
+    np.testing.assert_array_equal(small['range'], sphere['range'])
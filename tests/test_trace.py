@@ -0,0 +1,53 @@
+import json
+import threading
+
+from IR_trace import Tracer
+
+
+def test_thread_switch_overrides_global():
+    tracer = Tracer(enabled=False)
+    results = {}
+
+    def worker(enabled):
+        tracer.enable_thread(enabled)
+        with tracer.span('work'):
+            pass
+        results[enabled] = threading.get_ident()
+
+    for enabled in (True, False):
+        t = threading.Thread(target=worker, args=(enabled,))
+        t.start()
+        t.join()
+    assert tracer.count == 1
+    assert [event[3] for event in tracer.events] == [results[True]]
+    # 主线程未设置，跟随全局开关
+    with tracer.span('main'):
+        pass
+    assert tracer.count == 1
+
+
+def test_since_filters_by_session():
+    tracer = Tracer(enabled=True)
+    mark = tracer.mark()
+    barrier = threading.Barrier(2)
+
+    def worker():
+        tracer.set_session('b')
+        barrier.wait()
+        tracer.record('other', 0.0, 1.0)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    tracer.set_session('a')
+    with tracer.span('mine'):
+        barrier.wait()
+        t.join()
+    # 同一线程随后服务另一个会话（线程号相同）
+    tracer.set_session('c')
+    with tracer.span('reused'):
+        pass
+    assert set(tracer.since(mark)) == {'mine', 'other', 'reused'}
+    assert set(tracer.since(mark, 'a')) == {'mine'}
+    assert set(tracer.since(mark, 'c')) == {'reused'}
+    events = json.loads(tracer.to_json('a'))['traceEvents']
+    assert [event['name'] for event in events] == ['mine']
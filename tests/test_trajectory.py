@@ -0,0 +1,45 @@
+import numpy as np
+
+from IR_engine import radiation_calculations, detection_range, angle_index
+from IR_params import DEFAULTS, ScenarioParams
+from IR_atmosphere import TransmittanceTable
+from IR_trajectory import TRACK_DTYPE, CHUNK_BYTES, evaluate_track, chunk_rows
+
+
+def _track(rows):
+    chunk = np.zeros(len(rows), dtype=TRACK_DTYPE)
+    for i, row in enumerate(rows):
+        for name, value in row.items():
+            chunk[name][i] = value
+    return chunk
+
+
+def test_track_row_matches_radiation_calculations():
+    # 基准参数为常规状态，航迹中的加力行应使用加力状态的尾焰温度
+    base = ScenarioParams(**DEFAULTS)
+    rows = [
+        {'time': 0.0, 'H': 12000.0, 'Ma': 2.0, 'jl': 1, 'azimuth': 75.0, 'elevation': 0.0},
+        {'time': 1.0, 'H': 8000.0, 'Ma': 0.9, 'jl': 0, 'azimuth': 120.0, 'elevation': 0.0},
+    ]
+    out = np.concatenate(list(evaluate_track(base, [_track(rows)])))
+
+    for row, result in zip(rows, out):
+        jl = int(row['jl'])
+        params = base.replace(H=row['H'], Ma=row['Ma'], jl=jl, fdj=2 if jl == 1 else 1)
+        beta, total, _, skin, plume, nozzle = radiation_calculations(params, params['s2'], 'horizontal')
+        i = angle_index(beta, row['azimuth'])
+        assert np.isclose(np.degrees(beta[i]), row['azimuth'])
+        np.testing.assert_allclose(
+            [result['total'], result['skin'], result['plume'], result['nozzle']],
+            [total[i], skin[i], plume[i], nozzle[i]], rtol=1e-12)
+        R, converged = detection_range(params, total[i])
+        np.testing.assert_allclose(result['range'], R, rtol=1e-12)
+        assert result['converged'] == converged
+
+
+def test_chunk_rows_scales_with_transmittance_table():
+    table = TransmittanceTable.from_model()
+    rows = chunk_rows(table)
+    assert rows < chunk_rows()
+    # 作用距离求解的 (行数 × 路径网格点数) 临时数组不超过内存预算
+    assert rows * len(table.path) * 8 <= CHUNK_BYTES